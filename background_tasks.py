@@ -0,0 +1,176 @@
+"""
+Fiszki Background Tasks
+Zadania w tle dla okien Tk: debounce, wątek roboczy, odrzucanie nieaktualnych wyników
+"""
+
+import json
+import os
+import queue
+import threading
+
+
+READ_CHUNK = 256 * 1024
+
+
+def read_json_file(filepath, task=None, share=1.0, object_hook=None):
+    """
+    Czyta plik JSON porcjami, raportując postęp (0..share) przez task.report.
+    Zwraca None, jeśli zadanie anulowano w trakcie czytania.
+    object_hook jak w json.loads (np. word_hook() dla rekordów Word).
+    """
+    size = os.path.getsize(filepath) or 1
+    chunks = []
+    read = 0
+    with open(filepath, 'rb') as f:
+        while True:
+            chunk = f.read(READ_CHUNK)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            read += len(chunk)
+            if task:
+                if task.cancelled():
+                    return None
+                task.report(share * read / size, "Wczytywanie pliku...")
+    return json.loads(b''.join(chunks).decode('utf-8'), object_hook=object_hook)
+
+
+class BackgroundTask:
+    """Uchwyt przekazywany zadaniu: sprawdzanie anulowania i raportowanie postępu."""
+
+    def __init__(self, worker, generation):
+        self.worker = worker
+        self.generation = generation
+
+    def cancelled(self):
+        """Czy zadanie zostało zastąpione nowszym lub anulowane."""
+        return self.worker.is_stale(self.generation)
+
+    def report(self, fraction, message=''):
+        """Postęp 0.0-1.0; trafia do on_progress w wątku Tk."""
+        self.worker.results.put(('progress', self.generation, (fraction, message)))
+
+
+class BackgroundWorker:
+    """
+    Jeden wątek roboczy na okno Tk.
+
+    - submit() odkłada zadanie o delay_ms; kolejne wywołania w tym czasie
+      zastępują poprzednie (seria klawiszy = jedno zadanie)
+    - wątek wykonuje tylko najnowsze zlecone zadanie, starsze z kolejki pomija
+    - wynik wraca do wątku Tk przez root.after i jest odrzucany,
+      jeśli w międzyczasie zlecono nowsze zadanie
+    Zadanie dostaje BackgroundTask: task.cancelled() pozwala przerwać pracę
+    wcześniej, task.report() przekazuje postęp do on_progress.
+    """
+
+    def __init__(self, root, delay_ms=150, poll_ms=25):
+        self.root = root
+        self.delay_ms = delay_ms
+        self.poll_ms = poll_ms
+        self.generation = 0
+        self.dispatched = 0
+        self.received = 0
+        self.pending_job = None
+        self.poll_job = None
+        self.on_progress = None
+        self.closed = False
+
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def submit(self, func, on_done, on_error=None, delay_ms=None, on_progress=None):
+        """Zleca func(task) po odczekaniu; on_done(wynik) wołane w wątku Tk."""
+        if self.closed:
+            return
+        self.generation += 1
+        generation = self.generation
+
+        if self.pending_job:
+            self.root.after_cancel(self.pending_job)
+        delay = self.delay_ms if delay_ms is None else delay_ms
+        callbacks = (on_done, on_error, on_progress)
+        self.pending_job = self.root.after(
+            delay, lambda: self._dispatch(generation, func, callbacks))
+
+    def is_stale(self, generation):
+        return self.closed or generation != self.generation
+
+    def _dispatch(self, generation, func, callbacks):
+        self.pending_job = None
+        self.dispatched = generation
+        self.on_progress = callbacks[2]  # starsze zadania i tak są nieaktualne
+        self.requests.put((generation, func, callbacks))
+        self._schedule_poll()
+
+    def _run(self):
+        while True:
+            job = self.requests.get()
+            # Pomijamy zadania, które czekały za nowszymi
+            while job is not None:
+                try:
+                    job = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+            if job is None:
+                return
+
+            generation, func, callbacks = job
+            if self.is_stale(generation):
+                # Znacznik dla _poll, żeby przestał czekać na ten wynik
+                self.results.put(('skipped', generation, None))
+                continue
+            try:
+                result = ('done', func(BackgroundTask(self, generation)))
+            except Exception as e:
+                result = ('error', e)
+            self.results.put(('finished', generation, (result, callbacks)))
+
+    def _schedule_poll(self):
+        if self.poll_job is None and not self.closed:
+            self.poll_job = self.root.after(self.poll_ms, self._poll)
+
+    def _poll(self):
+        """Odbiera wyniki z wątku roboczego (wywoływane w wątku Tk)."""
+        self.poll_job = None
+        while True:
+            try:
+                kind, generation, payload = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'progress':
+                if not self.is_stale(generation) and self.on_progress:
+                    self.on_progress(*payload)
+                continue
+
+            self.received = max(self.received, generation)
+            if kind == 'skipped' or self.is_stale(generation):
+                continue
+            (status, value), (on_done, on_error, _) = payload
+            if status == 'done':
+                on_done(value)
+            elif on_error:
+                on_error(value)
+            else:
+                print(f"Blad zadania w tle: {value}")
+
+        if self.received < self.dispatched:
+            self._schedule_poll()
+
+    def cancel(self):
+        """Unieważnia zadania oczekujące i trwające."""
+        self.generation += 1
+        if self.pending_job:
+            self.root.after_cancel(self.pending_job)
+            self.pending_job = None
+
+    def close(self):
+        """Zatrzymuje wątek roboczy (np. przy zamknięciu okna)."""
+        self.cancel()
+        self.closed = True
+        if self.poll_job:
+            self.root.after_cancel(self.poll_job)
+            self.poll_job = None
+        self.requests.put(None)
@@ -0,0 +1,97 @@
+"""
+Fiszki Card Sampler
+Losowanie ważone kart w O(log n) (drzewo Fenwicka)
+"""
+
+import random
+
+
+def card_weight(word):
+    """
+    Waga słowa przy losowaniu.
+    Algorytm: słowa z błędami 3x częściej, nowe słowa z wagą bazową.
+    """
+    wrong = word.get('wrong_count', 0)
+    correct = word.get('correct_count', 0)
+    total = wrong + correct
+
+    if total == 0:
+        # Nowe słowa: bazowa waga
+        return 1
+
+    # Error rate: wrong / (wrong + correct)
+    error_rate = wrong / total
+    # Słowa z błędami pojawiają się 3x częściej
+    return max(1, 1 + (error_rate * 3))
+
+
+class WeightedSampler:
+    """
+    Losowanie ważone z aktualizacją wagi pojedynczej karty.
+    Budowa O(n) raz na sesję, losowanie i aktualizacja O(log n)
+    zamiast listy wag liczonej od nowa przy każdej karcie.
+    """
+
+    def __init__(self, items, weight_func=card_weight):
+        self.items = list(items)
+        self.weight_func = weight_func
+        self.positions = {id(item): i for i, item in enumerate(self.items)}
+        self.weights = [float(weight_func(item)) for item in self.items]
+        self.total = sum(self.weights)
+
+        # Drzewo Fenwicka (indeksy od 1), budowa w O(n)
+        n = len(self.items)
+        self.tree = [0.0] + self.weights[:]
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                self.tree[parent] += self.tree[i]
+
+        self.top_bit = 1
+        while self.top_bit * 2 <= n:
+            self.top_bit *= 2
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, item):
+        return id(item) in self.positions
+
+    def set_weight(self, index, weight):
+        """Ustawia wagę elementu o podanym indeksie (O(log n))."""
+        delta = float(weight) - self.weights[index]
+        if not delta:
+            return
+        self.weights[index] = float(weight)
+        self.total += delta
+
+        i = index + 1
+        n = len(self.items)
+        while i <= n:
+            self.tree[i] += delta
+            i += i & -i
+
+    def refresh(self, item):
+        """Przelicza wagę elementu po zmianie jego liczników."""
+        index = self.positions.get(id(item))
+        if index is not None:
+            self.set_weight(index, self.weight_func(item))
+
+    def find(self, target):
+        """Zwraca indeks elementu, w którego przedział wag trafia target."""
+        pos = 0
+        bit = self.top_bit
+        n = len(self.items)
+        while bit:
+            nxt = pos + bit
+            if nxt <= n and self.tree[nxt] <= target:
+                pos = nxt
+                target -= self.tree[nxt]
+            bit >>= 1
+        return min(pos, n - 1)
+
+    def sample(self, rng=random):
+        """Losuje element proporcjonalnie do wag (None dla pustej puli)."""
+        if not self.items or self.total <= 0:
+            return None
+        return self.items[self.find(rng.random() * self.total)]
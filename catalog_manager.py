@@ -0,0 +1,174 @@
+"""
+Fiszki Library Catalog
+Katalog biblioteki (serie, kategorie, pliki, liczby słów i unitów) zapisany w pliku
+i odświeżany przyrostowo po mtime zamiast przeglądania data/ przy każdym dialogu
+"""
+
+import hashlib
+import json
+import os
+
+from progress_manager import write_json_atomic
+
+
+class LibraryCatalog:
+    """
+    Manifest plików z data/:
+    - data/<seria>/json/*.json
+    - data/career_paths/<kategoria>/json/*.json
+    Katalog zapamiętuje listy katalogów (z ich mtime) i dla każdego pliku
+    mtime, rozmiar, hash treści, liczbę słów i listę unitów.
+    Przy odświeżeniu listowane są tylko katalogi o zmienionym mtime,
+    a wczytywane tylko pliki o zmienionym mtime/rozmiarze.
+    """
+
+    CATALOG_FILE = '.fiszki_catalog.json'
+    VERSION = 1
+
+    def __init__(self, data_dir, catalog_path=None):
+        self.data_dir = data_dir
+        self.path = catalog_path or self.CATALOG_FILE
+        self.dirs = {}
+        self.files = {}
+        self.load()
+
+    def load(self):
+        """Wczytuje zapisany katalog (pusty przy braku pliku lub innej wersji)."""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Blad odczytu katalogu: {e}")
+            return
+        if isinstance(data, dict) and data.get('version') == self.VERSION:
+            self.dirs = data.get('dirs', {})
+            self.files = data.get('files', {})
+
+    def save(self):
+        try:
+            write_json_atomic(self.path, {
+                'version': self.VERSION,
+                'dirs': self.dirs,
+                'files': self.files,
+            }, indent=None)
+        except Exception as e:
+            print(f"Blad zapisu katalogu: {e}")
+
+    # Odświeżanie
+
+    def _list(self, rel, kind, dirs):
+        """Zawartość katalogu: podkatalogi ('dirs') albo pliki .json ('json')."""
+        path = os.path.join(self.data_dir, rel)
+        try:
+            mtime = os.stat(path).st_mtime
+        except OSError:
+            return []
+
+        cached = self.dirs.get(rel)
+        if cached and cached['mtime'] == mtime:
+            names = cached['names']
+        else:
+            names = []
+            for name in sorted(os.listdir(path)):
+                if name.startswith('.'):
+                    continue
+                full = os.path.join(path, name)
+                if kind == 'dirs' and os.path.isdir(full):
+                    names.append(name)
+                elif kind == 'json' and name.endswith('.json') and os.path.isfile(full):
+                    names.append(name)
+        dirs[rel] = {'mtime': mtime, 'names': names}
+        return names
+
+    def _json_dirs(self, dirs):
+        """(seria, kategoria, ścieżka względna katalogu json)"""
+        for series_key in self._list('', 'dirs', dirs):
+            if series_key == "career_paths":
+                for category in self._list(series_key, 'dirs', dirs):
+                    yield series_key, category, f"{series_key}/{category}/json"
+            else:
+                yield series_key, '', f"{series_key}/json"
+
+    @staticmethod
+    def describe(path, stat):
+        """Odczytuje plik decku: hash treści, liczba słów, unity (w kolejności wystąpienia)."""
+        with open(path, 'rb') as f:
+            content = f.read()
+        entry = {
+            'mtime': stat.st_mtime,
+            'size': stat.st_size,
+            'hash': hashlib.sha1(content).hexdigest(),
+            'word_count': 0,
+            'units': [],
+        }
+        try:
+            words = json.loads(content.decode('utf-8'))
+        except Exception as e:
+            print(f"Blad odczytu {path}: {e}")
+            return entry
+        if isinstance(words, list):
+            entry['word_count'] = len(words)
+            units = {}
+            for word in words:
+                if isinstance(word, dict):
+                    units.setdefault(str(word.get('unit', 'Unknown')), None)
+            entry['units'] = list(units)
+        return entry
+
+    def refresh(self):
+        """Aktualizuje katalog; zwraca liczbę ponownie wczytanych plików."""
+        dirs = {}
+        files = {}
+        reread = 0
+
+        for series_key, category, json_rel in self._json_dirs(dirs):
+            for name in self._list(json_rel, 'json', dirs):
+                rel = f"{json_rel}/{name}"
+                path = os.path.join(self.data_dir, rel)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+
+                entry = self.files.get(rel)
+                if not entry or entry['mtime'] != stat.st_mtime or entry['size'] != stat.st_size:
+                    entry = self.describe(path, stat)
+                    reread += 1
+                entry.update({'series': series_key, 'category': category, 'file': name})
+                files[rel] = entry
+
+        changed = reread or dirs != self.dirs or files.keys() != self.files.keys()
+        self.dirs = dirs
+        self.files = files
+        if changed:
+            self.save()
+        return reread
+
+    # Odczyt
+
+    def entries(self, series_key, category=None):
+        """Pliki serii (opcjonalnie jednej kategorii) posortowane po nazwie, z pełną ścieżką."""
+        result = []
+        for rel, entry in sorted(self.files.items()):
+            if entry['series'] != series_key:
+                continue
+            if category is not None and entry['category'] != category:
+                continue
+            result.append(dict(entry, path=os.path.join(self.data_dir, rel)))
+        return result
+
+    def series(self):
+        """Serie mające przynajmniej jeden plik JSON: [(seria, liczba słów)]."""
+        totals = {}
+        for entry in self.files.values():
+            totals[entry['series']] = totals.get(entry['series'], 0) + entry['word_count']
+        return sorted(totals.items())
+
+    def categories(self, series_key="career_paths"):
+        """Kategorie serii z plikami: [(kategoria, [pliki])] alfabetycznie."""
+        grouped = {}
+        for entry in self.entries(series_key):
+            grouped.setdefault(entry['category'], []).append(entry)
+        return sorted(grouped.items())
@@ -0,0 +1,160 @@
+"""
+Fiszki Columnar Deck
+Deck z kolumnami NumPy (liczniki, kody unitów i części mowy, pola SR)
+do filtrowania i statystyk maskami zamiast pętli i kopiowania słowników
+"""
+
+import time
+
+from spaced_repetition import BatchSpacedRepetition
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+def encode_column(values):
+    """Koduje wartości jako (tablica napisów, kody int32)."""
+    ids = {}
+    codes = np.fromiter((ids.setdefault(v, len(ids)) for v in values), dtype=np.int32)
+    table = [None] * len(ids)
+    for value, code in ids.items():
+        table[code] = value
+    return table, codes
+
+
+class ColumnarDeck(list):
+    """
+    Zwykła lista słów (te same obiekty, kolejność decku) plus kolumny:
+    - correct, wrong: liczniki odpowiedzi (int64)
+    - unit_codes / units, pos_codes / parts_of_speech: kody + tablice napisów
+    - sr: BatchSpacedRepetition z polami SR (budowany przy pierwszym użyciu)
+    Metody o nazwach jak w SearchFilter/DecksManager są przez nie wywoływane
+    zamiast skanowania słów (jak w DatabaseDeck). Po zmianie liczników lub pól SR
+    słowa trzeba wywołać refresh(word) - aktualizuje tylko jego wiersz.
+    Wymaga numpy (pip install numpy).
+    """
+
+    def __init__(self, words=(), columns=None):
+        if not HAS_NUMPY:
+            raise ImportError("numpy not installed. pip install numpy")
+        super().__init__(words)
+        if columns is None:
+            n = len(self)
+            self.correct = np.fromiter((w.get('correct_count', 0) for w in self), dtype=np.int64, count=n)
+            self.wrong = np.fromiter((w.get('wrong_count', 0) for w in self), dtype=np.int64, count=n)
+            self.units, self.unit_codes = encode_column(w.get('unit', 'Unknown') for w in self)
+            self.parts_of_speech, self.pos_codes = encode_column(w.get('part_of_speech', '') for w in self)
+        else:
+            (self.correct, self.wrong, self.units, self.unit_codes,
+             self.parts_of_speech, self.pos_codes) = columns
+        self.positions = {id(w): i for i, w in enumerate(self)}
+        self._sr = None
+
+    def take(self, indices):
+        """Nowy ColumnarDeck z wybranych pozycji (kolumny wycinane, bez czytania słów)."""
+        idx = np.asarray(indices, dtype=np.intp)
+        return ColumnarDeck((self[i] for i in idx), columns=(
+            self.correct[idx], self.wrong[idx], self.units, self.unit_codes[idx],
+            self.parts_of_speech, self.pos_codes[idx],
+        ))
+
+    def refresh(self, word):
+        """Przepisuje liczniki i pola SR słowa do kolumn (słowa spoza decku są pomijane)."""
+        i = self.positions.get(id(word))
+        if i is None:
+            return
+        self.correct[i] = word.get('correct_count', 0)
+        self.wrong[i] = word.get('wrong_count', 0)
+        if self._sr is not None:
+            self._sr.load_word(i, word)
+
+    @property
+    def sr(self):
+        if self._sr is None:
+            self._sr = BatchSpacedRepetition(self)
+        return self._sr
+
+    # Kolumny pochodne
+
+    @property
+    def attempts(self):
+        return self.correct + self.wrong
+
+    def error_rates(self):
+        """Odsetek błędów (0 dla słów bez prób)."""
+        attempts = self.attempts
+        return np.divide(self.wrong, attempts, out=np.zeros(len(self)), where=attempts > 0)
+
+    def accuracies(self):
+        """Odsetek poprawnych odpowiedzi w procentach (0 dla słów bez prób)."""
+        attempts = self.attempts
+        return np.divide(self.correct * 100, attempts, out=np.zeros(len(self)), where=attempts > 0)
+
+    def status_mask(self, status):
+        """Maska jak warunki SearchFilter.filter_by_status."""
+        correct, wrong = self.correct, self.wrong
+        total = correct + wrong
+        if status == 'untouched':
+            return total == 0
+        if status == 'learning':
+            return (total > 0) & (total <= 5)
+        if status == 'known':
+            return correct > 3
+        if status == 'difficult':
+            return (wrong > correct) & (total > 0)
+        return np.zeros(len(self), dtype=bool)
+
+    def _words(self, mask):
+        return [self[i] for i in np.flatnonzero(mask)]
+
+    # Odpowiedniki SearchFilter / DecksManager
+
+    def filter_by_status(self, status):
+        return self._words(self.status_mask(status))
+
+    def in_units(self, units):
+        wanted = [code for code, unit in enumerate(self.units) if unit in units]
+        return self._words(np.isin(self.unit_codes, wanted))
+
+    def filter_by_category(self, category):
+        wanted = [code for code, pos in enumerate(self.parts_of_speech)
+                  if str(pos).lower() == category.lower()]
+        return self._words(np.isin(self.pos_codes, wanted))
+
+    def get_due_words(self, now=None):
+        now = time.time() if now is None else now
+        return [self[i] for i in self.sr.due_indices(now)]
+
+    def _by_error_rate(self, keep):
+        """
+        Słowa z próbami, dla których keep(error_rates) jest prawdą, od najtrudniejszych
+        (sortowanie stabilne, jak sorted(reverse=True)). Zwraca ColumnarDeck z tymi
+        samymi obiektami słów; error_rate i accuracy wersji słownikowej są tu
+        kolumnami (error_rates(), accuracies()), nie polami kopii słów.
+        """
+        rates = self.error_rates()
+        idx = np.flatnonzero(keep(rates) & (self.attempts > 0))
+        return self.take(idx[np.argsort(-rates[idx], kind='stable')])
+
+    def filter_by_difficulty(self, min_error_rate=0.4):
+        return self._by_error_rate(lambda rates: rates >= min_error_rate)
+
+    def create_difficult_deck(self):
+        return self._by_error_rate(lambda rates: rates > 0.5)
+
+    def deck_stats(self):
+        """Statystyki jak DecksManager.get_deck_stats (ten sam wzór, liczony z kolumn)."""
+        total = len(self)
+        if not total:
+            return {'total': 0, 'accuracy': 0}
+        correct = int(self.correct.sum())
+        attempts = correct + int(self.wrong.sum())
+        return {
+            'total': total,
+            'accuracy': (correct / attempts * 100) if attempts > 0 else 0,
+            'avg_error_rate': float(self.error_rates().mean()),
+            'attempts': attempts,
+        }
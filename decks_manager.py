@@ -12,6 +12,11 @@ class DecksManager:
         """
         Tworzy deck z trudnymi słowami (error_rate > 50%).
         """
+        if hasattr(words, 'create_difficult_deck'):
+            # ColumnarDeck - maska na kolumnach; te same obiekty słów, bez kopii
+            # (error_rate i accuracy jako kolumny decku)
+            return words.create_difficult_deck()
+        
         difficult = []
         
         for word in words:
@@ -34,6 +39,9 @@ class DecksManager:
     @staticmethod
     def get_deck_stats(deck):
         """Zwraca statystyki decku."""
+        if hasattr(deck, 'deck_stats'):
+            return deck.deck_stats()
+        
         if not deck:
             return {
                 'total': 0,
@@ -46,7 +54,12 @@ class DecksManager:
         total_attempts = total_correct + total_wrong
         
         accuracy = (total_correct / total_attempts * 100) if total_attempts > 0 else 0
-        avg_error_rate = sum(w.get('error_rate', 0) for w in deck) / total if total > 0 else 0
+        # Średni odsetek błędów wszystkich słów (0 dla słów bez prób) - liczony
+        # z liczników, jak w ColumnarDeck.deck_stats, nie z pól error_rate kopii
+        avg_error_rate = sum(
+            w.get('wrong_count', 0) / (w.get('correct_count', 0) + w.get('wrong_count', 0))
+            for w in deck if w.get('correct_count', 0) + w.get('wrong_count', 0) > 0
+        ) / total
         
         return {
             'total': total,
@@ -61,6 +74,10 @@ class DecksManager:
         Filtruje słowa po kategorii (POS).
         category: 'noun', 'verb', 'adjective', itp
         """
+        if hasattr(words, 'filter_by_category'):
+            # Deck z własnym filtrem (DatabaseDeck - zapytanie po indeksie part_of_speech,
+            # ColumnarDeck - maska na kodach części mowy)
+            return words.filter_by_category(category)
         return [w for w in words if w.get('part_of_speech', '').lower() == category.lower()]
     
     @staticmethod
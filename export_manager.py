@@ -68,7 +68,7 @@ class ExportManager:
         """Eksportuje słówka do formatu JSON."""
         try:
             with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(words, f, indent=2, ensure_ascii=False)
+                json.dump([dict(w) for w in words], f, indent=2, ensure_ascii=False)
             
             return True, f"Eksportowano {len(words)} słów do {filename}"
         except Exception as e:
@@ -1,15 +1,23 @@
 import tkinter as tk
-from tkinter import messagebox
-import json
+from tkinter import messagebox, ttk
 import os
-import random
-import re
 from datetime import datetime
 from settings_manager import SettingsManager
-from search_filter import SearchFilter
+from search_filter import SearchFilter, SearchSession
 from decks_manager import DecksManager
-from spaced_repetition import SpacedRepetitionManager
+from spaced_repetition import SpacedRepetitionManager, DueScheduler
 from analytics_manager import AnalyticsManager
+from journal_manager import AnswerJournal
+from progress_manager import ProgressStore
+from library_db import LibraryDatabase, DatabaseProgressStore
+from card_sampler import WeightedSampler
+from background_tasks import BackgroundWorker, read_json_file
+from catalog_manager import LibraryCatalog
+from stats_cache import UnitStatsCache
+from unit_index import UnitIndex
+from virtual_list import VirtualList
+from word_record import word_hook
+from columnar_deck import ColumnarDeck, HAS_NUMPY
 
 # Try to import auto-updater (optional)
 try:
@@ -29,9 +37,22 @@ class FlashcardApp:
         self.root.configure(bg=self.colors['bg'])
         
         self.words = []
+        self.progress = None
+        self.journal = None
+        self.library_db = None  # Otwierana tylko dla storage_backend = 'sqlite'
+        self.catalog = None  # Katalog plików z data/ (.fiszki_catalog.json)
+        self.loader = None  # Wątek wczytywania decków (BackgroundWorker)
+        self.loading_window = None
+        self.unit_selection = {}
+        self.unit_list = None
         self.current_word = None
         self.is_flipped = False
         self.selected_units = []
+        self.sampler = None  # Budowany raz na sesję w get_next_word
+        self.scheduler = None  # Kolejka powtórek SR dla tej samej puli
+        self.stats_cache = None  # Liczniki per unit, budowane przy pierwszym odczycie
+        self.unit_index = None  # unit -> pozycje słów, budowany raz na deck
+        self.search_index = None  # Indeks wyszukiwania, budowany przy pierwszym szukaniu
         self.current_file = None
         self.current_series = None
         self.session_active = False
@@ -54,6 +75,16 @@ class FlashcardApp:
         self.root.bind('<d>', lambda e: self.answer(True))
         self.root.bind('<Control-d>', lambda e: self.toggle_dark_mode())
         self.root.bind('<Control-r>', lambda e: self.start_quick_review())
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def on_close(self):
+        """Zapisuje postęp z dziennika przed zamknięciem okna."""
+        if self.loader:
+            self.loader.close()
+        self.save_progress()
+        if self.library_db:
+            self.library_db.close()
+        self.root.destroy()
         
     def start_quick_review(self):
         """Szybka sesja - tylko znane słowa (correct > 3), auto flip."""
@@ -307,31 +338,9 @@ class FlashcardApp:
             messagebox.showerror("Blad", "Folder data/ nie istnieje!")
             return
         
-        series = []
-        for item in os.listdir(data_dir):
-            if item.startswith('.'):
-                continue
-            item_path = os.path.join(data_dir, item)
-            if os.path.isdir(item_path):
-                # For Career Paths, check if it has categories with json files
-                if item == "career_paths":
-                    has_json = False
-                    for category in os.listdir(item_path):
-                        category_path = os.path.join(item_path, category)
-                        if os.path.isdir(category_path):
-                            json_dir = os.path.join(category_path, "json")
-                            if os.path.exists(json_dir) and os.listdir(json_dir):
-                                has_json = True
-                                break
-                    if has_json:
-                        series.append(item)
-                else:
-                    # For other series, check direct json folder
-                    json_dir = os.path.join(item_path, "json")
-                    if os.path.exists(json_dir):
-                        json_files = [f for f in os.listdir(json_dir) if f.endswith('.json')]
-                        if json_files:
-                            series.append(item)
+        # Serie z katalogu (odświeżanego po mtime zamiast listowania data/)
+        series_counts = self.get_catalog().series()
+        series = [key for key, _ in series_counts]
         
         if not series:
             messagebox.showwarning("Brak serii", "Nie znaleziono żadnych serii podręczników")
@@ -360,9 +369,9 @@ class FlashcardApp:
             "career_paths": "Career Paths"
         }
         
-        for s in series:
+        for s, word_count in series_counts:
             display_name = series_display.get(s, s.replace('_', ' ').title())
-            listbox.insert(tk.END, display_name)
+            listbox.insert(tk.END, f"{display_name} ({word_count} słów)")
         
         def load():
             sel = listbox.curselection()
@@ -382,17 +391,12 @@ class FlashcardApp:
                  cursor='hand2').pack(anchor='w')
     
     def select_file_from_series(self, series_key):
-        script_dir = os.path.dirname(__file__)
-        data_dir = os.path.join(script_dir, "data")
-        
         # Special handling for Career Paths (different directory structure)
         if series_key == "career_paths":
             self.select_career_paths_category()
             return
         
-        json_dir = os.path.join(data_dir, series_key, "json")
-        
-        json_files = sorted([f for f in os.listdir(json_dir) if f.endswith('.json')])
+        json_files = self.get_catalog().entries(series_key)
         
         if not json_files:
             messagebox.showwarning("Brak plikow", f"Brak plikow JSON dla serii {series_key}")
@@ -416,13 +420,12 @@ class FlashcardApp:
         listbox.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
         
         for f in json_files:
-            listbox.insert(tk.END, f.replace('_parsed.json', ''))
+            listbox.insert(tk.END, self.catalog_label(f))
         
         def load():
             sel = listbox.curselection()
             if sel:
-                file = json_files[sel[0]]
-                self.load_json(os.path.join(json_dir, file), series_key)
+                self.load_json(json_files[sel[0]]['path'], series_key)
                 select_win.destroy()
         
         tk.Button(container, text="Zaladuj", command=load,
@@ -433,21 +436,8 @@ class FlashcardApp:
     
     def select_career_paths_category(self):
         """Special handler for Career Paths categories."""
-        script_dir = os.path.dirname(__file__)
-        data_dir = os.path.join(script_dir, "data", "career_paths")
-        
-        # List all categories (skip .template)
-        categories = []
-        for item in os.listdir(data_dir):
-            if item.startswith('.'):  # Skip hidden folders like .template
-                continue
-            item_path = os.path.join(data_dir, item)
-            if os.path.isdir(item_path):
-                json_dir = os.path.join(item_path, "json")
-                if os.path.exists(json_dir):
-                    json_files = [f for f in os.listdir(json_dir) if f.endswith('.json')]
-                    if json_files:
-                        categories.append((item, json_files))
+        # Kategorie z plikami JSON, alfabetycznie (ukryte jak .template pomijane w katalogu)
+        categories = self.get_catalog().categories("career_paths")
         
         if not categories:
             messagebox.showwarning("Brak kategorii", "Brak dostepnych kategorii Career Paths")
@@ -479,25 +469,22 @@ class FlashcardApp:
         listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=listbox.yview)
         
-        # Sortuj kategorie alfabetycznie
-        categories.sort(key=lambda x: x[0])
-        
         for cat, files in categories:
-            listbox.insert(tk.END, f"{cat} ({len(files)} pliki)")
+            word_count = sum(f['word_count'] for f in files)
+            listbox.insert(tk.END, f"{cat} ({len(files)} pliki, {word_count} słów)")
         
         def load(event=None):
             sel = listbox.curselection()
             if sel:
                 category_name, json_files = categories[sel[0]]
-                json_dir = os.path.join(data_dir, category_name, "json")
                 
                 # If only one file, load it directly
                 if len(json_files) == 1:
-                    self.load_json(os.path.join(json_dir, json_files[0]), "career_paths")
+                    self.load_json(json_files[0]['path'], "career_paths")
                     select_win.destroy()
                 else:
                     # If multiple files, show another selection window
-                    self.select_career_paths_file(category_name, json_files, json_dir)
+                    self.select_career_paths_file(category_name, json_files)
                     select_win.destroy()
         
         # Bind double-click and Enter key to load
@@ -510,7 +497,7 @@ class FlashcardApp:
                  padx=20, pady=6,
                  cursor='hand2').pack(anchor='w')
     
-    def select_career_paths_file(self, category_name, json_files, json_dir):
+    def select_career_paths_file(self, category_name, json_files):
         """Select specific JSON file within a Career Paths category."""
         select_win = tk.Toplevel(self.root)
         select_win.title(f"Wybierz plik - {category_name}")
@@ -529,14 +516,13 @@ class FlashcardApp:
                             relief='solid', bd=1)
         listbox.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
         
-        for f in sorted(json_files):
-            listbox.insert(tk.END, f.replace('_parsed.json', ''))
+        for f in json_files:
+            listbox.insert(tk.END, self.catalog_label(f))
         
         def load():
             sel = listbox.curselection()
             if sel:
-                file = sorted(json_files)[sel[0]]
-                self.load_json(os.path.join(json_dir, file), "career_paths")
+                self.load_json(json_files[sel[0]]['path'], "career_paths")
                 select_win.destroy()
         
         tk.Button(container, text="Zaladuj", command=load,
@@ -545,30 +531,166 @@ class FlashcardApp:
                  padx=20, pady=6,
                  cursor='hand2').pack(anchor='w')
     
-    def load_json(self, filepath, series_key):
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                self.words = json.load(f)
-            
-            self.current_file = filepath
-            self.current_series = series_key
-            filename = os.path.basename(filepath).replace('_parsed.json', '')
-            self.file_label.config(text=filename)
-            self.show_unit_selection()
-            
-        except Exception as e:
-            messagebox.showerror("Blad", f"Nie mozna zaladowac:\n{e}")
+    def get_catalog(self):
+        """Katalog biblioteki, odświeżany przy każdym otwarciu dialogu (tylko zmiany)."""
+        if self.catalog is None:
+            self.catalog = LibraryCatalog(os.path.join(os.path.dirname(__file__), "data"))
+        self.catalog.refresh()
+        return self.catalog
+    
+    @staticmethod
+    def catalog_label(entry):
+        """Nazwa pliku w dialogu wyboru z liczbą słów i unitów."""
+        name = entry['file'].replace('_parsed.json', '')
+        return f"{name} ({entry['word_count']} słów, {len(entry['units'])} unitów)"
+    
+    def get_library_db(self):
+        """Zwraca bazę SQLite biblioteki (otwiera ją przy pierwszym użyciu)."""
+        if self.library_db is None:
+            self.library_db = LibraryDatabase()
+        return self.library_db
+    
+    def load_json(self, filepath, series_key, on_loaded=None):
+        """
+        Wczytuje deck w tle (okno postępu z przyciskiem Anuluj).
+        on_loaded() jest wołane w wątku Tk po podmianie decku.
+        """
+        # Zapisz postęp poprzedniego decku zanim wątek przeczyta magazyn postępu
+        self.save_progress()
+        
+        if self.loader is None:
+            self.loader = BackgroundWorker(self.root, delay_ms=0)
+        db = self.get_library_db() if self.settings.get('storage_backend') == 'sqlite' else None
+        
+        self.show_loading_window(filepath)
+        self.loader.submit(
+            lambda task: self.read_deck(filepath, series_key, db, task),
+            lambda deck: self.deck_loaded(deck, filepath, series_key, on_loaded),
+            on_error=self.deck_load_failed,
+            on_progress=self.update_loading_window,
+        )
+    
+    def read_deck(self, filepath, series_key, db, task):
+        """
+        Czyta deck (wątek roboczy, tylko odczyt). None = anulowano.
+        Postęp i dziennik dołącza attach_progress w wątku Tk.
+        """
+        if db is not None:
+            category = ''
+            if series_key == "career_paths":
+                category = os.path.basename(os.path.dirname(os.path.dirname(filepath)))
+            task.report(0.2, "Wczytywanie z bazy...")
+            words = db.load_deck(filepath, series_key, category)
+            # Postęp zapisywany bezpośrednio w bazie (WAL), bez dziennika
+            return words, DatabaseProgressStore(db, filepath), None
+        
+        # Rekordy Word zamiast słowników (~3x mniej pamięci przy dużych deckach)
+        words = read_json_file(filepath, task, share=0.8, object_hook=word_hook())
+        if words is None or task.cancelled():
+            return None
+        task.report(1.0, "Gotowe")
+        return words, None, None
+    
+    def attach_progress(self, words, filepath):
+        """
+        Dołącza postęp z magazynu i dziennika (wątek Tk - answer() dopisuje
+        do tego samego dziennika, więc zapis i kompaktowanie nie mogą iść w tle).
+        """
+        # Treść decku jest tylko do odczytu - postęp dołączamy z osobnego magazynu
+        progress = ProgressStore(filepath)
+        progress.apply(words)
+        journal = AnswerJournal(filepath, progress)
+        # Odtwórz odpowiedzi, które nie trafiły jeszcze do magazynu postępu
+        if journal.replay(words):
+            journal.compact()
+        if HAS_NUMPY:
+            # Kolumny liczników dla filtrów i talii trudnych słów
+            words = ColumnarDeck(words)
+        return words, progress, journal
+    
+    def deck_loaded(self, deck, filepath, series_key, on_loaded=None):
+        """Podmienia deck na wczytany w tle (wątek Tk)."""
+        self.close_loading_window()
+        if deck is None:
+            return
+        
+        # Odpowiedzi udzielone w trakcie wczytywania trafiają jeszcze do starego decku
+        self.save_progress()
+        words, progress, journal = deck
+        if progress is None:
+            words, progress, journal = self.attach_progress(words, filepath)
+        self.words, self.progress, self.journal = words, progress, journal
+        
+        self.sampler = None
+        self.scheduler = None
+        self.stats_cache = None
+        self.unit_index = None
+        self.current_file = filepath
+        self.current_series = series_key
+        filename = os.path.basename(filepath).replace('_parsed.json', '')
+        self.file_label.config(text=filename)
+        self.show_unit_selection()
+        if on_loaded:
+            on_loaded()
+    
+    def deck_load_failed(self, error):
+        self.close_loading_window()
+        messagebox.showerror("Blad", f"Nie mozna zaladowac:\n{error}")
+    
+    def show_loading_window(self, filepath):
+        """Okno postępu wczytywania z przyciskiem Anuluj."""
+        self.close_loading_window()
+        
+        win = tk.Toplevel(self.root)
+        win.title("Wczytywanie")
+        win.geometry("380x140")
+        win.configure(bg='white')
+        win.resizable(False, False)
+        win.transient(self.root)
+        win.protocol("WM_DELETE_WINDOW", self.cancel_loading)
+        
+        filename = os.path.basename(filepath).replace('_parsed.json', '')
+        tk.Label(win, text=f"Wczytywanie: {filename}", font=('Arial', 10, 'bold'),
+                bg='white').pack(anchor='w', padx=20, pady=(15, 5))
+        
+        self.loading_bar = ttk.Progressbar(win, mode='determinate', maximum=100, length=340)
+        self.loading_bar.pack(padx=20)
+        self.loading_label = tk.Label(win, text="", font=('Arial', 9), bg='white', fg='gray')
+        self.loading_label.pack(anchor='w', padx=20, pady=(4, 6))
+        
+        tk.Button(win, text="Anuluj", command=self.cancel_loading,
+                 bg='white', fg='black', font=('Arial', 9),
+                 relief='solid', bd=1, padx=12, pady=2,
+                 cursor='hand2').pack(anchor='e', padx=20)
+        self.loading_window = win
+    
+    def update_loading_window(self, fraction, message):
+        if self.loading_window:
+            self.loading_bar['value'] = fraction * 100
+            self.loading_label.config(text=message)
+    
+    def close_loading_window(self):
+        if self.loading_window:
+            self.loading_window.destroy()
+            self.loading_window = None
+    
+    def cancel_loading(self):
+        """Anuluje wczytywanie; obecny deck zostaje bez zmian."""
+        if self.loader:
+            self.loader.cancel()
+        self.close_loading_window()
     
-    def natural_sort_key(self, unit):
-        parts = re.findall(r'\d+|\D+', str(unit))
-        return [int(part) if part.isdigit() else part for part in parts]
+    def get_unit_index(self):
+        """Indeks jednostek bieżącego decku (budowany w jednym przejściu)."""
+        if self.unit_index is None or self.unit_index.words is not self.words:
+            self.unit_index = UnitIndex(self.words)
+        return self.unit_index
     
     def show_unit_selection(self):
         for widget in self.control_frame.winfo_children():
             widget.destroy()
         
-        units_raw = set(w.get('unit', 'Unknown') for w in self.words)
-        units = sorted(units_raw, key=self.natural_sort_key)
+        unit_counts = self.get_unit_index().counts()
         
         tk.Label(self.control_frame, text="Wybierz dzialy:", 
                 font=('Arial', 11, 'bold'), 
@@ -602,72 +724,49 @@ class FlashcardApp:
                  padx=8, pady=3,
                  cursor='hand2').pack(side=tk.LEFT)
         
-        canvas_frame = tk.Frame(self.control_frame, bg='white', 
-                               relief='solid', bd=1)
-        canvas_frame.pack(anchor='w', fill=tk.BOTH, expand=True, pady=(0, 12))
-        
-        canvas = tk.Canvas(canvas_frame, bg='white', 
-                          highlightthickness=0,
-                          bd=0)
-        
-        v_scrollbar = tk.Scrollbar(canvas_frame, orient=tk.VERTICAL, 
-                                  command=canvas.yview)
-        v_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        
-        h_scrollbar = tk.Scrollbar(canvas_frame, orient=tk.HORIZONTAL, 
-                                  command=canvas.xview)
-        h_scrollbar.pack(side=tk.BOTTOM, fill=tk.X)
-        
-        canvas.configure(yscrollcommand=v_scrollbar.set,
-                        xscrollcommand=h_scrollbar.set)
-        canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        
-        cb_frame = tk.Frame(canvas, bg='white')
-        canvas.create_window((0, 0), window=cb_frame, anchor='nw')
-        
-        self.unit_vars = {}
-        
-        row = 0
-        
+        # Wiersze tworzone tylko dla widocznych unitów, zaznaczenia w self.unit_selection
+        self.unit_selection = {unit: False for unit, count in unit_counts}
         unit_label = "Unit"
         
-        for unit in units:
+        def create_row(parent):
             var = tk.BooleanVar(value=False)
-            self.unit_vars[unit] = var
-            
-            count = sum(1 for w in self.words if w.get('unit') == unit)
-            
-            cb = tk.Checkbutton(cb_frame, 
-                               text=f"{unit_label} {unit} ({count})", 
+            cb = tk.Checkbutton(parent, 
                                variable=var,
                                font=('Arial', 9),
                                bg='white',
                                activebackground='white',
-                               anchor='w')
-            cb.grid(row=row, column=0, sticky='w', padx=6, pady=1)
-            row += 1
-        
-        cb_frame.update_idletasks()
-        canvas.configure(scrollregion=canvas.bbox("all"))
+                               anchor='w', padx=6)
+            cb.var = var
+            return cb
         
-        def on_frame_configure(event):
-            canvas.configure(scrollregion=canvas.bbox("all"))
+        def update_row(cb, index, item, selected):
+            unit, count = item
+            cb.var.set(self.unit_selection[unit])
+            cb.configure(text=f"{unit_label} {unit} ({count})",
+                         command=lambda: self.unit_selection.__setitem__(unit, cb.var.get()))
         
-        cb_frame.bind("<Configure>", on_frame_configure)
+        self.unit_list = VirtualList(self.control_frame, create_row, update_row,
+                                     row_height=24, relief='solid', bd=1)
+        self.unit_list.pack(anchor='w', fill=tk.BOTH, expand=True, pady=(0, 12))
+        self.unit_list.set_items(unit_counts)
         
         self.control_frame.pack(anchor='w', fill=tk.BOTH, expand=True)
     
+    def set_unit_selection(self, choose):
+        """Ustawia zaznaczenie każdego unitu na choose(obecny stan)."""
+        for unit, checked in self.unit_selection.items():
+            self.unit_selection[unit] = choose(checked)
+        if self.unit_list:
+            self.unit_list.refresh()
+    
     def select_all(self):
-        for var in self.unit_vars.values():
-            var.set(True)
+        self.set_unit_selection(lambda checked: True)
     
     def select_none(self):
-        for var in self.unit_vars.values():
-            var.set(False)
+        self.set_unit_selection(lambda checked: False)
     
     def invert_selection(self):
-        for var in self.unit_vars.values():
-            var.set(not var.get())
+        self.set_unit_selection(lambda checked: not checked)
     
     def toggle_session(self):
         if not self.session_active:
@@ -676,12 +775,14 @@ class FlashcardApp:
             self.stop_learning()
     
     def start_learning(self):
-        self.selected_units = [u for u, v in self.unit_vars.items() if v.get()]
+        self.selected_units = [u for u, checked in self.unit_selection.items() if checked]
         
         if not self.selected_units:
             messagebox.showwarning("Uwaga", "Wybierz przynajmniej jeden dzial!")
             return
         
+        self.sampler = None
+        self.scheduler = None
         self.session_active = True
         self.session_start_time = tk.IntVar(value=0)
         self.session_correct = 0
@@ -725,6 +826,7 @@ class FlashcardApp:
                 'accuracy': accuracy,
             })
         
+        self.save_progress()
         self.update_stats()
         self.timer_label.config(text="00:00")
     
@@ -741,30 +843,17 @@ class FlashcardApp:
         self.timer_job = self.root.after(1000, self.update_timer)
     
     def get_next_word(self):
-        available = [w for w in self.words if w.get('unit') in self.selected_units]
-        
-        if not available:
-            return None
-        
-        weights = []
-        for w in available:
-            wrong = w.get('wrong_count', 0)
-            correct = w.get('correct_count', 0)
-            total = wrong + correct
-            
-            # Algorytm: słowa z błędami 3x częściej, untouched co sekundę
-            if total == 0:
-                # Nowe słowa: bazowa waga
-                weight = 1
-            else:
-                # Error rate: wrong / (wrong + correct)
-                error_rate = wrong / total
-                # Słowa z błędami pojawiają się 3x częściej
-                weight = max(1, 1 + (error_rate * 3))
-            
-            weights.append(weight)
-        
-        return random.choices(available, weights=weights)[0]
+        if self.sampler is None:
+            # Pula kart budowana raz; answer() aktualizuje tylko wagę jednej karty
+            available = self.get_unit_index().words_in(self.selected_units)
+            self.sampler = WeightedSampler(available)
+            self.scheduler = DueScheduler(available)
+        
+        # Najpierw słowa, którym minął termin powtórki (SM-2), potem losowanie ważone
+        due = self.scheduler.pop_due()
+        if due is not None:
+            return due
+        return self.sampler.sample()
     
     def show_next_card(self):
         self.current_word = self.get_next_word()
@@ -827,28 +916,40 @@ class FlashcardApp:
         
         # Update SR (Spaced Repetition)
         SpacedRepetitionManager.update_sr(self.current_word, quality)
-        
-        self.save_progress()
+        if self.stats_cache:
+            self.stats_cache.refresh(self.current_word)
+        if hasattr(self.words, 'refresh'):
+            self.words.refresh(self.current_word)
+        if self.sampler:
+            self.sampler.refresh(self.current_word)
+            self.scheduler.reschedule(self.current_word)
+        
+        # Dopisz zdarzenie do dziennika; zapis magazynu postępu tylko co COMPACT_EVERY
+        if self.journal:
+            self.journal.append(self.current_word, correct)
+            if self.journal.needs_compaction():
+                self.save_progress()
+        elif self.progress:
+            self.progress.record(self.current_word)
         self.update_stats()  # Update display in real-time
         self.show_next_card()
     
     def check_unit_completion(self):
         """Sprawdza czy wszystkie słowa w unit są przynajmniej raz zagrań."""
-        unit_words = [w for w in self.words if w.get('unit') in self.selected_units]
-        not_touched = [w for w in unit_words if w.get('correct_count', 0) + w.get('wrong_count', 0) == 0]
+        stats = self.get_stats_cache().totals(self.selected_units)
         
-        if not not_touched:
+        if not stats['untouched']:
             # Wszystkie słowa mają przynajmniej jedną próbę - unit complete!
-            self.show_completion_popup(unit_words)
+            self.show_completion_popup(stats)
             return
         
-        messagebox.showinfo("Koniec", f"Brak więcej słów. Pozostało {len(not_touched)} nowych.")
+        messagebox.showinfo("Koniec", f"Brak więcej słów. Pozostało {stats['untouched']} nowych.")
     
-    def show_completion_popup(self, unit_words):
+    def show_completion_popup(self, stats):
         """Celebratory popup przy completion unit'u."""
-        total = len(unit_words)
-        correct = sum(w.get('correct_count', 0) for w in unit_words)
-        wrong = sum(w.get('wrong_count', 0) for w in unit_words)
+        total = stats['total']
+        correct = stats['correct']
+        wrong = stats['wrong']
         total_attempts = correct + wrong
         accuracy = (correct / total_attempts * 100) if total_attempts > 0 else 0
         
@@ -910,6 +1011,10 @@ Czas: {elapsed} minut
         
         self.selected_units = set(w.get('unit', 'Unknown') for w in difficult_words)
         self.words = difficult_words  # Tymczasowo ustaw words do trudnych
+        self.sampler = None
+        self.scheduler = None
+        self.stats_cache = None
+        self.unit_index = None
         
         self.session_active = True
         self.session_start_time = datetime.now()
@@ -948,22 +1053,36 @@ Czas: {elapsed} minut
                 bg='white',
                 anchor='w').pack(anchor='w', pady=(0, 10))
         
-        listbox = tk.Listbox(container, font=('Arial', 10), 
-                            relief='solid', bd=1)
-        listbox.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+        # Liczniki w jednym przejściu zamiast filtrowania decku dla każdej kategorii
+        pos_counts = {}
+        for w in self.words:
+            pos = w.get('part_of_speech', '').lower()
+            pos_counts[pos] = pos_counts.get(pos, 0) + 1
         
-        for cat in categories:
-            count = len(DecksManager.filter_by_category(self.words, cat))
-            listbox.insert(tk.END, f"{cat} ({count})")
+        def create_row(parent):
+            return tk.Label(parent, font=('Arial', 10), anchor='w', padx=4)
+        
+        def update_row(label, index, cat, selected):
+            label.configure(text=f"{cat} ({pos_counts.get(cat.lower(), 0)})",
+                            bg='#cce0ff' if selected else 'white')
+        
+        cat_list = VirtualList(container, create_row, update_row, row_height=22,
+                               on_activate=lambda index, cat: load_category(),
+                               relief='solid', bd=1)
+        cat_list.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
+        cat_list.set_items(categories)
         
         def load_category():
-            sel = listbox.curselection()
-            if sel:
-                category = categories[sel[0]]
+            if cat_list.selected is not None:
+                category = categories[cat_list.selected]
                 cat_words = DecksManager.filter_by_category(self.words, category)
                 
                 self.selected_units = set(w.get('unit', 'Unknown') for w in cat_words)
                 self.words = cat_words
+                self.sampler = None
+                self.scheduler = None
+                self.stats_cache = None
+                self.unit_index = None
                 
                 self.session_active = True
                 self.session_start_time = datetime.now()
@@ -1028,10 +1147,6 @@ Czas: {elapsed} minut
     
     def open_search_dialog(self):
         """Otwiera dialog do wyszukiwania i filtrowania słów."""
-        if not self.words:
-            messagebox.showwarning("Brak danych", "Najpierw wczytaj słowa!")
-            return
-        
         search_window = tk.Toplevel(self.root)
         search_window.title(" Szukaj i Filtruj")
         search_window.geometry("600x500")
@@ -1046,6 +1161,15 @@ Czas: {elapsed} minut
         search_entry.pack(fill=tk.X, pady=(5, 10))
         search_entry.focus()
         
+        fuzzy_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(search_frame, text="Przybliżone (literówki, bez polskich znaków)",
+                      variable=fuzzy_var, font=('Arial', 9), bg='white').pack(anchor='w')
+        
+        # Bez wczytanego decku szukamy od razu w całej bibliotece
+        library_var = tk.BooleanVar(value=not self.words)
+        tk.Checkbutton(search_frame, text="Cała biblioteka (wszystkie serie, dwuklik otwiera plik)",
+                      variable=library_var, font=('Arial', 9), bg='white').pack(anchor='w')
+        
         # Filter buttons frame
         filter_frame = tk.Frame(search_window, bg='white')
         filter_frame.pack(fill=tk.X, padx=10, pady=5)
@@ -1063,85 +1187,201 @@ Czas: {elapsed} minut
         
         selected_filter = tk.StringVar(value='all')
         
+        status_buttons = []
         for label, value in buttons_config:
-            tk.Radiobutton(btn_frame, text=label, variable=selected_filter, 
-                          value=value, font=('Arial', 9), bg='white').pack(anchor='w')
-        
-        # Results frame
-        tk.Label(search_window, text="Wyniki (max 50):", font=('Arial', 10), 
-                bg='white').pack(anchor='w', padx=10, pady=(10, 0))
-        
-        results_frame = tk.Frame(search_window, bg='white', relief='solid', bd=1)
-        results_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(5, 10))
-        
-        scrollbar = tk.Scrollbar(results_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            button = tk.Radiobutton(btn_frame, text=label, variable=selected_filter, 
+                                    value=value, font=('Arial', 9), bg='white')
+            button.pack(anchor='w')
+            if value != 'all':
+                status_buttons.append(button)
+        
+        # Postęp w bazie biblioteki jest aktualny tylko dla backendu sqlite
+        library_status = self.settings.get('storage_backend') == 'sqlite'
+        status_note = tk.Label(filter_frame, font=('Arial', 8), bg='white', fg='#888888',
+                               text="Filtry postępu w całej bibliotece wymagają zapisu w bazie (storage_backend = sqlite)")
+        
+        def update_status_filters(*args):
+            """Bez postępu w bazie filtry statusu w trybie biblioteki są wyłączone."""
+            disabled = library_var.get() and not library_status
+            for button in status_buttons:
+                button.configure(state=tk.DISABLED if disabled else tk.NORMAL)
+            if disabled:
+                status_note.pack(anchor='w')
+                if selected_filter.get() != 'all':
+                    selected_filter.set('all')
+            else:
+                status_note.pack_forget()
         
-        results_text = tk.Text(results_frame, font=('Arial', 9), height=15, width=70,
-                              yscrollcommand=scrollbar.set, bg='white', fg='black')
-        results_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.config(command=results_text.yview)
+        update_status_filters()
         
-        def do_search():
-            """Szukaj i filtruj."""
-            results_text.delete(1.0, tk.END)
+        # Results frame
+        results_header = tk.Label(search_window, text="Wyniki:", font=('Arial', 10),
+                                  bg='white', anchor='w', justify='left')
+        results_header.pack(anchor='w', fill=tk.X, padx=10, pady=(10, 0))
+        
+        # Sesja tworzona w wątku roboczym przy pierwszym wyszukiwaniu, tylko w zmiennych
+        # okna; gotowy indeks trafia do self.search_index dopiero w wątku Tk
+        words = self.words
+        known_index = self.search_index if self.search_index and self.search_index.words is words else None
+        session_holder = []
+        library_synced = []
+        worker = BackgroundWorker(self.root)
+        
+        def run_library_search(query, status, task):
+            """Szukaj we wszystkich plikach z data/ (wątek roboczy)."""
+            db = self.get_library_db()
+            if not library_synced:
+                # Import tylko plików zmienionych od ostatniego razu
+                db.sync_library(os.path.join(os.path.dirname(__file__), "data"))
+                library_synced.append(True)
+            if not query or task.cancelled():
+                return "Wpisz frazę, aby szukać w całej bibliotece", [], 'library'
             
-            query = search_entry.get().strip()
-            filter_type = selected_filter.get()
+            hits = db.search_library(query, status=status)
+            if not hits:
+                return "Brak wyników", [], 'library'
+            header = (f"Biblioteka: {len(hits)}{'+' if len(hits) >= 200 else ''} trafień "
+                      f"(dwuklik otwiera plik)")
+            return header, hits, 'library'
+        
+        def run_search(query, filter_type, fuzzy, library, deck_stats, task):
+            """
+            Szukaj i filtruj (wątek roboczy) - zwraca nagłówek i listę trafień.
+            deck_stats: statystyki całego decku policzone w wątku Tk przy zleceniu.
+            """
+            status = filter_type if filter_type in ('untouched', 'difficult', 'known') else None
+            if library:
+                return run_library_search(query, status, task)
+            if not words:
+                return "Najpierw wczytaj słowa lub zaznacz 'Cała biblioteka'", [], 'words'
             
-            # Wyszukaj
-            if query:
-                results = SearchFilter.search(self.words, query)
-            else:
-                results = self.words
+            if not session_holder:
+                session_holder.append(SearchSession(words, known_index))
+            session = session_holder[0]
             
-            # Filtruj
-            if filter_type == 'untouched':
-                results = SearchFilter.filter_by_status(results, 'untouched')
-            elif filter_type == 'difficult':
-                results = SearchFilter.filter_by_status(results, 'difficult')
-            elif filter_type == 'known':
-                results = SearchFilter.filter_by_status(results, 'known')
+            # Wyszukaj (zawężając poprzednie trafienia) i filtruj
+            results = session.search(query, status=status, fuzzy=fuzzy)
             
-            # Pokaż wyniki
             if not results:
-                results_text.insert(tk.END, "Brak wyników")
-                return
-            
-            stats = SearchFilter.get_statistics(results)
-            header = f"Znalezione: {stats['total']} | Dokładność: {stats['accuracy']:.1f}% | Nowe: {stats['untouched']} | Trudne: {stats['difficult']}\n"
-            header += "=" * 65 + "\n\n"
-            results_text.insert(tk.END, header)
+                return "Brak wyników", [], 'words'
+            if task.cancelled():
+                return None
             
-            for word in results[:50]:
-                preview = SearchFilter.get_quick_preview(word)
-                correct = word.get('correct_count', 0)
-                wrong = word.get('wrong_count', 0)
-                status = f" [{correct}✓ {wrong}✗]" if correct + wrong > 0 else " [NEW]"
-                results_text.insert(tk.END, f"{preview}{status}\n\n")
+            if results is words:
+                stats = deck_stats
+            else:
+                stats = SearchFilter.get_statistics(results)
+            header = (f"Znalezione: {stats['total']} | Dokładność: {stats['accuracy']:.1f}% | "
+                      f"Nowe: {stats['untouched']} | Trudne: {stats['difficult']}")
+            return header, results, 'words'
+        
+        # Wiersze wyników formatowane dopiero przy wyświetleniu
+        result_kind = ['words']
+        
+        def create_row(parent):
+            return tk.Label(parent, font=('Arial', 9), anchor='w', justify='left', padx=4)
+        
+        def update_row(label, index, item, selected):
+            preview = SearchFilter.get_quick_preview(item)
+            if result_kind[0] == 'library':
+                filename = os.path.basename(item['path']).replace('_parsed.json', '')
+                source = ' / '.join(part for part in (item['series'], item['category'], filename) if part)
+                text = f"{preview}\n   [{source} | unit {item['unit']}]"
+                fg = '#1a4d8f'
+            else:
+                correct = item.get('correct_count', 0)
+                wrong = item.get('wrong_count', 0)
+                text = f"{preview}\n   [{correct}✓ {wrong}✗]" if correct + wrong > 0 else f"{preview}\n   [NEW]"
+                fg = 'black'
+            label.configure(text=text, fg=fg, bg='#cce0ff' if selected else 'white')
+        
+        def open_hit(index, hit):
+            """Dwuklik na trafieniu z biblioteki otwiera jego plik i unit."""
+            if result_kind[0] == 'library':
+                search_window.destroy()
+                self.open_library_hit(hit)
+        
+        results_list = VirtualList(search_window, create_row, update_row, row_height=38,
+                                   on_activate=open_hit, relief='solid', bd=1)
+        results_list.pack(fill=tk.BOTH, expand=True, padx=10, pady=(5, 10))
+        
+        def show_results(result):
+            """Podmienia elementy listy; widgety powstają tylko dla widocznych wierszy (wątek Tk)."""
+            if result is None or not results_list.winfo_exists():
+                return
+            header, items, kind = result
+            result_kind[0] = kind
+            if session_holder and self.words is words and self.search_index is not session_holder[0].index:
+                # Indeks zbudowany w tle przydaje się kolejnym oknom szukania
+                self.search_index = session_holder[0].index
+            results_header.configure(text=header)
+            results_list.set_items(items)
+        
+        def do_search(delay_ms=None):
+            """Zleca wyszukiwanie; seria klawiszy daje jedno zapytanie."""
+            query = search_entry.get().strip()
+            filter_type = selected_filter.get()
+            fuzzy = fuzzy_var.get()
+            library = library_var.get()
+            if library:
+                self.get_library_db()  # otwarcie bazy w wątku Tk, import w tle
+            if library and not library_synced:
+                results_header.configure(text="Indeksowanie biblioteki...")
+                results_list.set_items([])
+            # Liczniki zmienia answer() w wątku Tk - migawka statystyk przed zleceniem
+            deck_stats = self.get_stats_cache().get_statistics() if words and not library else None
+            worker.submit(lambda task: run_search(query, filter_type, fuzzy, library, deck_stats, task),
+                          show_results, delay_ms=delay_ms)
         
         def on_entry_change(event=None):
             """Auto-search na każdą zmianę."""
             do_search()
         
+        def on_close(event=None):
+            if event is None or event.widget is search_window:
+                worker.close()
+        
+        search_window.bind('<Destroy>', on_close)
+        
         search_entry.bind('<KeyRelease>', on_entry_change)
         selected_filter.trace('w', lambda *args: do_search())
+        fuzzy_var.trace('w', lambda *args: do_search())
+        library_var.trace('w', lambda *args: (update_status_filters(), do_search()))
         
         # Initial search
-        do_search()
+        do_search(delay_ms=0)
+    
+    def open_library_hit(self, hit):
+        """Wczytuje plik trafienia z wyszukiwania w bibliotece i zaznacza jego unit."""
+        if self.session_active:
+            self.stop_learning()
+        
+        def select_unit():
+            if hit['unit'] in self.unit_selection:
+                self.unit_selection[hit['unit']] = True
+                self.unit_list.see(self.get_unit_index().units.index(hit['unit']))
+        
+        self.load_json(hit['path'], hit['series'], on_loaded=select_unit)
     
     def save_progress(self):
-        if self.current_file and os.path.exists(self.current_file):
-            try:
-                with open(self.current_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.words, f, ensure_ascii=False, indent=2)
-            except Exception as e:
-                print(f"Blad zapisu: {e}")
+        """Przenosi dziennik odpowiedzi do magazynu postępu."""
+        if self.journal:
+            self.journal.compact()
+        elif hasattr(self.progress, 'flush'):
+            # Backend sqlite: magazyn JSON aktualny na wypadek powrotu do storage_backend = json
+            self.progress.flush()
+    
+    def get_stats_cache(self):
+        """Liczniki per unit dla bieżącego decku (budowane raz, potem przyrostowo)."""
+        if self.stats_cache is None:
+            self.stats_cache = UnitStatsCache(self.words)
+        return self.stats_cache
     
     def update_stats(self):
-        total = len([w for w in self.words if w.get('unit') in self.selected_units])
-        correct = sum(w.get('correct_count', 0) for w in self.words if w.get('unit') in self.selected_units)
-        wrong = sum(w.get('wrong_count', 0) for w in self.words if w.get('unit') in self.selected_units)
+        stats = self.get_stats_cache().totals(self.selected_units)
+        total = stats['total']
+        correct = stats['correct']
+        wrong = stats['wrong']
         
         if self.session_active:
             accuracy = ((self.session_correct / (self.session_correct + self.session_wrong)) * 100) if (self.session_correct + self.session_wrong) > 0 else 0
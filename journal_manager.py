@@ -0,0 +1,124 @@
+"""
+Fiszki Answer Journal
+Dziennik odpowiedzi (append-only) z okresową kompakcją do magazynu postępu
+"""
+
+import json
+import os
+from datetime import datetime
+
+from progress_manager import ProgressStore, deck_key, word_id
+from spaced_repetition import SpacedRepetitionManager
+
+
+class AnswerJournal:
+    """
+    Dziennik zdarzeń odpowiedzi dla jednego decku.
+    Każda odpowiedź to jedna linia JSON dopisywana na końcu pliku (O(1)),
+    zamiast przepisywania całego postępu po każdym kliknięciu.
+    """
+
+    JOURNAL_DIR = '.fiszki_journal'
+    COMPACT_EVERY = 50  # Liczba odpowiedzi między kompakcjami
+
+    PROGRESS_FIELDS = ProgressStore.PROGRESS_FIELDS
+
+    def __init__(self, deck_path, store=None, journal_dir=None):
+        self.deck_path = deck_path
+        self.store = store or ProgressStore(deck_path)
+        self.journal_dir = journal_dir or self.JOURNAL_DIR
+        self.path = os.path.join(self.journal_dir, self.journal_name(deck_path))
+        self.pending = self.count_entries()
+
+    @staticmethod
+    def journal_name(deck_path):
+        """Nazwa pliku dziennika: <seria lub kategoria>__<plik decku>.jsonl"""
+        return deck_key(deck_path) + '.jsonl'
+
+    def count_entries(self):
+        """Zwraca liczbę zdarzeń czekających na kompakcję."""
+        if not os.path.exists(self.path):
+            return 0
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return sum(1 for line in f if line.strip())
+
+    def append(self, word, correct):
+        """Dopisuje zdarzenie odpowiedzi (stan SM-2 po aktualizacji)."""
+        event = {
+            'id': word_id(word),
+            'correct': bool(correct),
+            'ts': datetime.now().isoformat(),
+        }
+        for field in self.PROGRESS_FIELDS:
+            if field in word:
+                event[field] = word[field]
+
+        try:
+            os.makedirs(self.journal_dir, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            self.pending += 1
+        except Exception as e:
+            print(f"Blad zapisu dziennika: {e}")
+
+    def read_events(self):
+        """Czyta zdarzenia; uszkodzona (niedokończona) ostatnia linia jest pomijana."""
+        if not os.path.exists(self.path):
+            return []
+
+        events = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(event, dict) and 'id' in event:
+                    events.append(event)
+        return events
+
+    def latest_states(self):
+        """Zwraca ostatni stan postępu dla każdego słowa z dziennika."""
+        states = {}
+        for event in self.read_events():
+            fields = {f: event[f] for f in self.PROGRESS_FIELDS if f in event}
+            SpacedRepetitionManager.migrate_word(fields)
+            states.setdefault(event['id'], {}).update(fields)
+        return states
+
+    def replay(self, words):
+        """
+        Nakłada zdarzenia z dziennika na listę słów.
+        Zwraca liczbę słów, którym odtworzono stan.
+        """
+        states = self.latest_states()
+        if not states:
+            return 0
+
+        applied = 0
+        for word in words:
+            fields = states.get(word_id(word))
+            if fields:
+                word.update(fields)
+                applied += 1
+        return applied
+
+    def needs_compaction(self):
+        """Czy pora przenieść dziennik do magazynu postępu."""
+        return self.pending >= self.COMPACT_EVERY
+
+    def compact(self):
+        """Przenosi stan z dziennika do magazynu postępu i czyści dziennik."""
+        if not self.pending:
+            return False
+
+        if not self.store.merge(self.latest_states()):
+            return False
+
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self.pending = 0
+        return True
@@ -0,0 +1,664 @@
+"""
+Fiszki Library Database
+Opcjonalny backend SQLite (WAL) dla decków i postępu nauki
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from progress_manager import ProgressStore, deck_key, word_id
+from spaced_repetition import SpacedRepetitionManager
+from word_record import MISSING, Word
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    series_id INTEGER NOT NULL REFERENCES series(id),
+    category TEXT NOT NULL DEFAULT '',
+    deck TEXT NOT NULL UNIQUE,
+    path TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    word_count INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    UNIQUE (file_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    unit_id INTEGER NOT NULL REFERENCES units(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    word_key TEXT NOT NULL,
+    word TEXT NOT NULL,
+    part_of_speech TEXT NOT NULL DEFAULT '',
+    translation TEXT NOT NULL DEFAULT '',
+    definition TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS progress (
+    deck TEXT NOT NULL,
+    word_key TEXT NOT NULL,
+    correct_count INTEGER NOT NULL DEFAULT 0,
+    wrong_count INTEGER NOT NULL DEFAULT 0,
+    sr_ease REAL,
+    sr_interval INTEGER,
+    sr_repetitions INTEGER,
+    next_review INTEGER,
+    PRIMARY KEY (deck, word_key)
+);
+
+-- mtime magazynu postępu JSON przy ostatniej synchronizacji z bazą
+-- (NULL - postęp zmigrowany z treści decku, magazynu JSON nie było)
+CREATE TABLE IF NOT EXISTS progress_sync (
+    deck TEXT PRIMARY KEY,
+    store_mtime REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_words_file ON words(file_id, position);
+CREATE INDEX IF NOT EXISTS idx_words_unit ON words(unit_id);
+CREATE INDEX IF NOT EXISTS idx_words_pos ON words(file_id, part_of_speech COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_progress_next_review ON progress(deck, next_review);
+"""
+
+# Indeks pełnotekstowy (trigramy = wyszukiwanie podciągów) nad tabelą words,
+# aktualizowany triggerami przy imporcie/usuwaniu plików
+SEARCH_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS word_search USING fts5(
+    word, translation, definition,
+    content='words', content_rowid='id', tokenize='trigram'
+);
+
+CREATE TRIGGER IF NOT EXISTS words_search_insert AFTER INSERT ON words BEGIN
+    INSERT INTO word_search (rowid, word, translation, definition)
+    VALUES (new.id, new.word, new.translation, new.definition);
+END;
+
+CREATE TRIGGER IF NOT EXISTS words_search_delete AFTER DELETE ON words BEGIN
+    INSERT INTO word_search (word_search, rowid, word, translation, definition)
+    VALUES ('delete', old.id, old.word, old.translation, old.definition);
+END;
+"""
+
+# Warunki SQL odpowiadające SearchFilter.filter_by_status
+STATUS_CONDITIONS = {
+    'untouched': "COALESCE(p.correct_count, 0) + COALESCE(p.wrong_count, 0) = 0",
+    'learning': "COALESCE(p.correct_count, 0) + COALESCE(p.wrong_count, 0) BETWEEN 1 AND 5",
+    'known': "COALESCE(p.correct_count, 0) > 3",
+    'difficult': "COALESCE(p.wrong_count, 0) > COALESCE(p.correct_count, 0)",
+}
+
+
+class LibraryDatabase:
+    """
+    Biblioteka słów w SQLite: serie, pliki, jednostki, słowa i stan SR.
+    Plik JSON jest parsowany tylko przy pierwszym imporcie lub gdy zmieni się
+    jego mtime/rozmiar; dalej deck czytany jest z bazy.
+    """
+
+    DB_FILE = '.fiszki_library.db'
+
+    PROGRESS_FIELDS = ProgressStore.PROGRESS_FIELDS
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or self.DB_FILE
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self._migrate_schema()
+        self.conn.executescript(SCHEMA)
+        self.has_fts = self._create_search_index()
+        # Małe litery także dla polskich znaków (SQLite lower() zna tylko ASCII)
+        self.conn.create_function('py_lower', 1, str.lower, deterministic=True)
+
+    def _create_search_index(self):
+        """Tworzy indeks FTS5; False jeśli SQLite nie ma FTS5/trigramów."""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'word_search'"
+        ).fetchone()
+        try:
+            self.conn.executescript(SEARCH_SCHEMA)
+        except sqlite3.OperationalError as e:
+            print(f"Brak FTS5 w SQLite, wyszukiwanie bez indeksu: {e}")
+            return False
+        if not exists:
+            # Baza sprzed indeksu - jednorazowe zbudowanie z istniejących słów
+            with self.conn:
+                self.conn.execute("INSERT INTO word_search (word_search) VALUES ('rebuild')")
+        return True
+
+    def _migrate_schema(self):
+        """Baza z next_review jako tekst ISO -> kolumna INTEGER z epoch."""
+        columns = {row[1]: row[2] for row in self.conn.execute("PRAGMA table_info(progress)")}
+        if columns.get('next_review', 'INTEGER').upper() != 'TEXT':
+            return
+
+        self.conn.execute("DROP INDEX IF EXISTS idx_progress_next_review")
+        self.conn.execute("ALTER TABLE progress RENAME TO progress_iso")
+        self.conn.executescript(SCHEMA)
+        with self.conn:
+            for row in self.conn.execute("SELECT * FROM progress_iso").fetchall():
+                self.conn.execute(
+                    "INSERT INTO progress (deck, word_key, correct_count, wrong_count, sr_ease, "
+                    "sr_interval, sr_repetitions, next_review) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (row['deck'], row['word_key'], row['correct_count'], row['wrong_count'],
+                     row['sr_ease'], row['sr_interval'], row['sr_repetitions'],
+                     SpacedRepetitionManager.to_epoch(row['next_review']))
+                )
+            self.conn.execute("DROP TABLE progress_iso")
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # Import
+
+    @staticmethod
+    def iter_data_files(data_dir):
+        """Zwraca (seria, kategoria, ścieżka) dla wszystkich plików JSON w data/."""
+        if not os.path.exists(data_dir):
+            return
+        for series_key in sorted(os.listdir(data_dir)):
+            series_path = os.path.join(data_dir, series_key)
+            if series_key.startswith('.') or not os.path.isdir(series_path):
+                continue
+
+            if series_key == "career_paths":
+                json_dirs = []
+                for category in sorted(os.listdir(series_path)):
+                    if category.startswith('.'):
+                        continue
+                    json_dirs.append((category, os.path.join(series_path, category, "json")))
+            else:
+                json_dirs = [('', os.path.join(series_path, "json"))]
+
+            for category, json_dir in json_dirs:
+                if not os.path.isdir(json_dir):
+                    continue
+                for f in sorted(os.listdir(json_dir)):
+                    if f.endswith('.json'):
+                        yield series_key, category, os.path.join(json_dir, f)
+
+    def sync_library(self, data_dir):
+        """
+        Importuje wszystkie pliki z data/ (tylko zmienione od ostatniego razu).
+        Zwraca liczbę ponownie zaimportowanych plików.
+        """
+        imported = 0
+        seen = set()
+        for series_key, category, filepath in self.iter_data_files(data_dir):
+            seen.add(deck_key(filepath))
+            if self.sync_file(filepath, series_key, category):
+                imported += 1
+
+        with self.lock, self.conn:
+            for row in self.conn.execute("SELECT id, deck FROM files").fetchall():
+                if row['deck'] not in seen:
+                    self.conn.execute("DELETE FROM files WHERE id = ?", (row['id'],))
+        return imported
+
+    def sync_file(self, filepath, series_key, category=''):
+        """
+        Importuje plik jeśli zmienił się od ostatniego importu
+        (oraz postęp z magazynu JSON, jeśli ten się zmienił).
+        """
+        stat = os.stat(filepath)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT mtime, size FROM files WHERE deck = ?", (deck_key(filepath),)
+            ).fetchone()
+        imported = not (row and row['mtime'] == stat.st_mtime and row['size'] == stat.st_size)
+        if imported:
+            self.import_file(filepath, series_key, category, stat)
+        self.sync_progress(filepath)
+        return imported
+
+    def import_file(self, filepath, series_key, category='', stat=None):
+        """Wczytuje plik JSON do bazy (zastępuje poprzednią treść pliku)."""
+        stat = stat or os.stat(filepath)
+        with open(filepath, 'r', encoding='utf-8') as f:
+            words = json.load(f)
+
+        deck = deck_key(filepath)
+        with self.lock, self.conn:
+            self.conn.execute("INSERT OR IGNORE INTO series (key) VALUES (?)", (series_key,))
+            series_id = self.conn.execute(
+                "SELECT id FROM series WHERE key = ?", (series_key,)
+            ).fetchone()['id']
+
+            # Treść pliku jest zastępowana w całości, postęp (tabela progress) zostaje
+            self.conn.execute("DELETE FROM files WHERE deck = ?", (deck,))
+            file_id = self.conn.execute(
+                "INSERT INTO files (series_id, category, deck, path, mtime, size, word_count) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (series_id, category, deck, os.path.abspath(filepath),
+                 stat.st_mtime, stat.st_size, len(words))
+            ).lastrowid
+
+            unit_ids = {}
+            rows = []
+            for position, word in enumerate(words):
+                unit = word.get('unit', 'Unknown')
+                if unit not in unit_ids:
+                    unit_ids[unit] = self.conn.execute(
+                        "INSERT INTO units (file_id, name) VALUES (?, ?)", (file_id, unit)
+                    ).lastrowid
+                content = {k: v for k, v in word.items() if k not in self.PROGRESS_FIELDS}
+                rows.append((
+                    file_id, unit_ids[unit], position, word_id(word),
+                    word.get('word', ''), word.get('part_of_speech', '') or '',
+                    word.get('translation', '') or '', word.get('definition', '') or '',
+                    json.dumps(content, ensure_ascii=False),
+                ))
+            self.conn.executemany(
+                "INSERT INTO words (file_id, unit_id, position, word_key, word, part_of_speech, "
+                "translation, definition, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+            # Postęp z magazynu JSON przenosi sync_progress
+            if not self._has_progress(deck) and not ProgressStore(filepath).exists():
+                self._migrate_progress(deck, words)
+
+    def _has_progress(self, deck):
+        return self.conn.execute(
+            "SELECT 1 FROM progress WHERE deck = ? LIMIT 1", (deck,)
+        ).fetchone() is not None
+
+    def _migrate_progress(self, deck, words):
+        """Jednorazowo przenosi postęp zapisany dawniej w plikach decku."""
+        records = {}
+        for word in words:
+            progress = ProgressStore.extract(word)
+            if progress:
+                records[word_id(word)] = progress
+        self._write_progress(deck, records)
+        self._mark_synced(deck, None)
+
+    def _mark_synced(self, deck, store_mtime):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO progress_sync (deck, store_mtime) VALUES (?, ?)",
+            (deck, store_mtime)
+        )
+
+    def sync_progress(self, filepath):
+        """
+        Magazyn postępu JSON zmieniony od ostatniej synchronizacji (nauka ze
+        storage_backend = json) zastępuje postęp decku w bazie. W drugą stronę
+        postęp przepisuje export_progress. Zwraca True po imporcie magazynu.
+        """
+        store = ProgressStore(filepath)
+        try:
+            store_mtime = os.stat(store.path).st_mtime
+        except OSError:
+            return False
+
+        deck = deck_key(filepath)
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT store_mtime FROM progress_sync WHERE deck = ?", (deck,)
+            ).fetchone()
+            if row is not None and row['store_mtime'] == store_mtime:
+                return False
+            if row is None and self._has_progress(deck):
+                # Baza sprzed synchronizacji: magazyn był już raz zmigrowany,
+                # a nowszy postęp jest w bazie
+                self._mark_synced(deck, store_mtime)
+                return False
+
+            records = store.load()
+            self.conn.execute("DELETE FROM progress WHERE deck = ?", (deck,))
+            self._write_progress(deck, records)
+            self._mark_synced(deck, store_mtime)
+        return True
+
+    def export_progress(self, filepath):
+        """Przepisuje postęp decku z bazy do magazynu JSON (aktualny po powrocie do json)."""
+        deck = deck_key(filepath)
+        store = ProgressStore(filepath)
+        if not store.write(self.load_progress(deck)):
+            return False
+        with self.lock, self.conn:
+            self._mark_synced(deck, os.stat(store.path).st_mtime)
+        return True
+
+    def _write_progress(self, deck, records):
+        for key, fields in records.items():
+            columns = [f for f in self.PROGRESS_FIELDS if f in fields]
+            if not columns:
+                continue
+            fields = dict(fields)
+            SpacedRepetitionManager.migrate_word(fields)
+            placeholders = ', '.join('?' for _ in columns)
+            updates = ', '.join(f"{c} = excluded.{c}" for c in columns)
+            self.conn.execute(
+                f"INSERT INTO progress (deck, word_key, {', '.join(columns)}) "
+                f"VALUES (?, ?, {placeholders}) "
+                f"ON CONFLICT (deck, word_key) DO UPDATE SET {updates}",
+                [deck, key] + [fields[c] for c in columns]
+            )
+
+    # Odczyt decku
+
+    def load_deck(self, filepath, series_key, category=''):
+        """Zwraca DatabaseDeck dla pliku (importuje go jeśli trzeba)."""
+        self.sync_file(filepath, series_key, category)
+        deck = deck_key(filepath)
+
+        # Liczniki, stan SR i unit (json_extract po stronie SQLite) jako kolumny;
+        # pozostałe pola słowa (data) DatabaseWord dekoduje przy pierwszym użyciu
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT w.data, json_type(w.data, '$.unit') AS unit_type, "
+                "json_extract(w.data, '$.unit') AS unit, "
+                "p.correct_count, p.wrong_count, p.sr_ease, p.sr_interval, "
+                "p.sr_repetitions, p.next_review "
+                "FROM words w JOIN files f ON f.id = w.file_id "
+                "LEFT JOIN progress p ON p.deck = f.deck AND p.word_key = w.word_key "
+                "WHERE f.deck = ? ORDER BY w.position",
+                (deck,)
+            ).fetchall()
+
+        words = []
+        strings = {}
+        for (data, unit_type, unit, correct, wrong,
+             sr_ease, sr_interval, sr_repetitions, next_review) in rows:
+            extra = None
+            if sr_ease is not None or next_review is not None:
+                extra = {field: value for field, value in (
+                    ('sr_ease', sr_ease), ('sr_interval', sr_interval),
+                    ('sr_repetitions', sr_repetitions), ('next_review', next_review),
+                ) if value is not None}
+            if unit_type in DatabaseWord.UNIT_TYPES:
+                ready = DatabaseWord.COLUMNS
+            elif unit_type is None:
+                ready, unit = DatabaseWord.COLUMNS, MISSING  # słowo bez klucza unit
+            else:
+                # true/false/obiekt - wartość z data, nie z json_extract
+                ready, unit = DatabaseWord.PROGRESS, MISSING
+            # Kolejność jak META_FIELDS: unit, part_of_speech, page, correct_count, wrong_count
+            meta = (unit, MISSING, MISSING, correct or 0, wrong or 0)
+            words.append(DatabaseWord.from_row(data, meta, extra, ready, strings))
+
+        return DatabaseDeck(self, deck, words)
+
+    def _positions(self, sql, params):
+        with self.lock:
+            return [row[0] for row in self.conn.execute(sql, params)]
+
+    def unit_counts(self, deck):
+        """Zwraca [(jednostka, liczba słów)] dla decku."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT u.name, COUNT(w.id) FROM units u "
+                "JOIN files f ON f.id = u.file_id JOIN words w ON w.unit_id = u.id "
+                "WHERE f.deck = ? GROUP BY u.id",
+                (deck,)
+            ).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def positions_in_units(self, deck, units):
+        units = list(units)
+        if not units:
+            return []
+        placeholders = ', '.join('?' for _ in units)
+        return self._positions(
+            "SELECT w.position FROM words w JOIN units u ON u.id = w.unit_id "
+            "JOIN files f ON f.id = u.file_id "
+            f"WHERE f.deck = ? AND u.name IN ({placeholders}) ORDER BY w.position",
+            [deck] + units
+        )
+
+    def due_positions(self, deck, now=None):
+        """Słowa do powtórki: bez stanu SR albo z next_review <= now."""
+        now = time.time() if now is None else now
+        due = self._positions(
+            "SELECT w.position FROM progress p "
+            "JOIN files f ON f.deck = p.deck JOIN words w ON w.file_id = f.id AND w.word_key = p.word_key "
+            "WHERE p.deck = ? AND p.next_review <= ?",
+            (deck, now)
+        )
+        fresh = self._positions(
+            "SELECT w.position FROM words w JOIN files f ON f.id = w.file_id "
+            "LEFT JOIN progress p ON p.deck = f.deck AND p.word_key = w.word_key "
+            "WHERE f.deck = ? AND p.next_review IS NULL",
+            (deck,)
+        )
+        return sorted(due + fresh)
+
+    def category_positions(self, deck, category):
+        return self._positions(
+            "SELECT w.position FROM words w JOIN files f ON f.id = w.file_id "
+            "WHERE f.deck = ? AND w.part_of_speech = ? COLLATE NOCASE ORDER BY w.position",
+            (deck, category)
+        )
+
+    def status_positions(self, deck, status):
+        condition = STATUS_CONDITIONS.get(status)
+        if condition is None:
+            return []
+        return self._positions(
+            "SELECT w.position FROM words w JOIN files f ON f.id = w.file_id "
+            "LEFT JOIN progress p ON p.deck = f.deck AND p.word_key = w.word_key "
+            f"WHERE f.deck = ? AND {condition} ORDER BY w.position",
+            (deck,)
+        )
+
+    # Wyszukiwanie w całej bibliotece
+
+    def search_library(self, query, status=None, limit=200):
+        """
+        Szuka frazy (podciąg, bez wielkości liter) w word/translation/definition
+        wszystkich zaimportowanych plików. Zwraca słowniki z serią, plikiem
+        i jednostką, żeby trafienie dało się od razu otworzyć.
+        status: opcjonalny warunek jak w filter_by_status (wg tabeli progress).
+        """
+        query = query.strip().lower()
+        if not query:
+            return []
+
+        if self.has_fts and len(query) >= 3:
+            # Fraza w cudzysłowie = ciąg trigramów, czyli dokładny podciąg
+            where = "w.id IN (SELECT rowid FROM word_search WHERE word_search MATCH ?)"
+            params = ['"' + query.replace('"', '""') + '"']
+        elif query.isascii():
+            # LIKE porównuje litery ASCII bez wielkości liter - dla takiej frazy wystarcza
+            pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            where = ("(w.word LIKE ? ESCAPE '\\' OR w.translation LIKE ? ESCAPE '\\' "
+                     "OR w.definition LIKE ? ESCAPE '\\')")
+            params = [pattern, pattern, pattern]
+        else:
+            where = ("(instr(py_lower(w.word), ?) OR instr(py_lower(w.translation), ?) "
+                     "OR instr(py_lower(w.definition), ?))")
+            params = [query, query, query]
+
+        if status:
+            condition = STATUS_CONDITIONS.get(status)
+            if condition is None:
+                return []
+            where += f" AND {condition}"
+
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT s.key AS series, f.category, f.deck, f.path, u.name AS unit, "
+                "w.position, w.word, w.translation, w.definition, w.part_of_speech "
+                "FROM words w JOIN files f ON f.id = w.file_id "
+                "JOIN series s ON s.id = f.series_id JOIN units u ON u.id = w.unit_id "
+                "LEFT JOIN progress p ON p.deck = f.deck AND p.word_key = w.word_key "
+                f"WHERE {where} ORDER BY s.key, f.category, f.path, w.position LIMIT ?",
+                params + [limit]
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # Postęp
+
+    def load_progress(self, deck):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM progress WHERE deck = ?", (deck,)
+            ).fetchall()
+        return {
+            row['word_key']: {f: row[f] for f in self.PROGRESS_FIELDS if row[f] is not None}
+            for row in rows
+        }
+
+    def merge_progress(self, deck, updates):
+        with self.lock, self.conn:
+            self._write_progress(deck, updates)
+        return True
+
+
+class DatabaseWord(Word):
+    """
+    Słowo z bazy: liczniki, stan SR i unit z kolumn, reszta pól (JSON z kolumny
+    data) dekodowana przy pierwszym odczycie innego klucza. Losowanie, statystyki
+    i filtry po unitach nie dekodują więc wierszy całego decku.
+    """
+
+    __slots__ = ('_data', '_ready', '_strings')
+
+    # Klucze dostępne bez dekodowania (pól postępu nie ma w data - tylko w bazie)
+    PROGRESS = frozenset(LibraryDatabase.PROGRESS_FIELDS)
+    COLUMNS = PROGRESS | {'unit'}
+    # Typy json_type, dla których json_extract zwraca wartość jak json.loads
+    UNIT_TYPES = ('text', 'integer', 'real', 'null')
+    # Wspólna dla wszystkich słów: dekodowanie w wątku wyszukiwania i odpowiedzi
+    # w wątku Tk dotykają tych samych rekordów (RLock - zapis woła _decode)
+    DECODE_LOCK = threading.RLock()
+
+    @classmethod
+    def from_row(cls, data, meta, extra, ready, strings=None):
+        word = cls.from_meta(meta, extra)
+        word._data = data
+        word._ready = ready
+        word._strings = strings
+        return word
+
+    def _decode(self):
+        """
+        Dekoduje data (pod DECODE_LOCK). Sloty są podmieniane dopiero po zbudowaniu
+        całego rekordu, a _data czyszczone na końcu - czytelnik w innym wątku
+        widzi albo stary, albo nowy rekord, nigdy częściowy.
+        """
+        with self.DECODE_LOCK:
+            data = self._data
+            if data is None:
+                return  # Zdekodowane w międzyczasie przez inny wątek
+            fields = json.loads(data)
+            # Wartości kolumn (mogły już zmienić się po odpowiedzi) mają pierwszeństwo
+            for key in self._ready:
+                value = Word._lookup(self, key)
+                if value is not MISSING:
+                    fields[key] = value
+            decoded = Word(fields, self._strings)
+            self._text, self._meta, self._extra = decoded._text, decoded._meta, decoded._extra
+            self._strings = None
+            self._data = None
+
+    def _lookup(self, key):
+        if self._data is not None and key not in self._ready:
+            self._decode()
+        return Word._lookup(self, key)
+
+    def __setitem__(self, key, value):
+        if self._data is None:
+            Word.__setitem__(self, key, value)
+            return
+        # Zapis pod blokadą - dekodowanie w innym wątku nie nadpisze odpowiedzi
+        with self.DECODE_LOCK:
+            if key not in self._ready:
+                self._decode()
+            Word.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        with self.DECODE_LOCK:
+            self._decode()
+            Word.__delitem__(self, key)
+
+    def __iter__(self):
+        if self._data is not None:
+            self._decode()
+        return Word.__iter__(self)
+
+
+class DatabaseDeck(list):
+    """
+    Deck wczytany z bazy: zwykła lista słów (kolejność jak w pliku)
+    plus zapytania po indeksach zwracające te same obiekty słów.
+    """
+
+    def __init__(self, db, deck, words):
+        super().__init__(words)
+        self.db = db
+        self.deck = deck
+
+    def _pick(self, positions):
+        return [self[p] for p in positions if p < len(self)]
+
+    def unit_counts(self):
+        return self.db.unit_counts(self.deck)
+
+    def in_units(self, units):
+        return self._pick(self.db.positions_in_units(self.deck, units))
+
+    def get_due_words(self, now=None):
+        return self._pick(self.db.due_positions(self.deck, now))
+
+    def filter_by_category(self, category):
+        return self._pick(self.db.category_positions(self.deck, category))
+
+    def filter_by_status(self, status):
+        return self._pick(self.db.status_positions(self.deck, status))
+
+
+class DatabaseProgressStore:
+    """Magazyn postępu w bazie - ten sam interfejs co ProgressStore."""
+
+    def __init__(self, db, deck_path):
+        self.db = db
+        self.deck_path = deck_path
+        self.deck = deck_key(deck_path)
+        self.changed = False
+
+    def exists(self):
+        return True
+
+    def load(self):
+        return self.db.load_progress(self.deck)
+
+    def apply(self, words):
+        # Postęp jest dołączany już w LibraryDatabase.load_deck
+        return 0
+
+    def merge(self, updates):
+        self.changed = True
+        return self.db.merge_progress(self.deck, updates)
+
+    def flush(self):
+        """Przepisuje postęp do magazynu JSON, jeśli zmienił się od wczytania decku."""
+        if self.changed and self.db.export_progress(self.deck_path):
+            self.changed = False
+
+    def record(self, word):
+        """Zapisuje stan jednego słowa (jeden UPSERT w trybie WAL)."""
+        progress = ProgressStore.extract(word)
+        if progress:
+            self.merge({word_id(word): progress})
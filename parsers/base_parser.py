@@ -5,8 +5,11 @@ Base Parser - wspólny kod dla wszystkich parserów
 import json
 import os
 import re
+import sys
 from pathlib import Path
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
 
 class BaseVocabularyParser:
     """Base class dla wszystkich vocabulary parserów"""
@@ -112,23 +115,34 @@ class SimpleVocabularyParser(BaseVocabularyParser):
 class PDFVocabularyParser(BaseVocabularyParser):
     """Base dla parserów z PDF"""
     
+    # Cache tekstu PDF-ów (.fiszki_pdf_cache) - wyłączyć przy zmianie ekstrakcji
+    USE_EXTRACTION_CACHE = True
+    
+    def extraction_cache(self):
+        """ExtractionCache albo None"""
+        if not self.USE_EXTRACTION_CACHE:
+            return None
+        from extraction import ExtractionCache
+        return ExtractionCache()
+    
     def extract_text_from_pdf(self, pdf_path):
         """Ekstrahuj text z PDF"""
         try:
-            import fitz
-            doc = fitz.open(pdf_path)
-            text = ""
-            for page_num, page in enumerate(doc):
-                text += f"__PAGE_{page_num+1}__\n"
-                text += page.get_text() + "\n"
-            doc.close()
-            return text
+            from extraction import extract_text
         except ImportError:
             print("ERROR: PyMuPDF not installed. pip install PyMuPDF")
             return ""
-        except Exception as e:
-            print(f"ERROR extracting text from {pdf_path}: {e}")
-            return ""
+        return extract_text(pdf_path, self.extraction_cache())
+    
+    def extract_all_pdfs(self, workers=None):
+        """Teksty wszystkich PDF-ów serii (równolegle), w kolejności get_pdf_files()"""
+        try:
+            from extraction import extract_text_many
+        except ImportError:
+            print("ERROR: PyMuPDF not installed. pip install PyMuPDF")
+            return []
+        paths = [os.path.join(self.pdf_dir, name) for name in self.get_pdf_files()]
+        return extract_text_many(paths, workers, cache=self.extraction_cache())
     
     def get_pdf_files(self):
         """Pobierz wszystkie PDF files"""
@@ -0,0 +1,140 @@
+"""
+Build Manifest - przyrostowe parsowanie PDF -> *_parsed.json
+Manifest zapamiętuje hash PDF-a, wersję parsera i hash wygenerowanego JSON-a;
+full-auto przebudowuje tylko pliki, których zależności się zmieniły (jak make)
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from extraction import EXTRACTOR_VERSION
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST_PATH = os.path.join(PROJECT_ROOT, ".fiszki_parse_manifest.json")
+HASH_CHUNK = 1024 * 1024
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parser_version(parser_path):
+    """
+    Wersja parsera: hash jego kodu, kodu ekstrakcji i wersji PyMuPDF.
+    Zmiana regexów w parserze przebudowuje wszystkie jego pliki.
+    """
+    digest = hashlib.sha256(EXTRACTOR_VERSION.encode('utf-8'))
+    for path in (parser_path, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'extraction.py')):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def output_path_for(pdf_path):
+    """<seria>/pdf/plik.pdf -> <seria>/json/plik_parsed.json"""
+    series_dir = os.path.dirname(os.path.dirname(os.path.abspath(pdf_path)))
+    name = os.path.splitext(os.path.basename(pdf_path))[0]
+    return os.path.join(series_dir, "json", f"{name}_parsed.json")
+
+
+class BuildManifest:
+    """
+    Wpis na każdy PDF (klucz: ścieżka względem katalogu projektu):
+    mtime/rozmiar/hash PDF-a, parser, wersja parsera, ścieżka i mtime/rozmiar/hash
+    wyniku. Hash pliku jest liczony ponownie tylko przy zmianie mtime lub rozmiaru.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path=None, root=None):
+        self.path = path or MANIFEST_PATH
+        self.root = root or PROJECT_ROOT
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"ERROR reading build manifest: {e}")
+            return
+        if isinstance(data, dict) and data.get('version') == self.VERSION:
+            self.entries = data.get('entries', {})
+
+    def save(self):
+        try:
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': self.VERSION, 'entries': self.entries}, f,
+                          ensure_ascii=False, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"ERROR writing build manifest: {e}")
+
+    def key(self, path):
+        return os.path.relpath(os.path.abspath(path), self.root).replace(os.sep, '/')
+
+    @staticmethod
+    def _stat(path):
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
+
+    def _hash(self, path, recorded):
+        """Hash pliku; przy niezmienionym mtime i rozmiarze - zapamiętany."""
+        mtime, size = self._stat(path)
+        if recorded and recorded.get('mtime') == mtime and recorded.get('size') == size:
+            return recorded['hash']
+        return file_hash(path)
+
+    def _describe(self, path):
+        mtime, size = self._stat(path)
+        return {'mtime': mtime, 'size': size, 'hash': file_hash(path)}
+
+    def is_fresh(self, pdf_path, output_path, version):
+        """Czy wynik PDF-a jest aktualny (ten sam PDF, parser i nietknięty JSON)."""
+        entry = self.entries.get(self.key(pdf_path))
+        if not entry or entry.get('parser_version') != version:
+            return False
+        try:
+            if self._hash(pdf_path, entry['pdf']) != entry['pdf']['hash']:
+                return False
+            output = entry.get('output')
+            if output is None:
+                # Wpis starszej wersji dla PDF-a bez wyniku - parsowany ponownie
+                return False
+            if output['path'] != self.key(output_path):
+                return False
+            return self._hash(output_path, output) == output['hash']
+        except (OSError, KeyError):
+            return False
+
+    def stale(self, pdf_paths, version, force=False):
+        """PDF-y do przebudowania (w kolejności wejścia)."""
+        if force:
+            return list(pdf_paths)
+        return [pdf_path for pdf_path in pdf_paths
+                if not self.is_fresh(pdf_path, output_path_for(pdf_path), version)]
+
+    def record(self, pdf_path, output_path, version, parser=''):
+        """
+        Zapamiętuje wynik budowania. PDF bez wyniku (0 wpisów, błąd) nie jest
+        zapisywany - zostaje do przebudowania przy kolejnym uruchomieniu.
+        """
+        output = dict(self._describe(output_path), path=self.key(output_path))
+        self.entries[self.key(pdf_path)] = {
+            'pdf': self._describe(pdf_path),
+            'parser': parser,
+            'parser_version': version,
+            'output': output,
+        }
@@ -6,13 +6,16 @@ Format: word [POS-UNIT] definition
 Example: address book [N-COUNT-U12] An address book is an organized list...
 """
 
-import fitz
 import os
-import json
 import glob
 import re
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from extraction import ExtractionCache, iter_lines, iter_pages_many
+from json_stream import write_json_array
+from build_manifest import BuildManifest, parser_version
+
 
 def get_data_dirs(category):
     """Get paths for specific Career Paths category."""
@@ -24,35 +27,25 @@ def get_data_dirs(category):
     return pdf_dir, json_dir
 
 
-def extract_text(pdf_path):
-    """Extract text from PDF."""
-    try:
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page_num, page in enumerate(doc):
-            text += f"__PAGE_{page_num+1}__\n"
-            text += page.get_text() + "\n"
-        doc.close()
-        return text
-    except Exception as e:
-        print(f"ERROR: {e}")
-        return ""
+def parse_career_paths_glossary(text):
+    """Entries from whole text with __PAGE_n__ markers (see iter_glossary_entries)."""
+    return list(iter_glossary_entries(text.split('\n')))
 
 
-def parse_career_paths_glossary(text):
+def iter_glossary_entries(lines):
     """
     Parse Career Paths glossary format:
     word [POS-UNIT] definition
     
     POS can be: N, V, ADJ, ADV, PHRA, etc
     UNIT is like U1, U2, U12 (Unit number)
+    
+    lines: text lines with __PAGE_n__ markers (e.g. iter_lines(pages));
+    entries are yielded as soon as they are parsed.
     """
     
-    entries = []
     current_page = 1
     
-    lines = text.split('\n')
-    
     for raw_line in lines:
         # Track page numbers
         page_match = re.match(r'__PAGE_(\d+)__', raw_line.strip())
@@ -111,77 +104,122 @@ def parse_career_paths_glossary(text):
             "wrong_count": 0
         }
         
-        entries.append(entry)
-    
-    return entries
+        yield entry
 
 
-def main():
+def unique_entries(entries):
+    """Drops repeated (word, unit) entries, keeping the first one - streaming."""
+    seen = set()
+    for entry in entries:
+        key = (entry["word"].lower(), entry["unit"])
+        if key not in seen:
+            seen.add(key)
+            yield entry
+
+
+def run_full_auto(manifest=None, force=False, cache=None, log=print, pool=None):
+    """
+    Parsuje zmienione PDF-y wszystkich kategorii (wspólny punkt wejścia dla master_parser).
+    manifest: współdzielony BuildManifest - zapisuje go wołający;
+    bez niego manifest jest wczytywany i zapisywany tutaj.
+    pool: wspólna pula procesów ekstrakcji (make_pool) - bez niej własna.
+    Zwraca podsumowanie: pdfs, parsed, skipped, words, errors.
+    """
     # Get all Career Paths categories
     base_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 
                             "data", "career_paths")
+    summary = {"pdfs": 0, "parsed": 0, "skipped": 0, "words": 0, "errors": 0}
     
     if not os.path.exists(base_path):
-        print(f"ERROR: {base_path} not found!")
-        return
+        log(f"ERROR: {base_path} not found!")
+        return summary
     
     categories = sorted([d for d in os.listdir(base_path) 
                         if os.path.isdir(os.path.join(base_path, d))])
     
     if not categories:
-        print("ERROR: No categories found!")
-        return
-    
-    print("\n" + "="*70)
-    print("CAREER PATHS GLOSSARY PARSER - v3.7")
-    print("="*70 + "\n")
+        log("ERROR: No categories found!")
+        return summary
     
-    total_entries = 0
+    # Tylko PDF-y zmienione od ostatniego budowania (force: wszystkie)
+    own_manifest = manifest is None
+    manifest = BuildManifest() if own_manifest else manifest
+    version = parser_version(__file__)
     
+    # PDF-y wszystkich kategorii naraz - ekstrakcja równoległa w procesach
+    jobs = []
     for category in categories:
         pdf_dir, json_dir = get_data_dirs(category)
         
         if not os.path.exists(pdf_dir):
             continue
         
-        os.makedirs(json_dir, exist_ok=True)
-        
         pdf_files = sorted(glob.glob(os.path.join(pdf_dir, "*.pdf")))
+        todo = manifest.stale(pdf_files, version, force)
+        summary["pdfs"] += len(pdf_files)
+        summary["parsed"] += len(todo)
+        summary["skipped"] += len(pdf_files) - len(todo)
         
-        if not pdf_files:
-            continue
+        if todo:
+            jobs.append((category, json_dir, todo))
+    
+    if summary["skipped"]:
+        log(f"Up to date: {summary['skipped']} PDF(s) skipped\n")
+    
+    # Strony płyną z puli procesów przez parser prosto do plików JSON
+    all_pdfs = [pdf_path for _, _, pdf_files in jobs for pdf_path in pdf_files]
+    streams = iter_pages_many(all_pdfs, cache=cache, pool=pool, log=log)
+    
+    # Zamknięcie strumieni porzuca zadania w toku (także przy wyjątku)
+    try:
+        for category, json_dir, pdf_files in jobs:
+            os.makedirs(json_dir, exist_ok=True)
         
-        print(f"[{category}]")
+            log(f"[{category}]")
         
-        for pdf_path in pdf_files:
-            pdf_name = os.path.basename(pdf_path)
-            
-            text = extract_text(pdf_path)
-            entries = parse_career_paths_glossary(text)
+            for pdf_path, (_, pages) in zip(pdf_files, streams):
+                pdf_name = os.path.basename(pdf_path)
             
-            if entries:
-                # Remove duplicates
-                unique_entries = {}
-                for entry in entries:
-                    key = (entry["word"].lower(), entry["unit"])
-                    if key not in unique_entries:
-                        unique_entries[key] = entry
-                
-                final_entries = list(unique_entries.values())
-                
                 output_filename = f"{os.path.splitext(pdf_name)[0]}_parsed.json"
                 output_path = os.path.join(json_dir, output_filename)
-                
-                with open(output_path, "w", encoding="utf-8") as f:
-                    json.dump(final_entries, f, ensure_ascii=False, indent=2)
-                
-                total_entries += len(final_entries)
-                print(f"  {pdf_name}: {len(final_entries)} words")
-        
-        print()
+            
+                # Remove duplicates while writing
+                entries = unique_entries(iter_glossary_entries(iter_lines(pages)))
+                try:
+                    count = write_json_array(output_path, entries, keep_empty=False)
+                except Exception as e:
+                    summary["errors"] += 1
+                    log(f"  {pdf_name}: ERROR: {e}")
+                    continue
+            
+                if count:
+                    manifest.record(pdf_path, output_path, version, "career_paths")
+                    summary["words"] += count
+                    log(f"  {pdf_name}: {count} words")
+                else:
+                    # Bez wpisu w manifeście - PDF zostaje do przebudowania
+                    summary["errors"] += 1
+                    log(f"  {pdf_name}: ERROR: No data")
+        
+            log("")
+    finally:
+        streams.close()
+    
+    if own_manifest:
+        manifest.save()
+    return summary
+
+
+def main():
+    print("\n" + "="*70)
+    print("CAREER PATHS GLOSSARY PARSER - v3.7")
+    print("="*70 + "\n")
+    
+    cache = None if "--no-cache" in sys.argv else ExtractionCache()
+    summary = run_full_auto(force="--force" in sys.argv, cache=cache)
     
     print("="*70)
-    print(f"Total: {total_entries} words parsed across all categories!")
+    print(f"Total: {summary['words']} words parsed across all categories!")
     print("="*70 + "\n")
 
 
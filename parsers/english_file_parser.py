@@ -6,13 +6,16 @@ Najprosztsza możliwa logika:
 3. Ostatnie polskie słowo to translation
 """
 
-import fitz
 import os
-import json
 import glob
 import re
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from extraction import ExtractionCache, Lookahead, iter_lines, iter_pages_many
+from json_stream import write_json_array
+from build_manifest import BuildManifest, parser_version
+
 
 def get_data_dirs():
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -23,21 +26,6 @@ def get_data_dirs():
     return pdf_dir, json_dir
 
 
-def extract_text(pdf_path):
-    """Ekstrahuje tekst z PDF."""
-    try:
-        doc = fitz.open(pdf_path)
-        text = ""
-        for page_num, page in enumerate(doc):
-            text += f"__PAGE_{page_num+1}__\n"
-            text += page.get_text() + "\n"
-        doc.close()
-        return text
-    except Exception as e:
-        print(f"ERROR: {e}")
-        return ""
-
-
 def clean_text_line(line):
     """Czyści linię tekstu."""
     line = re.sub(r'\s+', ' ', line)
@@ -61,23 +49,28 @@ def extract_pos(text):
 
 
 def parse_vocabulary_list(text):
+    """Wpisy z całego tekstu z markerami __PAGE_n__ (patrz iter_vocabulary_entries)."""
+    return list(iter_vocabulary_entries(text.split('\n')))
+
+
+def iter_vocabulary_entries(lines):
     """
     Ultra-prosta strategia:
     Każde angielskie słowo jest wpisem.
     Zbieraj tekst aż do polskiego słowa (zawiera [ąćęłńóśźż])
+    
+    lines: linie tekstu z markerami __PAGE_n__ (np. iter_lines(strony));
+    wpisy są zwracane na bieżąco, bez czytania całego dokumentu.
     """
     
-    entries = []
     current_unit = "File 1"
     current_page = 1
     processed_words = set()
     
-    lines = text.split('\n')
+    lines = Lookahead(lines)
     
-    i = 0
-    while i < len(lines):
-        raw_line = lines[i].strip()
-        i += 1
+    for raw_line in lines:
+        raw_line = raw_line.strip()
         
         # Śledź jednostki
         file_match = re.match(r'File\s+(\d+)\s*$', raw_line, re.IGNORECASE)
@@ -132,14 +125,14 @@ def parse_vocabulary_list(text):
         # Zbierz tekst aż do polskiego słowa
         full_text = line
         
-        while i < len(lines):
-            next_raw = lines[i].strip()
+        while lines.peek() is not None:
+            next_raw = lines.peek().strip()
             next_line = clean_text_line(next_raw)
             
             # Czy zawiera znaki polskie? To koniec wpisu!
             if re.search(r'[ąćęłńóśźż]', next_line):
                 full_text += " " + next_line
-                i += 1
+                next(lines)
                 break
             
             # Czy to nowe słowo angielskie na początku? (następny wpis)
@@ -155,7 +148,7 @@ def parse_vocabulary_list(text):
             # Dodaj do full_text
             if next_line:
                 full_text += " " + next_line
-            i += 1
+            next(lines)
         
         # Teraz parsuj full_text
         # Szukaj wymowy jeśli nie znalazłem wcześniej
@@ -213,47 +206,83 @@ def parse_vocabulary_list(text):
             # Skip jeśli to polskie słowo bez wymowy/POS/definicji
             if re.search(r'[ąćęłńóśźż]', entry["word"]) and not entry["pronunciation"] and not entry["part_of_speech"]:
                 continue
-            entries.append(entry)
-    
-    return entries
+            yield entry
 
 
-def main():
+def run_full_auto(manifest=None, force=False, cache=None, log=print, pool=None):
+    """
+    Parsuje zmienione PDF-y serii (wspólny punkt wejścia dla master_parser).
+    manifest: współdzielony BuildManifest - zapisuje go wołający;
+    bez niego manifest jest wczytywany i zapisywany tutaj.
+    pool: wspólna pula procesów ekstrakcji (make_pool) - bez niej własna.
+    Zwraca podsumowanie: pdfs, parsed, skipped, words, errors.
+    """
     pdf_dir, json_dir = get_data_dirs()
+    summary = {"pdfs": 0, "parsed": 0, "skipped": 0, "words": 0, "errors": 0}
     
     if not os.path.exists(pdf_dir):
-        print(f"ERROR: Folder {pdf_dir} not found!")
-        return
+        log(f"ERROR: Folder {pdf_dir} not found!")
+        return summary
     
     os.makedirs(json_dir, exist_ok=True)
     
     pdf_files = sorted(glob.glob(os.path.join(pdf_dir, "*.pdf")))
     
     if not pdf_files:
-        print(f"ERROR: No PDF files!")
-        return
+        log(f"ERROR: No PDF files!")
+        return summary
     
-    print("\n" + "="*70)
-    print("ENGLISH FILE PARSER - v3.5 OSTATECZNA PROSTA")
-    print("="*70 + "\n")
+    # Tylko PDF-y zmienione od ostatniego budowania (force: wszystkie)
+    own_manifest = manifest is None
+    manifest = BuildManifest() if own_manifest else manifest
+    version = parser_version(__file__)
+    todo = manifest.stale(pdf_files, version, force)
+    summary.update(pdfs=len(pdf_files), parsed=len(todo), skipped=len(pdf_files) - len(todo))
+    if summary["skipped"]:
+        log(f"Up to date: {summary['skipped']} PDF(s) skipped\n")
     
-    for pdf_path in pdf_files:
-        pdf_name = os.path.basename(pdf_path)
-        print(f"PDF: {pdf_name}")
-        
-        text = extract_text(pdf_path)
-        entries = parse_vocabulary_list(text)
+    # Strony płyną z puli procesów przez parser prosto do pliku JSON,
+    # PDF po PDF-ie w kolejności plików
+    streams = iter_pages_many(todo, cache=cache, pool=pool, log=log)
+    try:
+        for pdf_path, pages in streams:
+            pdf_name = os.path.basename(pdf_path)
+            log(f"PDF: {pdf_name}")
         
-        if entries:
             output_filename = f"{os.path.splitext(pdf_name)[0]}_parsed.json"
             output_path = os.path.join(json_dir, output_filename)
-            
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(entries, f, ensure_ascii=False, indent=2)
-            
-            print(f"   OK: {len(entries)} words saved\n")
-        else:
-            print(f"   ERROR: No data\n")
+        
+            try:
+                count = write_json_array(output_path, iter_vocabulary_entries(iter_lines(pages)),
+                                         keep_empty=False)
+            except Exception as e:
+                summary["errors"] += 1
+                log(f"   ERROR: {e}\n")
+                continue
+        
+            if count:
+                manifest.record(pdf_path, output_path, version, "english_file")
+                summary["words"] += count
+                log(f"   OK: {count} words saved\n")
+            else:
+                # Bez wpisu w manifeście - PDF zostaje do przebudowania
+                summary["errors"] += 1
+                log(f"   ERROR: No data\n")
+    finally:
+        streams.close()
+    
+    if own_manifest:
+        manifest.save()
+    return summary
+
+
+def main():
+    print("\n" + "="*70)
+    print("ENGLISH FILE PARSER - v3.5 OSTATECZNA PROSTA")
+    print("="*70 + "\n")
+    
+    cache = None if "--no-cache" in sys.argv else ExtractionCache()
+    run_full_auto(force="--force" in sys.argv, cache=cache)
     
     print("="*70)
     print("Done!")
@@ -0,0 +1,398 @@
+"""
+PDF Extraction - wspólny silnik ekstrakcji tekstu dla parserów
+PDF-y (a duże PDF-y w zakresach stron) rozdzielane na procesy
+ProcessPoolExecutor; strony płyną do parserów strumieniem w kolejności
+wejścia (strona -> linie -> wpisy -> JSON zapisywany na bieżąco).
+Tekst stron trafia do cache adresowanego treścią PDF-a.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import zlib
+from collections import deque
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz
+
+
+PAGES_PER_TASK = 16  # Duże PDF-y dzielone na zakresy po tyle stron
+TASKS_PER_WORKER = 2  # Zadania w toku na proces - ogranicza strony czekające na parser
+
+# Zmiana sposobu ekstrakcji, formatu cache lub wersji PyMuPDF unieważnia cache
+EXTRACTOR_VERSION = f"2-pymupdf-{fitz.VersionBind}"
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         ".fiszki_pdf_cache")
+HASH_CHUNK = 1024 * 1024
+
+
+class ExtractionCache:
+    """
+    Teksty stron PDF-ów w cache_dir: jedna strona na linię (napis JSON),
+    całość skompresowana zlib - zapis i odczyt strona po stronie.
+    Klucz: sha256 treści PDF-a + EXTRACTOR_VERSION - zmiana nazwy lub mtime
+    pliku nie unieważnia wpisu, zmiana treści tak.
+    """
+
+    def __init__(self, cache_dir=None, version=EXTRACTOR_VERSION):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.version = version
+
+    def key(self, pdf_path):
+        digest = hashlib.sha256(self.version.encode('utf-8') + b'\0')
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, key + '.jsonl.z')
+
+    def has(self, key):
+        return os.path.exists(self.path(key))
+
+    def read(self, key):
+        """
+        Generator tekstów stron wpisu. Uszkodzony lub ucięty plik
+        kończy się wyjątkiem (OSError, ValueError, zlib.error).
+        """
+        decompressor = zlib.decompressobj()
+        buffer = b''
+        with open(self.path(key), 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+                *lines, buffer = (buffer + decompressor.decompress(chunk)).split(b'\n')
+                for line in lines:
+                    yield self._page(line)
+        if not decompressor.eof or buffer + decompressor.flush():
+            raise zlib.error("truncated cache entry")
+
+    @staticmethod
+    def _page(line):
+        page = json.loads(line.decode('utf-8'))
+        if not isinstance(page, str):
+            raise ValueError("cache entry is not a list of pages")
+        return page
+
+    def get(self, key):
+        """Teksty stron albo None (brak wpisu lub uszkodzony plik)."""
+        try:
+            return list(self.read(key))
+        except (OSError, ValueError, zlib.error):
+            return None
+
+    def store(self, key, pages, log=print):
+        """
+        Przepuszcza strony dalej, zapisując je do cache; wpis pojawia się
+        dopiero po ostatniej stronie (przerwany strumień nie zostawia wpisu).
+        """
+        tmp_path = self.path(key) + '.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            f = open(tmp_path, 'wb')
+        except OSError as e:
+            log(f"ERROR writing extraction cache: {e}")
+            yield from pages
+            return
+
+        compressor = zlib.compressobj(6)
+        committed = False
+        try:
+            for page in pages:
+                if f:
+                    try:
+                        f.write(compressor.compress(
+                            (json.dumps(page, ensure_ascii=False) + '\n').encode('utf-8')))
+                    except OSError as e:
+                        log(f"ERROR writing extraction cache: {e}")
+                        f.close()
+                        f = None
+                yield page
+            if f:
+                f.write(compressor.flush())
+                f.close()
+                os.replace(tmp_path, self.path(key))
+                committed = True
+        except OSError as e:
+            log(f"ERROR writing extraction cache: {e}")
+        finally:
+            if f and not f.closed:
+                f.close()
+            if not committed and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def remove(self, key, log=print):
+        """Usuwa wpis (np. uszkodzony)."""
+        try:
+            os.remove(self.path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            log(f"ERROR removing extraction cache entry: {e}")
+
+    def put(self, key, pages):
+        for _ in self.store(key, pages):
+            pass
+
+
+def default_workers():
+    """Liczba procesów: liczba rdzeni."""
+    return os.cpu_count() or 1
+
+
+def make_pool(workers=None):
+    """
+    Pula procesów ekstrakcji (workers=None - liczba rdzeni). Procesy startują
+    przez forkserver/spawn, nie fork - pula bywa tworzona w procesie z wątkami.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+    return ProcessPoolExecutor(max_workers=workers or default_workers(), mp_context=context)
+
+
+def page_count(pdf_path):
+    with fitz.open(pdf_path) as doc:
+        return len(doc)
+
+
+def extract_page_range(pdf_path, start, stop):
+    """Tekst stron [start, stop) - zadanie wykonywane w procesie roboczym."""
+    with fitz.open(pdf_path) as doc:
+        return [doc[page_num].get_text() for page_num in range(start, stop)]
+
+
+def format_pages(page_texts):
+    """Tekst z markerami stron, jak w dotychczasowych extract_text."""
+    return "".join(f"__PAGE_{page_num}__\n{text}\n"
+                   for page_num, text in enumerate(page_texts, 1))
+
+
+def iter_pdf_pages(pdf_path, start=0):
+    """Teksty stron od start do końca, strona po stronie (w bieżącym procesie)."""
+    with fitz.open(pdf_path) as doc:
+        for page_num in range(start, len(doc)):
+            yield doc[page_num].get_text()
+
+
+def iter_pages(pdf_path, cache=None, key=None, log=print):
+    """
+    Generator tekstów stron jednego PDF-a: z cache albo z PDF-a (i wtedy do cache).
+    Uszkodzony wpis cache jest zastępowany: pozostałe strony są czytane z PDF-a,
+    a do cache trafia całość (strony już oddane z cache - ekstrahowane ponownie).
+    """
+    if cache and key is None:
+        key = cache.key(pdf_path)
+    done = 0
+    if cache and cache.has(key):
+        try:
+            for page in cache.read(key):
+                yield page
+                done += 1
+            return
+        except (OSError, ValueError, zlib.error) as e:
+            log(f"ERROR reading extraction cache for {pdf_path}: {e}")
+            cache.remove(key, log)
+
+    if not cache:
+        yield from iter_pdf_pages(pdf_path, done)
+        return
+    pages = cache.store(key, iter_pdf_pages(pdf_path), log)
+    try:
+        yield from islice(pages, done, None)
+    finally:
+        pages.close()
+
+
+def iter_lines(pages):
+    """
+    Linie tekstu stron z markerami __PAGE_n__ - te same linie co
+    format_pages(pages).split('\\n'), bez sklejania całego dokumentu.
+    """
+    for page_num, text in enumerate(pages, 1):
+        yield f"__PAGE_{page_num}__"
+        yield from text.split('\n')
+    yield ""
+
+
+class Lookahead:
+    """Iterator z podglądem następnego elementu (wpisy zbierane z kilku linii)."""
+
+    _EMPTY = object()
+
+    def __init__(self, items):
+        self._items = iter(items)
+        self._next = self._EMPTY
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._next is not self._EMPTY:
+            item, self._next = self._next, self._EMPTY
+            return item
+        return next(self._items)
+
+    def peek(self, default=None):
+        """Następny element bez pobierania go (default na końcu)."""
+        if self._next is self._EMPTY:
+            self._next = next(self._items, self._EMPTY)
+        return default if self._next is self._EMPTY else self._next
+
+
+def extract_pages(pdf_path, cache=None, log=print):
+    """Teksty wszystkich stron jednego PDF-a (w bieżącym procesie)."""
+    return list(iter_pages(pdf_path, cache, log=log))
+
+
+def extract_text(pdf_path, cache=None, log=print):
+    """Tekst jednego PDF-a z markerami __PAGE_n__ ("" przy błędzie)."""
+    try:
+        return format_pages(extract_pages(pdf_path, cache, log))
+    except Exception as e:
+        log(f"ERROR extracting text from {pdf_path}: {e}")
+        return ""
+
+
+def plan_tasks(page_counts, pages_per_task=PAGES_PER_TASK):
+    """Zadania (indeks PDF-a, start, stop) w kolejności PDF-ów i stron."""
+    tasks = []
+    for index, count in enumerate(page_counts):
+        for start in range(0, count or 0, pages_per_task):
+            tasks.append((index, start, min(count, start + pages_per_task)))
+    return tasks
+
+
+class _TaskWindow:
+    """
+    Zadania zakresów stron zlecane puli po kolei, najwyżej size naraz;
+    wyniki odbierane w kolejności zadań.
+    """
+
+    def __init__(self, pool, pdf_paths, tasks, size):
+        self.pool = pool
+        self.pdf_paths = pdf_paths
+        self.tasks = iter(tasks)
+        self.size = size
+        self.pending = deque()
+        self.fill()
+
+    def fill(self):
+        while len(self.pending) < self.size:
+            task = next(self.tasks, None)
+            if task is None:
+                return
+            index, start, stop = task
+            self.pending.append(
+                (index, self.pool.submit(extract_page_range, self.pdf_paths[index], start, stop)))
+
+    def pages(self, index):
+        """Strony PDF-a index; błąd zadania przerywa strumień wyjątkiem."""
+        while self.pending and self.pending[0][0] == index:
+            _, future = self.pending.popleft()
+            self.fill()
+            yield from future.result()
+
+    def skip(self, index):
+        """Porzuca zadania PDF-a, którego strumień nie został dokończony."""
+        while self.pending and self.pending[0][0] == index:
+            self.pending.popleft()[1].cancel()
+            self.fill()
+
+    def cancel(self):
+        """Porzuca wszystkie zadania w toku i niezlecone."""
+        self.tasks = iter(())
+        while self.pending:
+            self.pending.popleft()[1].cancel()
+
+
+def _failed(error):
+    raise error
+    yield
+
+
+def iter_pages_many(pdf_paths, workers=None, pages_per_task=PAGES_PER_TASK, cache=None,
+                    pool=None, log=print):
+    """
+    Generator par (pdf_path, strony) w kolejności pdf_paths; strony to generator
+    tekstów, który trzeba wyczerpać przed przejściem do kolejnego PDF-a.
+    PDF, którego nie da się odczytać, kończy swój strumień wyjątkiem.
+    workers=None - liczba rdzeni; workers=1 - bez procesów pomocniczych.
+    W toku jest najwyżej TASKS_PER_WORKER zadań na proces, więc pamięć
+    nie rośnie z rozmiarem PDF-ów, a pierwsze strony są gotowe od razu.
+    cache: ExtractionCache - PDF-y z trafieniem w cache nie są otwierane.
+    pool: wspólna pula z make_pool (np. dla równoległych serii) - nie jest
+    zamykana; bez niej tworzona jest własna na czas generatora.
+    log: funkcja komunikatów ERROR (domyślnie print).
+    """
+    pdf_paths = list(pdf_paths)
+    workers = default_workers() if workers is None else workers
+    if workers <= 1 and pool is None:
+        for pdf_path in pdf_paths:
+            yield pdf_path, iter_pages(pdf_path, cache, log=log)
+        return
+
+    keys = [None] * len(pdf_paths)
+    errors = [None] * len(pdf_paths)
+    page_counts = []
+    for index, pdf_path in enumerate(pdf_paths):
+        try:
+            if cache:
+                keys[index] = cache.key(pdf_path)
+            # Trafienie w cache = brak zadań dla tego PDF-a
+            page_counts.append(0 if cache and cache.has(keys[index]) else page_count(pdf_path))
+        except Exception as e:
+            errors[index] = e
+            page_counts.append(None)
+
+    tasks = plan_tasks(page_counts, pages_per_task)
+    if len(tasks) <= 1:
+        for index, pdf_path in enumerate(pdf_paths):
+            yield pdf_path, (_failed(errors[index]) if errors[index]
+                             else iter_pages(pdf_path, cache, keys[index], log))
+        return
+
+    own_pool = pool is None
+    if own_pool:
+        pool = make_pool(min(workers, len(tasks)))
+    window = None
+    try:
+        window = _TaskWindow(pool, pdf_paths, tasks, max(workers, 1) * TASKS_PER_WORKER)
+        for index, pdf_path in enumerate(pdf_paths):
+            if errors[index]:
+                yield pdf_path, _failed(errors[index])
+            elif page_counts[index] == 0:
+                yield pdf_path, iter_pages(pdf_path, cache, keys[index], log)
+            else:
+                pages = window.pages(index)
+                yield pdf_path, cache.store(keys[index], pages, log) if cache else pages
+                window.skip(index)
+    finally:
+        # Przerwany strumień nie zostawia zadań we wspólnej puli
+        if window is not None:
+            window.cancel()
+        if own_pool:
+            pool.shutdown()
+
+
+def extract_pages_many(pdf_paths, workers=None, pages_per_task=PAGES_PER_TASK, cache=None,
+                       log=print):
+    """
+    Teksty stron wielu PDF-ów: lista list stron, w kolejności pdf_paths.
+    PDF, którego nie da się odczytać, daje pustą listę (i komunikat ERROR).
+    """
+    results = []
+    for pdf_path, pages in iter_pages_many(pdf_paths, workers, pages_per_task, cache, log=log):
+        try:
+            results.append(list(pages))
+        except Exception as e:
+            log(f"ERROR extracting text from {pdf_path}: {e}")
+            results.append([])
+    return results
+
+
+def extract_text_many(pdf_paths, workers=None, pages_per_task=PAGES_PER_TASK, cache=None,
+                      log=print):
+    """Teksty wielu PDF-ów z markerami stron, w kolejności pdf_paths."""
+    return [format_pages(page_texts) if page_texts else ""
+            for page_texts in extract_pages_many(pdf_paths, workers, pages_per_task, cache, log)]
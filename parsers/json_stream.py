@@ -0,0 +1,71 @@
+"""
+JSON Stream - zapis listy wpisów do *_parsed.json element po elemencie
+Wynik jest identyczny z json.dump(entries, f, ensure_ascii=False, indent=2),
+ale lista wpisów nie musi istnieć w pamięci.
+"""
+
+import json
+import os
+
+
+class JsonArrayWriter:
+    """
+    Lista JSON pisana na bieżąco do pliku .tmp, podmienianego atomowo
+    przy zamknięciu bez błędu (błąd w trakcie zostawia poprzedni plik).
+    keep_empty=False - pusty strumień nie tworzy pliku.
+    """
+
+    def __init__(self, path, indent=2, keep_empty=True):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.indent = indent
+        self.keep_empty = keep_empty
+        self.count = 0
+        self.file = None
+
+    def write(self, item):
+        if self.file is None:
+            self.file = open(self.tmp_path, 'w', encoding='utf-8')
+            self.file.write("[\n")
+        else:
+            self.file.write(",\n")
+        text = json.dumps(item, ensure_ascii=False, indent=self.indent)
+        pad = " " * self.indent
+        self.file.write("\n".join(pad + line for line in text.split("\n")))
+        self.count += 1
+
+    def commit(self):
+        if self.file is None:
+            if not self.keep_empty:
+                return self.count
+            self.file = open(self.tmp_path, 'w', encoding='utf-8')
+            self.file.write("[]")
+        else:
+            self.file.write("\n]")
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+        return self.count
+
+    def abort(self):
+        if self.file is not None:
+            self.file.close()
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.abort()
+        return False
+
+
+def write_json_array(path, items, keep_empty=True):
+    """Zapisuje elementy strumienia jako listę JSON; zwraca ich liczbę."""
+    with JsonArrayWriter(path, keep_empty=keep_empty) as writer:
+        for item in items:
+            writer.write(item)
+    return writer.count
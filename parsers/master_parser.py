@@ -4,9 +4,17 @@ Umożliwia wybór serii i uruchomienie odpowiedniego parsera.
 """
 
 import os
+import importlib
 import json
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from build_manifest import BuildManifest, parser_version
+from extraction import ExtractionCache, make_pool
 
 
 def get_project_dirs():
@@ -92,23 +100,66 @@ def check_series_availability():
     return available_series
 
 
-def run_parser_auto(parser_path):
-    """Uruchamia parser w trybie fully automatic."""
-    print(f"\n{'='*70}")
-    print(f"Parser: {os.path.basename(parser_path)}")
-    print(f"{'='*70}\n")
-    
-    result = subprocess.run(
-        [sys.executable, parser_path, "--full-auto"], 
-        capture_output=False, 
-        text=True
-    )
+def series_pdf_files(series):
+    """Ścieżki PDF-ów serii (Career Paths: ze wszystkich kategorii)."""
+    if series['key'] == "career_paths":
+        pdf_dirs = [os.path.join(series['pdf_dir'], category, "pdf")
+                    for category in sorted(os.listdir(series['pdf_dir']))]
+    else:
+        pdf_dirs = [series['pdf_dir']]
     
-    return result.returncode == 0
+    pdf_files = []
+    for pdf_dir in pdf_dirs:
+        if os.path.isdir(pdf_dir):
+            pdf_files.extend(os.path.join(pdf_dir, f)
+                             for f in sorted(os.listdir(pdf_dir)) if f.endswith('.pdf'))
+    return pdf_files
+
+
+def stale_pdf_count(series, manifest=None):
+    """Liczba PDF-ów serii zmienionych od ostatniego budowania (wg manifestu)."""
+    manifest = manifest or BuildManifest()
+    return len(manifest.stale(series_pdf_files(series), parser_version(series['parser'])))
+
+
+def load_parser(series):
+    """
+    Moduł parsera serii jako plugin - każdy parser udostępnia
+    run_full_auto(manifest, force, cache, log, pool) zwracające podsumowanie.
+    """
+    module_name = os.path.splitext(os.path.basename(series['parser']))[0]
+    return importlib.import_module(module_name)
+
+
+def series_logger(series, lock):
+    """Komunikaty serii z prefiksem [klucz] - wiersze równoległych serii się nie mieszają."""
+    def log(message=""):
+        with lock:
+            for line in str(message).split("\n"):
+                print(f"[{series['key']}] {line}" if line else "")
+    return log
 
 
-def full_auto_all_series():
-    """Parsuje wszystkie dostępne serie automatycznie."""
+def run_series(series, manifest, force=False, cache=None, log=print, pool=None):
+    """Parsuje serię w bieżącym procesie; zwraca podsumowanie z czasem i statusem."""
+    start = time.perf_counter()
+    try:
+        summary = load_parser(series).run_full_auto(manifest=manifest, force=force,
+                                                    cache=cache, log=log, pool=pool)
+        summary["success"] = True
+    except Exception as e:
+        log(f"BLAD: {e}")
+        summary = {"success": False}
+    summary["series"] = series['name']
+    summary["seconds"] = time.perf_counter() - start
+    return summary
+
+
+def full_auto_all_series(force=False):
+    """
+    Parsuje wszystkie dostępne serie automatycznie.
+    Serie bez zmienionych PDF-ów są pomijane (force=True - parsuje wszystko).
+    """
     available_series = check_series_availability()
     
     if not available_series:
@@ -118,34 +169,53 @@ def full_auto_all_series():
     print("\n" + "="*70)
     print("MASTER PARSER - FULL AUTO MODE")
     print("="*70)
+    manifest = BuildManifest()
+    for s in available_series:
+        s['stale_count'] = s['pdf_count'] if force else stale_pdf_count(s, manifest)
+    
     print("\nDostepne serie:")
     for s in available_series:
-        print(f"  * {s['name']}: {s['pdf_count']} plik(ow) PDF")
+        print(f"  * {s['name']}: {s['pdf_count']} plik(ow) PDF, "
+              f"do przebudowania: {s['stale_count']}")
     
     confirm = input("\nCzy na pewno chcesz sparsowac wszystkie serie? (t/n): ").lower()
     if confirm != 't':
         print("Anulowano.")
         return
     
-    results = []
-    for series in available_series:
-        print(f"\n{'#'*70}")
-        print(f"# {series['name'].upper()}")
-        print(f"{'#'*70}")
-        
-        success = run_parser_auto(series['parser'])
-        results.append({
-            "series": series['name'],
-            "success": success
-        })
+    # Serie parsowane równolegle w wątkach tego procesu (bez startu interpretera
+    # i importu fitz dla każdej serii); ekstrakcja PDF-ów idzie w jednej wspólnej
+    # puli procesów - najwyżej tyle procesów, ile rdzeni, niezależnie od liczby serii
+    to_run = [s for s in available_series if s['stale_count']]
+    cache = ExtractionCache()
+    lock = threading.Lock()
+    start = time.perf_counter()
+    print()
+    
+    results = {}
+    if to_run:
+        with make_pool() as extraction_pool, ThreadPoolExecutor(max_workers=len(to_run)) as pool:
+            futures = {s['key']: pool.submit(run_series, s, manifest, force, cache,
+                                             series_logger(s, lock), extraction_pool)
+                       for s in to_run}
+            results = {key: future.result() for key, future in futures.items()}
+        manifest.save()
+    total_seconds = time.perf_counter() - start
     
     # Podsumowanie
     print("\n" + "="*70)
     print("PODSUMOWANIE")
     print("="*70)
-    for r in results:
-        status = "OK: " if r['success'] else "BLAD: "
-        print(f"{status}{r['series']}")
+    for series in available_series:
+        r = results.get(series['key'])
+        if r is None:
+            print(f"OK: {series['name']} (aktualne)")
+        elif r['success']:
+            print(f"OK: {series['name']} - {r['parsed']} PDF, {r['words']} slowek, "
+                  f"pominieto {r['skipped']}, bledy {r['errors']} ({r['seconds']:.1f}s)")
+        else:
+            print(f"BLAD: {series['name']} ({r['seconds']:.1f}s)")
+    print(f"\nCzas calkowity: {total_seconds:.1f}s")
     print(f"{'='*70}\n")
 
 
@@ -192,7 +262,7 @@ def main():
                 return
             
             if choice == len(available_series) + 1:
-                full_auto_all_series()
+                full_auto_all_series(force="--force" in sys.argv)
                 return
             
             if 1 <= choice <= len(available_series):
@@ -4,12 +4,16 @@ Parsuje PDF-y z serii New Enterprise i konwertuje je do formatu JSON.
 Obsługuje format ze słowami oddzielonymi backslashami.
 """
 
-import fitz  # PyMuPDF
 import os
 import json
 import re
 import sys
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from extraction import ExtractionCache, iter_pages, iter_pages_many
+from json_stream import write_json_array
+from build_manifest import BuildManifest, parser_version
+
 
 def get_data_dirs():
     """Pobiera ścieżki do folderów PDF i JSON."""
@@ -21,27 +25,17 @@ def get_data_dirs():
     return pdf_dir, json_dir
 
 
-def parse_pdf(pdf_path, auto_mode=True):
+def iter_page_entries(pages, on_error=None):
     """
-    Parsuje PDF i ekstrahuje słówka.
+    Generator wpisów ze stron, strona po stronie (pages może być strumieniem
+    z iter_pages_many - wpisy pierwszych stron są gotowe przed końcem PDF-a).
     
-    Format: word \ pronunciation \ (part of speech) definition
+    Format: word \\ pronunciation \\ (part of speech) definition
+    on_error(full_entry, wyjątek): wołane dla wpisu, którego nie da się sparsować.
     """
-    try:
-        doc = fitz.open(pdf_path)
-    except Exception as e:
-        print(f"Błąd: Nie można otworzyć {pdf_path}: {e}")
-        return [], 0, False
-    
-    print(f"Parsowanie {len(doc)} stron z {os.path.basename(pdf_path)}...")
-    
-    all_words = []
     current_unit = "Unknown"
-    skipped_count = 0
     
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text = page.get_text()
+    for page_num, text in enumerate(pages):
         lines = text.split('\n')
         
         # Szukaj jednostki na tej stronie
@@ -134,48 +128,142 @@ def parse_pdf(pdf_path, auto_mode=True):
                         "correct_count": 0,
                         "wrong_count": 0
                     }
-                    
-                    if auto_mode:
-                        all_words.append(entry)
-                    else:
-                        # Tryb ręczny - pytaj użytkownika
-                        print(f"\n--- Znaleziono wpis ---")
-                        print(f"Słowo: {word}")
-                        print(f"Wymowa: {pronunciation}")
-                        print(f"Część mowy: {part_of_speech}")
-                        print(f"Definicja: {definition[:100]}{'...' if len(definition) > 100 else ''}")
-                        print(f"Jednostka: {current_unit}")
-                        
-                        while True:
-                            confirm = input("\nDodać? (t/n/q): ").lower()
-                            if confirm == 't':
-                                all_words.append(entry)
-                                print(f"✓ Dodano: {word}")
-                                break
-                            elif confirm == 'n':
-                                skipped_count += 1
-                                print(f"✗ Pominięto: {word}")
-                                break
-                            elif confirm == 'q':
-                                return all_words, skipped_count, True
-                            else:
-                                print("Wpisz 't', 'n' lub 'q'")
+                    yield entry
                 
                 except Exception as e:
-                    if not auto_mode:
-                        print(f"\nBłąd: {full_entry[:100]}... - {e}")
-                        input("Enter aby kontynuować...")
+                    if on_error:
+                        on_error(full_entry, e)
             else:
                 i += 1
+
+
+def parse_pdf(pdf_path, auto_mode=True, pages=None, cache=None, log=print):
+    """
+    Parsuje PDF i ekstrahuje słówka (auto_mode=False - potwierdzenie każdego wpisu).
+    
+    pages: teksty stron wyekstrahowane wcześniej (np. iter_pages_many);
+           domyślnie PDF jest czytany tutaj, strona po stronie.
+    log: funkcja komunikatów postępu (master_parser dodaje prefiks serii).
+    Zwraca (słówka, liczba pominiętych, czy przerwano).
+    """
+    if pages is None:
+        pages = iter_pages(pdf_path, cache)
+    
+    log(f"Parsowanie {os.path.basename(pdf_path)}...")
+    
+    all_words = []
+    skipped_count = 0
+    
+    def report_error(full_entry, e):
+        if not auto_mode:
+            print(f"\nBłąd: {full_entry[:100]}... - {e}")
+            input("Enter aby kontynuować...")
+    
+    try:
+        for entry in iter_page_entries(pages, report_error):
+            if auto_mode:
+                all_words.append(entry)
+                continue
+            
+            # Tryb ręczny - pytaj użytkownika
+            print(f"\n--- Znaleziono wpis ---")
+            print(f"Słowo: {entry['word']}")
+            print(f"Wymowa: {entry['pronunciation']}")
+            print(f"Część mowy: {entry['part_of_speech']}")
+            definition = entry['definition']
+            print(f"Definicja: {definition[:100]}{'...' if len(definition) > 100 else ''}")
+            print(f"Jednostka: {entry['unit']}")
+            
+            while True:
+                confirm = input("\nDodać? (t/n/q): ").lower()
+                if confirm == 't':
+                    all_words.append(entry)
+                    print(f"✓ Dodano: {entry['word']}")
+                    break
+                elif confirm == 'n':
+                    skipped_count += 1
+                    print(f"✗ Pominięto: {entry['word']}")
+                    break
+                elif confirm == 'q':
+                    return all_words, skipped_count, True
+                else:
+                    print("Wpisz 't', 'n' lub 'q'")
+    except Exception as e:
+        log(f"Błąd: Nie można odczytać {pdf_path}: {e}")
+        return [], skipped_count, False
     
-    doc.close()
     return all_words, skipped_count, False
 
 
 
+def run_full_auto(manifest=None, force=False, cache=None, log=print, pool=None):
+    """
+    Parsuje zmienione PDF-y serii bez potwierdzeń (wspólny punkt wejścia dla master_parser).
+    manifest: współdzielony BuildManifest - zapisuje go wołający;
+    bez niego manifest jest wczytywany i zapisywany tutaj.
+    pool: wspólna pula procesów ekstrakcji (make_pool) - bez niej własna.
+    Zwraca podsumowanie: pdfs, parsed, skipped, words, errors.
+    """
+    pdf_dir, json_dir = get_data_dirs()
+    summary = {"pdfs": 0, "parsed": 0, "skipped": 0, "words": 0, "errors": 0}
+    
+    if not os.path.exists(pdf_dir):
+        log(f"Błąd: Folder {pdf_dir} nie istnieje!")
+        return summary
+    
+    os.makedirs(json_dir, exist_ok=True)
+    
+    pdf_files = sorted([f for f in os.listdir(pdf_dir) if f.endswith('.pdf')])
+    
+    # Tylko PDF-y zmienione od ostatniego budowania (force: wszystkie)
+    own_manifest = manifest is None
+    manifest = BuildManifest() if own_manifest else manifest
+    version = parser_version(__file__)
+    pdf_paths = manifest.stale([os.path.join(pdf_dir, pdf_file) for pdf_file in pdf_files],
+                               version, force)
+    summary.update(pdfs=len(pdf_files), parsed=len(pdf_paths),
+                   skipped=len(pdf_files) - len(pdf_paths))
+    if summary["skipped"]:
+        log(f"Aktualne: pominięto {summary['skipped']} plików PDF\n")
+    
+    # Strony płyną z puli procesów przez parser prosto do pliku JSON,
+    # PDF po PDF-ie w kolejności plików
+    streams = iter_pages_many(pdf_paths, cache=cache, pool=pool, log=log)
+    try:
+        for pdf_path, pages in streams:
+            pdf_file = os.path.basename(pdf_path)
+            log(f"Parsowanie {pdf_file}...")
+        
+            output_filename = f"{os.path.splitext(pdf_file)[0]}_parsed.json"
+            output_path = os.path.join(json_dir, output_filename)
+        
+            # PDF, którego nie udało się odczytać, zostaje do przebudowania
+            # (poprzedni plik JSON zostaje nietknięty)
+            try:
+                count = write_json_array(output_path, iter_page_entries(pages))
+            except Exception as e:
+                summary["errors"] += 1
+                log(f"Błąd: Nie można odczytać {pdf_path}: {e}")
+                continue
+        
+            manifest.record(pdf_path, output_path, version, "new_enterprise")
+            summary["words"] += count
+        
+            log(f"  ✓ {pdf_file}")
+            log(f"    → {count} słówek -> {output_filename}")
+    finally:
+        streams.close()
+    
+    if own_manifest:
+        manifest.save()
+    return summary
+
+
 def main():
     """Główna funkcja parsera."""
     full_auto = "--full-auto" in sys.argv
+    # Tekst PDF-ów z cache (.fiszki_pdf_cache), chyba że --no-cache
+    cache = None if "--no-cache" in sys.argv else ExtractionCache()
     
     pdf_dir, json_dir = get_data_dirs()
     
@@ -198,18 +286,7 @@ def main():
         print("="*70)
         print(f"\nZnaleziono {len(pdf_files)} plików PDF\n")
         
-        for pdf_file in pdf_files:
-            pdf_path = os.path.join(pdf_dir, pdf_file)
-            words, _, _ = parse_pdf(pdf_path, auto_mode=True)
-            
-            output_filename = f"{os.path.splitext(pdf_file)[0]}_parsed.json"
-            output_path = os.path.join(json_dir, output_filename)
-            
-            with open(output_path, "w", encoding="utf-8") as f:
-                json.dump(words, f, ensure_ascii=False, indent=2)
-            
-            print(f"  ✓ {pdf_file}")
-            print(f"    → {len(words)} słówek -> {output_filename}")
+        run_full_auto(force="--force" in sys.argv, cache=cache)
         
         print(f"\n{'='*70}")
         print("Ukończono parsowanie wszystkich plików!")
@@ -252,7 +329,7 @@ def main():
             except ValueError:
                 print("Wprowadź liczbę.")
         
-        words, skipped, interrupted = parse_pdf(pdf_path, auto_mode)
+        words, skipped, interrupted = parse_pdf(pdf_path, auto_mode, cache=cache)
         
         if interrupted:
             print("\nPrzerwano.")
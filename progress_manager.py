@@ -0,0 +1,142 @@
+"""
+Fiszki Progress Store
+Postęp nauki trzymany osobno od sparsowanych plików ze słownictwem
+"""
+
+import json
+import os
+
+from spaced_repetition import SpacedRepetitionManager
+
+
+def word_id(word):
+    """
+    Stabilny identyfikator słowa: jednostka + słowo (bez wielkości liter).
+    Celowo bez części mowy i definicji - te zmieniają się między wersjami parserów,
+    a klucz musi przetrwać ponowne parsowanie (jest też kluczem dziennika i bazy).
+    Homonimy w jednej jednostce (np. "light" n. i adj.) dzielą więc jeden rekord
+    postępu - odpowiedź na jeden liczy się obu (w bibliotece ~0,4% słów).
+    """
+    unit = str(word.get('unit', '')).strip()
+    text = str(word.get('word', '')).strip().lower()
+    return f"{unit}|{text}"
+
+
+def deck_key(deck_path):
+    """Klucz decku: <seria lub kategoria>__<plik decku>"""
+    deck_path = os.path.abspath(deck_path)
+    base = os.path.splitext(os.path.basename(deck_path))[0]
+    # data/<seria>/json/plik.json -> <seria>
+    owner = os.path.basename(os.path.dirname(os.path.dirname(deck_path)))
+    return f"{owner}__{base}"
+
+
+def write_json_atomic(filepath, data, indent=2):
+    """Zapisuje JSON do pliku tymczasowego i podmienia go atomowo."""
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, filepath)
+
+
+class ProgressStore:
+    """
+    Postęp nauki jednego decku: {word_id: {correct_count, wrong_count, sr_*}}.
+    Pliki data/<seria>/json/*_parsed.json są tylko do odczytu - zapisujemy
+    wyłącznie słowa, które mają jakikolwiek postęp.
+    """
+
+    PROGRESS_DIR = '.fiszki_progress'
+
+    PROGRESS_FIELDS = ('correct_count', 'wrong_count', 'sr_ease', 'sr_interval',
+                       'sr_repetitions', 'next_review')
+
+    def __init__(self, deck_path, progress_dir=None):
+        self.deck_path = deck_path
+        self.progress_dir = progress_dir or self.PROGRESS_DIR
+        self.path = os.path.join(self.progress_dir, deck_key(deck_path) + '.json')
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """Ładuje zapisany postęp (pusty dict jeśli brak pliku)."""
+        if not self.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except Exception as e:
+            print(f"Blad odczytu postepu: {e}")
+            return {}
+
+    def write(self, records):
+        """Zapisuje cały słownik postępu atomowo."""
+        try:
+            os.makedirs(self.progress_dir, exist_ok=True)
+            write_json_atomic(self.path, records, indent=None)
+            return True
+        except Exception as e:
+            print(f"Blad zapisu postepu: {e}")
+            return False
+
+    @staticmethod
+    def extract(word):
+        """Zwraca pola postępu słowa lub None jeśli słowo nie było ćwiczone."""
+        if not (word.get('correct_count', 0) or word.get('wrong_count', 0)
+                or word.get('sr_repetitions', 0) or 'next_review' in word):
+            return None
+        progress = {field: word[field] for field in ProgressStore.PROGRESS_FIELDS if field in word}
+        SpacedRepetitionManager.migrate_word(progress)
+        return progress
+
+    def migrate_from_content(self, words):
+        """
+        Jednorazowa migracja: przenosi postęp zapisany dawniej w plikach
+        *_parsed.json do magazynu postępu.
+        """
+        records = {}
+        for word in words:
+            progress = self.extract(word)
+            if progress:
+                records[word_id(word)] = progress
+        self.write(records)
+        return len(records)
+
+    def apply(self, words, persist=True):
+        """
+        Łączy postęp z treścią decku (przy wczytywaniu).
+        persist=False - tylko odczyt: migracje wyłącznie w pamięci, bez zapisu magazynu.
+        Zwraca liczbę słów z nałożonym postępem.
+        """
+        if not self.exists():
+            if persist:
+                self.migrate_from_content(words)
+            return 0
+
+        records = self.load()
+        if not records:
+            return 0
+
+        # Jednorazowa migracja starych dat ISO do epoch
+        migrated = [SpacedRepetitionManager.migrate_word(r) for r in records.values()]
+        if any(migrated) and persist:
+            self.write(records)
+
+        applied = 0
+        for word in words:
+            progress = records.get(word_id(word))
+            if progress:
+                word.update(progress)
+                applied += 1
+        return applied
+
+    def merge(self, updates):
+        """Nakłada {word_id: pola} na zapisany postęp i zapisuje plik."""
+        records = self.load()
+        for key, fields in updates.items():
+            records.setdefault(key, {}).update(fields)
+        return self.write(records)
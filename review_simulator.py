@@ -0,0 +1,153 @@
+"""
+Fiszki Review Simulator
+Symulacja obciążenia powtórkami: odtwarza deck N dni do przodu na wsadowym SM-2
+"""
+
+import time
+
+from spaced_repetition import BatchSpacedRepetition, SpacedRepetitionManager
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+DAY = 24 * 60 * 60
+
+
+def constant_accuracy(batch, idx, now, accuracy):
+    """Stała szansa poprawnej odpowiedzi."""
+    return np.full(len(idx), accuracy)
+
+
+def learning_accuracy(batch, idx, now, accuracy):
+    """Szansa rośnie z każdą udaną powtórką (krzywa nauki)."""
+    return 1 - (1 - accuracy) * 0.8 ** batch.repetitions[idx]
+
+
+def retention_accuracy(batch, idx, now, accuracy):
+    """Szansa spada, gdy powtórka jest zaległa względem interwału (krzywa zapominania)."""
+    interval = np.maximum(batch.interval[idx] * 60, 60)
+    overdue = np.maximum(now - batch.next_review[idx], 0)
+    return accuracy ** (1 + overdue / interval)
+
+
+ACCURACY_MODELS = {
+    'constant': constant_accuracy,
+    'learning': learning_accuracy,
+    'retention': retention_accuracy,
+}
+
+
+class ReviewSimulator:
+    """
+    Odtwarza deck dzień po dniu: codziennie jedna sesja nauki, w której
+    przerabiane są wszystkie zaległe karty (także kroki 1/3 minuty w trakcie sesji)
+    oraz new_per_day nowych słów. Słowa (słowniki) nie są modyfikowane.
+    """
+
+    QUALITY_CORRECT = SpacedRepetitionManager.map_correct_to_quality(True)
+    QUALITY_WRONG = SpacedRepetitionManager.map_correct_to_quality(False)
+
+    def __init__(self, words, accuracy=0.85, model='constant', new_per_day=20,
+                 session_minutes=30, max_reviews=None, first_interval=None,
+                 second_interval=None, min_ease=None, seed=0):
+        if not HAS_NUMPY:
+            raise ImportError("numpy not installed. pip install numpy")
+        if model not in ACCURACY_MODELS:
+            raise ValueError(f"Nieznany model trafności: {model}")
+
+        self.words = words
+        self.accuracy = accuracy
+        self.model = model
+        self.new_per_day = new_per_day
+        self.session_minutes = session_minutes
+        self.max_reviews = max_reviews
+        self.first_interval = first_interval
+        self.second_interval = second_interval
+        self.min_ease = min_ease
+        self.seed = seed
+
+        units = [str(word.get('unit', '')) for word in words]
+        self.units, self.unit_ids = np.unique(np.array(units, dtype=object), return_inverse=True)
+
+    def run(self, days, now=None):
+        """
+        Symuluje days dni od now (epoch). Zwraca raport:
+        daily_reviews, daily_new, peak_queue, peak_day, total_reviews,
+        accuracy (zrealizowana) i unit_backlog (zaległe karty na jednostkę na koniec).
+        """
+        now = int(time.time()) if now is None else int(now)
+        rng = np.random.default_rng(self.seed)
+        answer = ACCURACY_MODELS[self.model]
+
+        batch = BatchSpacedRepetition(self.words, now=now,
+                                      first_interval=self.first_interval,
+                                      second_interval=self.second_interval,
+                                      min_ease=self.min_ease)
+        # Słowa z postępem są w obiegu od razu, nowe wchodzą po new_per_day dziennie
+        started = np.array(['sr_ease' in word for word in self.words], dtype=bool)
+        active = started.copy()
+        waiting = np.flatnonzero(~started)
+
+        daily_reviews = np.zeros(days, dtype=np.int64)
+        daily_new = np.zeros(days, dtype=np.int64)
+        correct_total = 0
+        peak_queue = 0
+        peak_day = 0
+
+        for day in range(days):
+            start = now + day * DAY
+            end = start + self.session_minutes * 60
+
+            fresh = waiting[:self.new_per_day]
+            waiting = waiting[self.new_per_day:]
+            active[fresh] = True
+            batch.next_review[fresh] = start
+            daily_new[day] = len(fresh)
+
+            queue = int(np.count_nonzero(active & (batch.next_review <= start)))
+            if queue > peak_queue:
+                peak_queue, peak_day = queue, day
+
+            t = start
+            budget = self.max_reviews
+            while t <= end and (budget is None or budget > 0):
+                due = np.flatnonzero(active & (batch.next_review <= t))
+                if len(due):
+                    # Najpierw najbardziej zaległe
+                    due = due[np.argsort(batch.next_review[due], kind='stable')]
+                    if budget is not None:
+                        due = due[:budget]
+                        budget -= len(due)
+
+                    correct = rng.random(len(due)) < answer(batch, due, t, self.accuracy)
+                    qualities = np.where(correct, self.QUALITY_CORRECT, self.QUALITY_WRONG)
+                    batch.update_sr(due, qualities, now=t)
+
+                    daily_reviews[day] += len(due)
+                    correct_total += int(correct.sum())
+
+                upcoming = batch.next_review[active & (batch.next_review > t)]
+                if not len(upcoming):
+                    break
+                t = int(upcoming.min())
+
+        backlog_at = now + days * DAY
+        backlog = np.bincount(self.unit_ids[active & (batch.next_review <= backlog_at)],
+                              minlength=len(self.units))
+        total_reviews = int(daily_reviews.sum())
+
+        return {
+            'days': days,
+            'daily_reviews': daily_reviews.tolist(),
+            'daily_new': daily_new.tolist(),
+            'peak_queue': peak_queue,
+            'peak_day': peak_day,
+            'total_reviews': total_reviews,
+            'accuracy': correct_total / total_reviews if total_reviews else 0.0,
+            'unit_backlog': {str(unit): int(count) for unit, count in zip(self.units, backlog) if count},
+            'not_introduced': int(len(waiting)),
+        }
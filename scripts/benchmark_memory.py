@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Memory Benchmark - pamięć całej biblioteki data/ wczytanej naraz
+Porównuje listy słowników (json.load) z rekordami Word (word_hook),
+mierząc tracemalloc-iem to, co zostaje w pamięci po wczytaniu.
+Usage: python scripts/benchmark_memory.py [katalog_data]
+"""
+
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from word_record import word_hook
+
+
+def library_files(data_dir):
+    for dirpath, _, filenames in sorted(os.walk(data_dir)):
+        for name in sorted(filenames):
+            if name.endswith('.json'):
+                yield os.path.join(dirpath, name)
+
+
+def load_library(data_dir, object_hook=None):
+    words = []
+    for path in library_files(data_dir):
+        with open(path, 'r', encoding='utf-8') as f:
+            try:
+                data = json.load(f, object_hook=object_hook)
+            except ValueError:
+                continue
+        if isinstance(data, list):
+            words.extend(data)
+    return words
+
+
+def measure(loader):
+    """(słowa, bajty pozostające w pamięci, czas wczytania)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    words = loader()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    resident = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(words), resident, elapsed
+
+
+def main():
+    data_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join(ROOT, 'data')
+    disk = sum(os.path.getsize(path) for path in library_files(data_dir))
+
+    count, dicts, dict_time = measure(lambda: load_library(data_dir))
+    _, records, record_time = measure(lambda: load_library(data_dir, word_hook()))
+
+    print("\n" + "=" * 60)
+    print("MEMORY BENCHMARK - cała biblioteka w pamięci")
+    print("=" * 60)
+    print(f"Pliki JSON: {disk / 1e6:.1f} MB, słówek: {count}")
+    print(f"{'':>10} | {'pamięć (MB)':>12} | {'B/słowo':>8} | {'wczytanie (s)':>13}")
+    print("-" * 60)
+    print(f"{'dict':>10} | {dicts / 1e6:>12.1f} | {dicts / max(count, 1):>8.0f} | {dict_time:>13.2f}")
+    print(f"{'Word':>10} | {records / 1e6:>12.1f} | {records / max(count, 1):>8.0f} | {record_time:>13.2f}")
+    print("-" * 60)
+    print(f"Oszczędność: {dicts / max(records, 1):.1f}x")
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Sampler Benchmark - czas wyboru jednej karty w zależności od wielkości decku
+Porównuje stare losowanie (lista wag + random.choices na każdą kartę)
+z WeightedSampler (drzewo Fenwicka, O(log n)).
+Usage: python scripts/benchmark_sampler.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from card_sampler import WeightedSampler, card_weight
+
+
+DECK_SIZES = [500, 5000, 50000]
+CARDS = 2000
+
+
+def make_deck(size):
+    rng = random.Random(size)
+    return [
+        {
+            'word': f"word{i}",
+            'unit': f"File {i % 10 + 1}",
+            'correct_count': rng.randint(0, 5),
+            'wrong_count': rng.randint(0, 3),
+        }
+        for i in range(size)
+    ]
+
+
+def answer(word, rng):
+    key = 'correct_count' if rng.random() < 0.7 else 'wrong_count'
+    word[key] += 1
+
+
+def bench_full_scan(words, units):
+    """Stara ścieżka get_next_word: filtr jednostek + wagi + random.choices."""
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(CARDS):
+        available = [w for w in words if w.get('unit') in units]
+        weights = [card_weight(w) for w in available]
+        word = rng.choices(available, weights=weights)[0]
+        answer(word, rng)
+    return (time.perf_counter() - start) / CARDS
+
+
+def bench_sampler(words, units):
+    """Nowa ścieżka: sampler budowany raz, potem losowanie + aktualizacja wagi."""
+    rng = random.Random(1)
+    sampler = WeightedSampler(w for w in words if w.get('unit') in units)
+    start = time.perf_counter()
+    for _ in range(CARDS):
+        word = sampler.sample(rng)
+        answer(word, rng)
+        sampler.refresh(word)
+    return (time.perf_counter() - start) / CARDS
+
+
+def main():
+    units = [f"File {i}" for i in range(1, 11)]
+
+    print("\n" + "=" * 60)
+    print("SAMPLER BENCHMARK - czas na karte (us)")
+    print("=" * 60)
+    print(f"{'Slowek':>8} | {'pelny skan':>12} | {'Fenwick':>10} | {'przyspieszenie':>14}")
+    print("-" * 60)
+
+    for size in DECK_SIZES:
+        scan = bench_full_scan(make_deck(size), units)
+        tree = bench_sampler(make_deck(size), units)
+        print(f"{size:>8} | {scan * 1e6:>12.1f} | {tree * 1e6:>10.1f} | {scan / tree:>13.0f}x")
+
+    print("=" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,16 +10,19 @@ import subprocess
 from pathlib import Path
 
 
+def get_project_root():
+    """Get absolute path to project root (parent of scripts/)"""
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
 def get_parsers_dir():
     """Get absolute path to parsers directory"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(script_dir, "parsers")
+    return os.path.join(get_project_root(), "parsers")
 
 
 def get_data_dir():
     """Get absolute path to data directory"""
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    return os.path.join(script_dir, "data")
+    return os.path.join(get_project_root(), "data")
 
 
 def check_parser_exists(parser_name):
@@ -64,7 +67,11 @@ def run_parser(parser_name, full_auto=False):
     try:
         cmd = [sys.executable, parser_path]
         if full_auto:
+            # Parsery przebudowują tylko PDF-y zmienione od ostatniego razu
+            # (manifest .fiszki_parse_manifest.json); --force wymusza całość
             cmd.append("--full-auto")
+            if "--force" in sys.argv:
+                cmd.append("--force")
         
         print(f"\n Uruchamianie {parser_name} parser...")
         result = subprocess.run(cmd, cwd=parsers_dir)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Review Simulator - prognoza obciążenia powtórkami dla całej biblioteki
+Odtwarza decki N dni do przodu (wsadowy SM-2 na NumPy) i porównuje ustawienia
+kroków nauki, np. obecne 1/3 minuty z alternatywnymi.
+Usage: python scripts/simulate_reviews.py --days 365 --steps 1,3 --steps 10,1440
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from library_db import LibraryDatabase
+from progress_manager import ProgressStore
+from review_simulator import ACCURACY_MODELS, ReviewSimulator
+
+
+def load_library(data_dir, with_progress=True):
+    """
+    Wszystkie słowa z data/ (z zapisanym postępem, jeśli istnieje).
+    Magazyny postępu są tylko czytane - symulacja niczego nie zapisuje.
+    """
+    words = []
+    for series_key, category, path in LibraryDatabase.iter_data_files(data_dir):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                deck = json.load(f)
+        except Exception as e:
+            print(f"Pomijam {path}: {e}")
+            continue
+        if not isinstance(deck, list):
+            continue
+
+        store = ProgressStore(path)
+        if with_progress and store.exists():
+            store.apply(deck, persist=False)
+        unit_prefix = f"{category or series_key}/{os.path.basename(path).replace('_parsed.json', '')}"
+        for word in deck:
+            word = dict(word)
+            word['unit'] = f"{unit_prefix}/{word.get('unit', '')}"
+            words.append(word)
+    return words
+
+
+def parse_steps(value):
+    first, second = (int(v) for v in value.split(','))
+    return first, second
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Symulacja obciążenia powtórkami SM-2")
+    parser.add_argument('--data', default='data', help="Katalog z danymi (domyślnie data)")
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--accuracy', type=float, default=0.85)
+    parser.add_argument('--model', choices=sorted(ACCURACY_MODELS), default='retention')
+    parser.add_argument('--new-per-day', type=int, default=20)
+    parser.add_argument('--session', type=int, default=30, help="Długość sesji w minutach")
+    parser.add_argument('--max-reviews', type=int, default=None, help="Limit powtórek dziennie")
+    parser.add_argument('--steps', type=parse_steps, action='append',
+                        help="Kroki nauki w minutach 'pierwszy,drugi' (można podać kilka)")
+    parser.add_argument('--no-progress', action='store_true', help="Symuluj od zera, bez postępu")
+    parser.add_argument('--top-units', type=int, default=10)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    words = load_library(args.data, with_progress=not args.no_progress)
+    print(f"Wczytano {len(words)} slow w {time.perf_counter() - start:.1f} s")
+    if not words:
+        return
+
+    for first, second in args.steps or [(None, None)]:
+        simulator = ReviewSimulator(words, accuracy=args.accuracy, model=args.model,
+                                    new_per_day=args.new_per_day, session_minutes=args.session,
+                                    max_reviews=args.max_reviews, first_interval=first,
+                                    second_interval=second)
+        start = time.perf_counter()
+        report = simulator.run(args.days)
+        elapsed = time.perf_counter() - start
+
+        daily = report['daily_reviews']
+        label = f"{first},{second}" if first is not None else "domyslne"
+        print(f"\n=== Kroki {label} min, model {args.model}, {args.days} dni ({elapsed:.2f} s) ===")
+        print(f"Powtorki lacznie:     {report['total_reviews']}")
+        print(f"Srednio / max dziennie: {sum(daily) / len(daily):.1f} / {max(daily)}")
+        print(f"Najwieksza kolejka:   {report['peak_queue']} (dzien {report['peak_day']})")
+        print(f"Trafnosc:             {report['accuracy']:.1%}")
+        print(f"Nie wprowadzone:      {report['not_introduced']}")
+
+        backlog = sorted(report['unit_backlog'].items(), key=lambda item: -item[1])
+        if backlog:
+            print(f"Zaleglosci na koniec (top {args.top_units}):")
+            for unit, count in backlog[:args.top_units]:
+                print(f"  {count:6d}  {unit}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,34 @@ Fiszki Search & Filter
 Wyszukiwanie i filtrowanie słów
 """
 
+from search_index import SearchIndex
+
 
 class SearchFilter:
     """Zarządza wyszukiwaniem i filtrowaniem słów."""
     
     @staticmethod
-    def search(words, query):
+    def search(words, query, index=None, fuzzy=False):
         """
         Szuka słów po frazie (word, translation, definition).
         Case-insensitive.
+        index: opcjonalny SearchIndex zbudowany dla tej samej listy słów.
+        fuzzy: toleruje literówki i brak polskich znaków ("golebie" -> "gołębie"),
+               wyniki posortowane po odległości edycyjnej.
         """
+        if index is not None and index.words is not words:
+            # Indeks innego decku - nie wolno z niego zwracać wyników
+            index = None
+        if index is not None:
+            index.update()
+        elif fuzzy:
+            index = SearchIndex(words)
+        
+        if fuzzy:
+            return index.fuzzy_search(query)
+        if index is not None:
+            return index.search(query)
+        
         query_lower = query.lower()
         results = []
         
@@ -30,6 +48,11 @@ class SearchFilter:
         Filtruje słowa po poziomie trudności.
         Zwraca słowa z error_rate >= min_error_rate (domyślnie >40% błędów).
         """
+        if hasattr(words, 'filter_by_difficulty'):
+            # ColumnarDeck - maska na kolumnach; te same obiekty słów, bez kopii
+            # (error_rate i accuracy jako kolumny decku)
+            return words.filter_by_difficulty(min_error_rate)
+        
         difficult = []
         
         for word in words:
@@ -63,6 +86,10 @@ class SearchFilter:
         - 'known': correct_count > 3
         - 'difficult': wrong_count > correct_count
         """
+        if hasattr(words, 'filter_by_status'):
+            # Deck z bazy SQLite - zapytanie SQL zamiast skanowania słów
+            return words.filter_by_status(status)
+        
         filtered = []
         
         for word in words:
@@ -124,3 +151,56 @@ class SearchFilter:
             'difficult': difficult,
             'attempts': total_attempts,
         }
+
+
+class SearchSession:
+    """
+    Stan wyszukiwania dla okna szukania (wpisywanie znak po znaku).
+    Zapamiętuje trafienia ostatniego zapytania: gdy nowe zapytanie zawiera
+    poprzednie, wynik jest podzbiorem poprzedniego i wystarczy go zawęzić.
+    Po skasowaniu znaków (lub w trybie fuzzy) wraca do indeksu.
+    Koszt klawisza jest proporcjonalny do liczby bieżących trafień.
+    """
+    
+    def __init__(self, words, index=None):
+        self.words = words
+        self.index = index if index is not None and index.words is words else SearchIndex(words)
+        self.reset()
+    
+    def reset(self):
+        self.last_query = None
+        self.last_positions = None
+        self.size = len(self.words)
+    
+    def search_positions(self, query):
+        """Pozycje trafień dla zapytania (zawężenie poprzednich lub zapytanie do indeksu)."""
+        self.index.update()
+        if len(self.words) != self.size:
+            self.reset()
+        
+        normalized = self.index.normalize(query)
+        if self.last_query and self.last_query in normalized:
+            positions = [p for p in self.last_positions if self.index.matches(p, normalized)]
+        else:
+            positions = self.index.search_positions(query)
+        
+        self.last_query = normalized
+        self.last_positions = positions
+        return positions
+    
+    def search(self, query, status=None, fuzzy=False):
+        """
+        Wyszukuje frazę i opcjonalnie filtruje po statusie (jak filter_by_status).
+        Puste zapytanie zwraca całą listę słów (ten sam obiekt).
+        """
+        if not query:
+            results = self.words
+        elif fuzzy:
+            self.last_query = None
+            results = self.index.fuzzy_search(query)
+        else:
+            results = [self.words[p] for p in self.search_positions(query)]
+        
+        if status:
+            results = SearchFilter.filter_by_status(results, status)
+        return results
@@ -0,0 +1,248 @@
+"""
+Fiszki Search Index
+Indeks wyszukiwania budowany raz na deck: odwrócony indeks tokenów
+i indeks n-gramów tokenów zamiast skanowania wszystkich słów przy każdym klawiszu
+"""
+
+import re
+import unicodedata
+
+
+TOKEN_RE = re.compile(r'\w+')
+SEARCH_FIELDS = ('word', 'translation', 'definition')
+GRAM_SIZE = 3
+
+# Litery, których NFKD nie rozkłada na literę bazową + znak diakrytyczny
+FOLD_TABLE = str.maketrans({'ł': 'l', 'ø': 'o', 'đ': 'd', 'ß': 'ss', 'æ': 'ae', 'œ': 'oe'})
+
+
+def token_grams(token):
+    """Wszystkie podciągi tokenu o długości 1..GRAM_SIZE."""
+    return {token[i:i + n] for n in range(1, GRAM_SIZE + 1) for i in range(len(token) - n + 1)}
+
+
+def fold_text(text):
+    """Małe litery bez polskich znaków i innych diakrytyków: 'Gołębie' -> 'golebie'."""
+    text = text.lower().translate(FOLD_TABLE)
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def prefix_trigrams(token):
+    """Trigramy tokenu z dopełnieniem na początku (pasują też do początku dłuższych słów)."""
+    padded = '  ' + token
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(query, token, limit):
+    """
+    Odległość Levenshteina zapytania od najbliższego prefiksu tokenu
+    (pisane słowo może być niedokończone) oraz od całego tokenu.
+    Zwraca None, gdy odległość od prefiksu przekracza limit.
+    """
+    previous = list(range(len(token) + 1))
+    for i, qc in enumerate(query, 1):
+        current = [i]
+        for j, tc in enumerate(token, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1,
+                               previous[j - 1] + (qc != tc)))
+        if min(current) > limit:
+            return None
+        previous = current
+    best = min(previous)
+    if best > limit:
+        return None
+    return best, previous[-1]
+
+
+def max_typos(fragment):
+    """Dopuszczalna liczba literówek zależnie od długości fragmentu."""
+    if len(fragment) <= 2:
+        return 0
+    if len(fragment) <= 5:
+        return 1
+    return 2
+
+
+class SearchIndex:
+    """
+    Indeks dla SearchFilter.search (ta sama semantyka: podciąg w word,
+    translation lub definition, bez wielkości liter).
+
+    - postings: token -> pozycje słów, w których występuje
+    - grams: n-gram (1-3 znaki) -> tokeny, które go zawierają
+    Fraza zapytania musi leżeć w całości w tekście, więc najdłuższy token
+    zapytania jest podciągiem jakiegoś tokenu pola. Kandydaci to słowa z takimi
+    tokenami; na końcu sprawdzamy dokładne dopasowanie na zapamiętanych,
+    już zmniejszonych polach.
+    """
+
+    def __init__(self, words, normalize=None):
+        self.words = words
+        self.normalize = normalize or str.lower
+        self.size = len(words)
+        self.fields = []
+        self.postings = {}
+        self.grams = {}
+        self.folded = None  # Indeks bez diakrytyków dla trybu fuzzy (leniwie)
+        self.trigrams = None  # Trigramy tokenów do wyboru kandydatów fuzzy (leniwie)
+
+        for position, word in enumerate(words):
+            self._add(position, word)
+
+    def _add(self, position, word):
+        fields = tuple(self.normalize(str(word.get(field, '') or '')) for field in SEARCH_FIELDS)
+        self.fields.append(fields)
+        for text in fields:
+            for token in TOKEN_RE.findall(text):
+                positions = self.postings.get(token)
+                if positions is None:
+                    positions = self.postings[token] = set()
+                    for gram in token_grams(token):
+                        self.grams.setdefault(gram, set()).add(token)
+                    if self.trigrams is not None:
+                        self._add_trigrams(token)
+                positions.add(position)
+
+    def update(self):
+        """
+        Leniwa aktualizacja po zmianie listy słów: dopisane na końcu słowa
+        są dokładane, skrócona lista powoduje przebudowę.
+        """
+        if len(self.words) < self.size:
+            self.__init__(self.words, self.normalize)
+            return
+        for position in range(self.size, len(self.words)):
+            self._add(position, self.words[position])
+        self.size = len(self.words)
+        if self.folded is not None:
+            self.folded.update()
+
+    def matching_tokens(self, fragment):
+        """Tokeny indeksu zawierające podany fragment (bez spacji)."""
+        if len(fragment) <= GRAM_SIZE:
+            return self.grams.get(fragment, set())
+
+        candidates = None
+        for i in range(len(fragment) - GRAM_SIZE + 1):
+            tokens = self.grams.get(fragment[i:i + GRAM_SIZE])
+            if not tokens:
+                return set()
+            candidates = set(tokens) if candidates is None else candidates & tokens
+        return {token for token in candidates if fragment in token}
+
+    def token_positions(self, fragment):
+        """Pozycje słów, których jakiś token zawiera fragment."""
+        positions = set()
+        for token in self.matching_tokens(fragment):
+            positions |= self.postings[token]
+        return positions
+
+    def candidates(self, query_lower):
+        """
+        Pozycje słów, które mogą zawierać zapytanie (None = trzeba przejrzeć wszystko).
+        Każdy token zapytania musi być w tym samym słowie, więc zbiory są przecinane,
+        zaczynając od najdłuższego (najrzadszego) tokenu.
+        """
+        tokens = sorted(set(TOKEN_RE.findall(query_lower)), key=len, reverse=True)
+        if not tokens or len(tokens[0]) < 2:
+            # Pojedyncza litera pasuje do prawie wszystkiego - szybszy jest skan pól
+            return None
+
+        positions = None
+        for fragment in tokens:
+            if len(fragment) < 2:
+                break
+            found = self.token_positions(fragment)
+            positions = found if positions is None else positions & found
+            if not positions:
+                break
+        return positions
+
+    def matches(self, position, query_lower):
+        word, translation, definition = self.fields[position]
+        return query_lower in word or query_lower in translation or query_lower in definition
+
+    def search_positions(self, query):
+        """Pozycje słów zawierających frazę, w kolejności decku."""
+        query_lower = self.normalize(query)
+        candidates = self.candidates(query_lower)
+        if candidates is None:
+            candidates = range(self.size)
+        else:
+            candidates = sorted(candidates)
+        return [p for p in candidates if self.matches(p, query_lower)]
+
+    def search(self, query):
+        """Słowa zawierające frazę, w kolejności decku."""
+        return [self.words[p] for p in self.search_positions(query)]
+
+    def _add_trigrams(self, token):
+        for gram in prefix_trigrams(token):
+            self.trigrams.setdefault(gram, set()).add(token)
+
+    def similar_tokens(self, fragment):
+        """
+        Tokeny podobne do fragmentu: {token: (odległość, odległość całego tokenu)}.
+        Odległość liczona tylko dla krótkiej listy tokenów mających dość
+        wspólnych trigramów (każda literówka psuje najwyżej 3 trigramy).
+        """
+        if self.trigrams is None:
+            self.trigrams = {}
+            for token in self.postings:
+                self._add_trigrams(token)
+
+        limit = max_typos(fragment)
+        grams = prefix_trigrams(fragment)
+        shared = {}
+        for gram in grams:
+            for token in self.trigrams.get(gram, ()):
+                shared[token] = shared.get(token, 0) + 1
+        needed = max(1, len(grams) - 3 * limit)
+
+        similar = {}
+        for token, count in shared.items():
+            if count >= needed:
+                distance = edit_distance(fragment, token, limit)
+                if distance is not None:
+                    similar[token] = distance
+        return similar
+
+    def fuzzy_positions(self, query):
+        """
+        Wyszukiwanie odporne na literówki i brak polskich znaków.
+        Zwraca [(pozycja, odległość)]: najpierw dokładne trafienia (0)
+        w kolejności decku, potem przybliżone od najbliższych.
+        """
+        if self.folded is None:
+            self.folded = SearchIndex(self.words, fold_text)
+        folded = self.folded
+
+        exact = folded.search_positions(query)
+        tokens = TOKEN_RE.findall(fold_text(query))
+        if not tokens:
+            return [(p, 0) for p in exact]
+
+        # Każdy token zapytania musi mieć podobny token w tym samym słowie
+        scores = None
+        for fragment in tokens:
+            best = {}
+            for token, distance in folded.similar_tokens(fragment).items():
+                for position in folded.postings[token]:
+                    if position not in best or distance < best[position]:
+                        best[position] = distance
+            if scores is None:
+                scores = best
+            else:
+                scores = {p: (scores[p][0] + d[0], scores[p][1] + d[1])
+                          for p, d in best.items() if p in scores}
+            if not scores:
+                break
+
+        seen = set(exact)
+        approximate = sorted((distance, p) for p, distance in (scores or {}).items() if p not in seen)
+        return [(p, 0) for p in exact] + [(p, distance[0]) for distance, p in approximate]
+
+    def fuzzy_search(self, query):
+        """Słowa dopasowane w trybie fuzzy, od najlepszego dopasowania."""
+        return [self.words[p] for p, _ in self.fuzzy_positions(query)]
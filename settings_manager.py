@@ -21,6 +21,7 @@ class SettingsManager:
         'theme': 'light',  # light, dark
         'font_size': 12,
         'card_flip_animation': True,
+        'storage_backend': 'json',  # json, sqlite
     }
     
     def __init__(self):
@@ -1,22 +1,66 @@
 """
 Spaced Repetition Pro - SM-2 Algorithm (adapted for minutes)
 Algorytm powtórek rozproszonego
+next_review przechowywany jako epoch (sekundy, int)
 """
 
-from datetime import datetime, timedelta
+import heapq
+import itertools
+import time
+from datetime import datetime
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 
 class SpacedRepetitionManager:
     """Zarządza powtórkami rozproszonymi na bazie SM-2."""
     
+    DEFAULT_EASE = 2.5
+    MIN_EASE = 1.3
+    FIRST_INTERVAL = 1  # Minuty
+    SECOND_INTERVAL = 3  # Minuty
+    
+    @staticmethod
+    def to_epoch(value):
+        """
+        Zamienia next_review (epoch lub stary zapis ISO) na epoch w sekundach.
+        Nieczytelna wartość - karta do powtórki od razu (bez przerywania wczytywania).
+        """
+        if value is None:
+            return None
+        if isinstance(value, (int, float)):
+            return int(value)
+        try:
+            return int(datetime.fromisoformat(value).timestamp())
+        except (TypeError, ValueError) as e:
+            print(f"Bledna data next_review {value!r}: {e}")
+            return int(time.time())
+    
+    @staticmethod
+    def migrate_word(word):
+        """
+        Jednorazowa migracja: ISO next_review -> epoch.
+        Zwraca True jeśli słowo zostało zmienione.
+        """
+        if isinstance(word.get('next_review'), str):
+            word['next_review'] = SpacedRepetitionManager.to_epoch(word['next_review'])
+            return True
+        return False
+    
     @staticmethod
     def init_word(word):
         """Inicjalizuje słowo dla SR (SM-2)."""
         if 'sr_ease' not in word:
-            word['sr_ease'] = 2.5  # Default SM-2 ease factor
-            word['sr_interval'] = 1  # Minutes
+            word['sr_ease'] = SpacedRepetitionManager.DEFAULT_EASE
+            word['sr_interval'] = SpacedRepetitionManager.FIRST_INTERVAL
             word['sr_repetitions'] = 0
-            word['next_review'] = datetime.now().isoformat()
+            word['next_review'] = int(time.time())
+        else:
+            SpacedRepetitionManager.migrate_word(word)
         return word
     
     @staticmethod
@@ -39,19 +83,19 @@ class SpacedRepetitionManager:
         
         # SM-2 formula
         new_ease = ease + (0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
-        new_ease = max(1.3, new_ease)  # Min ease
+        new_ease = max(SpacedRepetitionManager.MIN_EASE, new_ease)
         
         if quality < 3:
             # Wrong answer
             new_reps = 0
-            new_interval = 1  # Back to 1 minute
+            new_interval = SpacedRepetitionManager.FIRST_INTERVAL
         else:
             # Correct answer
             new_reps = reps + 1
             if new_reps == 1:
-                new_interval = 1  # 1 minute
+                new_interval = SpacedRepetitionManager.FIRST_INTERVAL
             elif new_reps == 2:
-                new_interval = 3  # 3 minutes
+                new_interval = SpacedRepetitionManager.SECOND_INTERVAL
             else:
                 new_interval = int(interval * new_ease)
         
@@ -59,34 +103,35 @@ class SpacedRepetitionManager:
         word['sr_ease'] = new_ease
         word['sr_interval'] = new_interval
         word['sr_repetitions'] = new_reps
-        word['next_review'] = (datetime.now() + timedelta(minutes=new_interval)).isoformat()
+        word['next_review'] = int(time.time()) + new_interval * 60
         
         return word
     
     @staticmethod
     def get_due_words(words):
         """Zwraca słowa do powtórzenia (due now lub w przeszłości)."""
-        now = datetime.now()
+        if hasattr(words, 'get_due_words'):
+            # Deck z bazy SQLite - zapytanie po indeksie next_review
+            return words.get_due_words()
+        
+        now = time.time()
         due = []
         
         for word in words:
             SpacedRepetitionManager.init_word(word)
             
-            next_review = datetime.fromisoformat(word['next_review'])
-            if next_review <= now:
+            if word['next_review'] <= now:
                 due.append(word)
         
         return due
     
     @staticmethod
-    def get_review_status(word):
+    def get_review_status(word, now=None):
         """Zwraca status powtórki słowa: 'due_now', 'today', 'later'."""
         SpacedRepetitionManager.init_word(word)
         
-        now = datetime.now()
-        next_review = datetime.fromisoformat(word['next_review'])
-        
-        diff_minutes = (next_review - now).total_seconds() / 60
+        now = time.time() if now is None else now
+        diff_minutes = (word['next_review'] - now) / 60
         
         if diff_minutes <= 0:
             return 'due_now'
@@ -119,7 +164,7 @@ class SpacedRepetitionManager:
     @staticmethod
     def get_stats(words):
         """Zwraca statystyki SR."""
-        now = datetime.now()
+        now = time.time()
         
         due_now = 0
         soon = 0
@@ -131,7 +176,7 @@ class SpacedRepetitionManager:
             if word.get('sr_repetitions', 0) == 0:
                 not_started += 1
             else:
-                status = SpacedRepetitionManager.get_review_status(word)
+                status = SpacedRepetitionManager.get_review_status(word, now)
                 if status == 'due_now':
                     due_now += 1
                 elif status == 'soon':
@@ -149,3 +194,236 @@ class SpacedRepetitionManager:
             'not_started': not_started,
             'total': len(words),
         }
+
+
+class DueScheduler:
+    """
+    Kolejka powtórek: kopiec (min-heap) kluczowany liczbowym next_review (epoch).
+    pop_due / reschedule działają w O(log n) zamiast skanowania wszystkich słów.
+    """
+    
+    def __init__(self, words):
+        self.heap = []
+        self.entries = {}  # id(word) -> aktualny wpis [epoch, seq, word]
+        self.pool = {id(word) for word in words}
+        self.counter = itertools.count()
+        
+        for word in words:
+            epoch = self.review_epoch(word)
+            if epoch is not None:
+                entry = [epoch, next(self.counter), word]
+                self.entries[id(word)] = entry
+                self.heap.append(entry)
+        heapq.heapify(self.heap)
+    
+    @staticmethod
+    def review_epoch(word):
+        """Zwraca next_review jako epoch (None dla słów jeszcze nie zaczętych)."""
+        return SpacedRepetitionManager.to_epoch(word.get('next_review'))
+    
+    def __len__(self):
+        return len(self.entries)
+    
+    def __contains__(self, word):
+        return id(word) in self.entries
+    
+    def _discard_stale(self):
+        """Usuwa z wierzchołka kopca wpisy zastąpione przez reschedule."""
+        while self.heap:
+            entry = self.heap[0]
+            if self.entries.get(id(entry[2])) is entry:
+                return entry
+            heapq.heappop(self.heap)
+        return None
+    
+    def reschedule(self, word):
+        """Ustawia słowo w kolejce wg jego aktualnego next_review (O(log n))."""
+        if id(word) not in self.pool:
+            return
+        epoch = self.review_epoch(word)
+        if epoch is None:
+            self.entries.pop(id(word), None)
+            return
+        entry = [epoch, next(self.counter), word]
+        self.entries[id(word)] = entry
+        heapq.heappush(self.heap, entry)
+    
+    def peek_next_due(self):
+        """Zwraca (epoch, słowo) najbliższej powtórki bez zdejmowania (lub None)."""
+        entry = self._discard_stale()
+        if entry is None:
+            return None
+        return entry[0], entry[2]
+    
+    def pop_due(self, now=None):
+        """Zdejmuje najpilniejsze słowo, jeśli jego termin już minął (lub None)."""
+        now = time.time() if now is None else now
+        entry = self._discard_stale()
+        if entry is None or entry[0] > now:
+            return None
+        heapq.heappop(self.heap)
+        del self.entries[id(entry[2])]
+        return entry[2]
+    
+    def due_words(self, now=None):
+        """
+        Zwraca słowa do powtórki bez zdejmowania ich z kolejki.
+        Przechodzi tylko po węzłach kopca z epoch <= now: O(k log k).
+        """
+        now = time.time() if now is None else now
+        due = []
+        frontier = [(self.heap[0][0], 0)] if self.heap else []
+        while frontier:
+            epoch, i = heapq.heappop(frontier)
+            if epoch > now:
+                break
+            entry = self.heap[i]
+            if self.entries.get(id(entry[2])) is entry:
+                due.append(entry[2])
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(self.heap):
+                    heapq.heappush(frontier, (self.heap[child][0], child))
+        return due
+
+
+class BatchSpacedRepetition:
+    """
+    Kolumnowy tryb SM-2: ease, interval, repetitions i next_review całego decku
+    w równoległych tablicach NumPy. Operacje przyjmują tablice indeksów
+    i liczą harmonogram wszystkich słów naraz zamiast pętli po słownikach.
+    Wymaga numpy (pip install numpy).
+    Kroki nauki i minimalny ease można nadpisać (np. w symulacji innych ustawień),
+    domyślnie są takie jak w SpacedRepetitionManager.
+    """
+    
+    STATUSES = ('due_now', 'soon', 'today', 'later')
+    
+    def __init__(self, words, now=None, first_interval=None, second_interval=None, min_ease=None):
+        if not HAS_NUMPY:
+            raise ImportError("numpy not installed. pip install numpy")
+        
+        SR = SpacedRepetitionManager
+        self.first_interval = SR.FIRST_INTERVAL if first_interval is None else first_interval
+        self.second_interval = SR.SECOND_INTERVAL if second_interval is None else second_interval
+        self.min_ease = SR.MIN_EASE if min_ease is None else min_ease
+        
+        now = int(time.time()) if now is None else int(now)
+        self.words = words
+        n = len(words)
+        
+        self.ease = np.full(n, SpacedRepetitionManager.DEFAULT_EASE, dtype=np.float64)
+        self.interval = np.full(n, self.first_interval, dtype=np.int64)
+        self.repetitions = np.zeros(n, dtype=np.int64)
+        self.next_review = np.full(n, now, dtype=np.int64)
+        self.dirty = np.zeros(n, dtype=bool)
+        
+        for i, word in enumerate(words):
+            # Jak init_word: bez sr_ease słowo jest nowe i do powtórki od razu
+            if 'sr_ease' in word:
+                self.load_word(i, word, now)
+    
+    def load_word(self, i, word, now=None):
+        """Przepisuje pola SR słowa do wiersza i (np. po odpowiedzi w zwykłym trybie)."""
+        now = int(time.time()) if now is None else int(now)
+        if 'sr_ease' not in word:
+            self.ease[i] = SpacedRepetitionManager.DEFAULT_EASE
+            self.interval[i] = self.first_interval
+            self.repetitions[i] = 0
+            self.next_review[i] = now
+            return
+        self.ease[i] = word['sr_ease']
+        self.interval[i] = word.get('sr_interval', self.first_interval)
+        self.repetitions[i] = word.get('sr_repetitions', 0)
+        epoch = SpacedRepetitionManager.to_epoch(word.get('next_review'))
+        self.next_review[i] = now if epoch is None else epoch
+    
+    def __len__(self):
+        return len(self.ease)
+    
+    def _indices(self, indices):
+        if indices is None:
+            return np.arange(len(self))
+        return np.asarray(indices, dtype=np.intp)
+    
+    def update_sr(self, indices, qualities, now=None):
+        """
+        Wsadowy odpowiednik SpacedRepetitionManager.update_sr.
+        qualities: jedna ocena 0-5 lub tablica ocen równoległa do indices.
+        Indeksy powinny być unikalne (przy powtórzeniach liczy się ostatni).
+        """
+        idx = self._indices(indices)
+        quality = np.broadcast_to(np.asarray(qualities, dtype=np.float64), idx.shape)
+        now = int(time.time()) if now is None else int(now)
+        
+        penalty = 5 - quality
+        new_ease = self.ease[idx] + (0.1 - penalty * (0.08 + penalty * 0.02))
+        new_ease = np.maximum(self.min_ease, new_ease)
+        
+        correct = quality >= 3
+        new_reps = np.where(correct, self.repetitions[idx] + 1, 0)
+        grown = np.floor(self.interval[idx] * new_ease).astype(np.int64)
+        new_interval = np.select(
+            [~correct, new_reps == 1, new_reps == 2],
+            [self.first_interval, self.first_interval, self.second_interval],
+            grown,
+        )
+        
+        self.ease[idx] = new_ease
+        self.interval[idx] = new_interval
+        self.repetitions[idx] = new_reps
+        self.next_review[idx] = now + new_interval * 60
+        self.dirty[idx] = True
+    
+    def due_indices(self, now=None):
+        """Indeksy słów do powtórzenia (next_review <= now)."""
+        now = time.time() if now is None else now
+        return np.flatnonzero(self.next_review <= now)
+    
+    def get_due_words(self, now=None):
+        """Wsadowy odpowiednik SpacedRepetitionManager.get_due_words."""
+        return [self.words[i] for i in self.due_indices(now)]
+    
+    def status_codes(self, now=None, indices=None):
+        """Kod statusu dla każdego słowa: indeks w STATUSES."""
+        now = time.time() if now is None else now
+        diff = self.next_review[self._indices(indices)] - now
+        return np.select([diff <= 0, diff <= 60 * 60, diff <= 24 * 60 * 60], [0, 1, 2], 3)
+    
+    def get_stats(self, now=None, indices=None):
+        """Wsadowy odpowiednik SpacedRepetitionManager.get_stats."""
+        idx = self._indices(indices)
+        started = self.repetitions[idx] > 0
+        counts = np.bincount(self.status_codes(now, idx)[started], minlength=len(self.STATUSES))
+        
+        stats = {status: int(count) for status, count in zip(self.STATUSES, counts)}
+        stats['not_started'] = int(len(idx) - started.sum())
+        stats['total'] = int(len(idx))
+        return stats
+    
+    def forecast(self, days, now=None, indices=None):
+        """
+        Prognoza obciążenia: liczba rozpoczętych słów z next_review w kolejnych dniach.
+        Zaległe powtórki wpadają do dnia 0, terminy po horyzoncie są pomijane.
+        """
+        now = time.time() if now is None else now
+        idx = self._indices(indices)
+        idx = idx[self.repetitions[idx] > 0]
+        day = np.maximum(self.next_review[idx] - now, 0) // (24 * 60 * 60)
+        day = day[day < days].astype(np.intp)
+        return np.bincount(day, minlength=days)
+    
+    def write_back(self, indices=None):
+        """
+        Zapisuje stan z tablic do słowników słów.
+        Domyślnie tylko słowa zmienione przez update_sr.
+        Zwraca liczbę zapisanych słów.
+        """
+        idx = np.flatnonzero(self.dirty) if indices is None else self._indices(indices)
+        for i in idx:
+            word = self.words[i]
+            word['sr_ease'] = float(self.ease[i])
+            word['sr_interval'] = int(self.interval[i])
+            word['sr_repetitions'] = int(self.repetitions[i])
+            word['next_review'] = int(self.next_review[i])
+        self.dirty[idx] = False
+        return len(idx)
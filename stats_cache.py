@@ -0,0 +1,93 @@
+"""
+Fiszki Stats Cache
+Liczniki statystyk per unit aktualizowane przyrostowo po każdej odpowiedzi
+"""
+
+
+COUNTERS = ('total', 'correct', 'wrong', 'untouched', 'difficult', 'known')
+
+
+def word_counters(word):
+    """Wkład jednego słowa w liczniki unitu (kolejność jak COUNTERS)."""
+    correct = word.get('correct_count', 0)
+    wrong = word.get('wrong_count', 0)
+    return (
+        1,
+        correct,
+        wrong,
+        1 if correct + wrong == 0 else 0,
+        1 if wrong > correct else 0,
+        1 if correct > 3 else 0,
+    )
+
+
+class UnitStatsCache:
+    """
+    Agregaty per unit: liczba słów, poprawne, błędne, nowe, trudne, znane.
+    Budowa O(n) raz na deck; refresh(word) po odpowiedzi działa w O(1),
+    a odczyt dla wybranych unitów w O(liczba unitów) zamiast skanowania słów.
+    """
+
+    def __init__(self, words):
+        self.words = words
+        self.units = {}
+        self.contributions = {}  # id(word) -> (unit, wkład)
+        for word in words:
+            unit = word.get('unit', 'Unknown')
+            counters = word_counters(word)
+            self.contributions[id(word)] = (unit, counters)
+            self._add(unit, counters, 1)
+
+    def _add(self, unit, counters, sign):
+        totals = self.units.setdefault(unit, [0] * len(COUNTERS))
+        for i, value in enumerate(counters):
+            totals[i] += sign * value
+
+    def refresh(self, word):
+        """Przelicza wkład słowa po zmianie jego liczników (słowa spoza decku są pomijane)."""
+        previous = self.contributions.get(id(word))
+        if previous is None:
+            return
+        unit, old = previous
+        new = word_counters(word)
+        if new != old:
+            self._add(unit, old, -1)
+            self._add(unit, new, 1)
+            self.contributions[id(word)] = (unit, new)
+
+    def totals(self, units=None):
+        """Sumuje liczniki wybranych unitów (None = cały deck)."""
+        result = dict.fromkeys(COUNTERS, 0)
+        selected = self.units if units is None else units
+        for unit in selected:
+            values = self.units.get(unit)
+            if values:
+                for name, value in zip(COUNTERS, values):
+                    result[name] += value
+        return result
+
+    def get_statistics(self, units=None):
+        """Statystyki w formacie SearchFilter.get_statistics."""
+        totals = self.totals(units)
+        attempts = totals['correct'] + totals['wrong']
+        return {
+            'total': totals['total'],
+            'accuracy': (totals['correct'] / attempts * 100) if attempts > 0 else 0,
+            'untouched': totals['untouched'],
+            'difficult': totals['difficult'],
+            'attempts': attempts,
+        }
+
+    def recompute(self):
+        """Pełne przeliczenie liczników ze słów (bez cache)."""
+        units = {}
+        for word in self.words:
+            totals = units.setdefault(word.get('unit', 'Unknown'), [0] * len(COUNTERS))
+            for i, value in enumerate(word_counters(word)):
+                totals[i] += value
+        return units
+
+    def verify(self):
+        """Czy liczniki przyrostowe zgadzają się z pełnym przeliczeniem."""
+        cached = {unit: values for unit, values in self.units.items() if values[0]}
+        return cached == self.recompute()
@@ -0,0 +1,131 @@
+"""
+Testy zadań w tle (debounce, odrzucanie nieaktualnych wyników)
+"""
+
+import json
+import threading
+import time
+
+from background_tasks import BackgroundWorker, read_json_file
+
+
+class FakeRoot:
+    """Minimalny zamiennik root.after / after_cancel bez wyświetlacza."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.counter = 0
+
+    def after(self, ms, callback):
+        self.counter += 1
+        self.jobs[self.counter] = callback
+        return self.counter
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_pending(self, timeout=2.0):
+        """Wykonuje zaplanowane callbacki aż do opróżnienia kolejki."""
+        deadline = time.time() + timeout
+        while self.jobs and time.time() < deadline:
+            job = min(self.jobs)
+            self.jobs.pop(job)()
+            time.sleep(0.001)
+
+
+def test_burst_of_submits_runs_only_last_task():
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    calls, shown = [], []
+
+    for query in ['g', 'ga', 'gat']:
+        worker.submit(lambda task, q=query: calls.append(q) or q.upper(), shown.append)
+    root.run_pending()
+
+    assert calls == ['gat']
+    assert shown == ['GAT']
+    worker.close()
+
+
+def test_result_of_stale_task_is_dropped():
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    started, release = threading.Event(), threading.Event()
+    shown, seen_cancel = [], []
+
+    def slow(task):
+        started.set()
+        release.wait(1)
+        seen_cancel.append(task.cancelled())
+        return 'slow'
+
+    worker.submit(slow, shown.append)
+    root.jobs.pop(min(root.jobs))()  # dispatch, wątek zaczyna liczyć
+    started.wait(1)
+    worker.submit(lambda task: 'fast', shown.append)
+    release.set()
+    root.run_pending()
+
+    assert shown == ['fast']
+    assert seen_cancel == [True]
+    worker.close()
+
+
+def test_errors_go_to_error_callback_and_close_stops_thread():
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    errors = []
+
+    worker.submit(lambda task: 1 / 0, lambda result: None, on_error=errors.append)
+    root.run_pending()
+    assert isinstance(errors[0], ZeroDivisionError)
+
+    worker.close()
+    worker.thread.join(1)
+    assert not worker.thread.is_alive()
+    worker.submit(lambda task: 'ignored', errors.append)
+    assert not root.jobs
+
+
+def test_progress_reports_reach_tk_thread_in_order():
+    root = FakeRoot()
+    worker = BackgroundWorker(root, delay_ms=0)
+    progress, shown = [], []
+
+    def load(task):
+        for step in range(3):
+            task.report(step / 2, f"krok {step}")
+        return 'deck'
+
+    worker.submit(load, shown.append, on_progress=lambda f, m: progress.append((f, m)))
+    root.run_pending()
+
+    assert progress == [(0.0, 'krok 0'), (0.5, 'krok 1'), (1.0, 'krok 2')]
+    assert shown == ['deck']
+    worker.close()
+
+
+class FakeTask:
+    def __init__(self, cancel_after=None):
+        self.reports = []
+        self.cancel_after = cancel_after
+
+    def cancelled(self):
+        return self.cancel_after is not None and len(self.reports) >= self.cancel_after
+
+    def report(self, fraction, message=''):
+        self.reports.append(fraction)
+
+
+def test_read_json_file_reports_progress_and_can_be_cancelled(tmp_path, monkeypatch):
+    monkeypatch.setattr('background_tasks.READ_CHUNK', 1024)
+    words = [{'word': f"słowo{i}", 'unit': '1a'} for i in range(500)]
+    path = tmp_path / 'deck.json'
+    path.write_text(json.dumps(words, ensure_ascii=False), encoding='utf-8')
+
+    task = FakeTask()
+    assert read_json_file(str(path), task, share=0.8) == words
+    assert len(task.reports) > 5
+    assert task.reports == sorted(task.reports) and task.reports[-1] == 0.8
+
+    assert read_json_file(str(path), FakeTask(cancel_after=2)) is None
@@ -0,0 +1,96 @@
+"""
+Testy manifestu przyrostowego parsowania (co przebudować po zmianie PDF-a, parsera lub JSON-a)
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip('fitz')
+
+from parsers.build_manifest import BuildManifest, output_path_for
+
+
+@pytest.fixture
+def series(tmp_path):
+    pdf_dir = tmp_path / 'data' / 'series' / 'pdf'
+    json_dir = tmp_path / 'data' / 'series' / 'json'
+    pdf_dir.mkdir(parents=True)
+    json_dir.mkdir(parents=True)
+    pdfs = []
+    for name in ('a', 'b'):
+        pdf = pdf_dir / f'{name}.pdf'
+        pdf.write_bytes(f'%PDF {name}'.encode())
+        pdfs.append(str(pdf))
+    return tmp_path, pdfs
+
+
+def build(manifest, pdfs, version='v1'):
+    for pdf in manifest.stale(pdfs, version):
+        output = output_path_for(pdf)
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write('[]')
+        manifest.record(pdf, output, version, 'test')
+    manifest.save()
+
+
+def make_manifest(root):
+    return BuildManifest(path=str(root / 'manifest.json'), root=str(root))
+
+
+def test_output_path_follows_series_layout(tmp_path):
+    pdf = tmp_path / 'data' / 'english_file' / 'pdf' / 'EF 3.pdf'
+    assert output_path_for(str(pdf)) == str(
+        tmp_path / 'data' / 'english_file' / 'json' / 'EF 3_parsed.json')
+
+
+def test_unchanged_inputs_are_skipped_after_reload(series):
+    root, pdfs = series
+    build(make_manifest(root), pdfs)
+    manifest = make_manifest(root)
+    assert manifest.stale(pdfs, 'v1') == []
+    assert manifest.stale(pdfs, 'v1', force=True) == pdfs
+
+
+def test_changed_pdf_content_rebuilds_only_that_pdf(series):
+    root, pdfs = series
+    manifest = make_manifest(root)
+    build(manifest, pdfs)
+    with open(pdfs[1], 'ab') as f:
+        f.write(b' edited')
+    assert manifest.stale(pdfs, 'v1') == [pdfs[1]]
+
+
+def test_touched_but_identical_pdf_stays_fresh(series):
+    root, pdfs = series
+    manifest = make_manifest(root)
+    build(manifest, pdfs)
+    stat = os.stat(pdfs[0])
+    os.utime(pdfs[0], (stat.st_atime, stat.st_mtime + 100))
+    assert manifest.stale(pdfs, 'v1') == []
+
+
+def test_new_parser_version_rebuilds_everything(series):
+    root, pdfs = series
+    manifest = make_manifest(root)
+    build(manifest, pdfs)
+    assert manifest.stale(pdfs, 'v2') == pdfs
+
+
+def test_missing_or_edited_output_is_rebuilt(series):
+    root, pdfs = series
+    manifest = make_manifest(root)
+    build(manifest, pdfs)
+    os.remove(output_path_for(pdfs[0]))
+    with open(output_path_for(pdfs[1]), 'w', encoding='utf-8') as f:
+        f.write('[{"word": "hand edit"}]')
+    assert manifest.stale(pdfs, 'v1') == pdfs
+
+
+def test_pdf_without_output_stays_stale(series):
+    root, pdfs = series
+    manifest = make_manifest(root)
+    build(manifest, pdfs)
+    # Wpis starszej wersji manifestu dla PDF-a, z którego nic nie sparsowano
+    manifest.entries[manifest.key(pdfs[0])]['output'] = None
+    assert manifest.stale(pdfs, 'v1') == [pdfs[0]]
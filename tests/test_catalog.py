@@ -0,0 +1,63 @@
+"""
+Testy katalogu biblioteki (manifest data/ odświeżany po mtime)
+"""
+
+import json
+import os
+import time
+
+from catalog_manager import LibraryCatalog
+
+
+def write_deck(path, words):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(words), encoding="utf-8")
+
+
+def make_library(tmp_path):
+    data = tmp_path / "data"
+    write_deck(data / "new_enterprise" / "json" / "a1_parsed.json",
+               [{"word": "gate", "unit": "1a"}, {"word": "open", "unit": "1b"}, {"word": "wide", "unit": "1a"}])
+    write_deck(data / "career_paths" / "Nursing" / "json" / "nursing_parsed.json",
+               [{"word": "ward", "unit": "1"}])
+    write_deck(data / "career_paths" / ".template" / "json" / "x.json", [{"word": "x"}])
+    (data / "english_file" / "json").mkdir(parents=True)
+    return data
+
+
+def test_catalog_lists_series_categories_and_counts(tmp_path):
+    data = make_library(tmp_path)
+    catalog = LibraryCatalog(str(data), str(tmp_path / "catalog.json"))
+
+    assert catalog.refresh() == 2
+    assert catalog.series() == [("career_paths", 1), ("new_enterprise", 3)]
+    entry = catalog.entries("new_enterprise")[0]
+    assert entry["units"] == ["1a", "1b"]
+    assert entry["path"] == os.path.join(str(data), "new_enterprise/json/a1_parsed.json")
+    assert [(cat, len(files)) for cat, files in catalog.categories()] == [("Nursing", 1)]
+
+
+def test_catalog_refresh_is_incremental_and_persisted(tmp_path, monkeypatch):
+    data = make_library(tmp_path)
+    catalog_path = str(tmp_path / "catalog.json")
+    LibraryCatalog(str(data), catalog_path).refresh()
+
+    # Nowa instancja czyta manifest i niczego nie listuje ani nie wczytuje
+    listed = []
+    original = os.listdir
+    monkeypatch.setattr(os, "listdir", lambda path: listed.append(path) or original(path))
+    catalog = LibraryCatalog(str(data), catalog_path)
+    assert catalog.refresh() == 0
+    assert listed == []
+
+    time.sleep(0.01)
+    deck = data / "new_enterprise" / "json" / "a1_parsed.json"
+    write_deck(deck, [{"word": "gate", "unit": "2a"}])
+    write_deck(data / "new_enterprise" / "json" / "b1_parsed.json", [{"word": "x", "unit": "1"}])
+    old_hash = catalog.entries("new_enterprise")[0]["hash"]
+
+    assert catalog.refresh() == 2
+    first, second = catalog.entries("new_enterprise")
+    assert first["units"] == ["2a"] and first["hash"] != old_hash
+    assert second["file"] == "b1_parsed.json"
+    assert len(listed) == 1  # tylko katalog json, w którym przybył plik
@@ -0,0 +1,231 @@
+"""
+Testy struktur decku używanych w pętli nauki
+"""
+
+import random
+import time
+from collections import Counter
+
+import pytest
+
+from card_sampler import WeightedSampler, card_weight
+from decks_manager import DecksManager
+from search_filter import SearchFilter
+from stats_cache import UnitStatsCache
+from unit_index import UnitIndex, natural_sort_key
+
+
+def test_card_weight_matches_error_rate():
+    assert card_weight({}) == 1
+    assert card_weight({'correct_count': 4, 'wrong_count': 0}) == 1
+    assert card_weight({'correct_count': 1, 'wrong_count': 1}) == 2.5
+    assert card_weight({'correct_count': 0, 'wrong_count': 2}) == 4
+
+
+def test_sampler_follows_weights():
+    words = [{'word': str(i), 'weight': i + 1} for i in range(4)]
+    sampler = WeightedSampler(words, lambda w: w['weight'])
+    rng = random.Random(7)
+
+    counts = Counter(sampler.sample(rng)['word'] for _ in range(20000))
+    for i in range(4):
+        assert abs(counts[str(i)] / 20000 - (i + 1) / 10) < 0.02
+
+
+def test_refresh_updates_single_weight():
+    words = [{'word': 'a', 'correct_count': 0, 'wrong_count': 0},
+             {'word': 'b', 'correct_count': 0, 'wrong_count': 0}]
+    sampler = WeightedSampler(words)
+    assert sampler.total == 2
+
+    words[1]['wrong_count'] = 1
+    sampler.refresh(words[1])
+    assert sampler.total == 5
+    assert sampler.weights == [1.0, 4.0]
+    assert sampler.find(0.99) == 0
+    assert sampler.find(1.0) == 1
+
+    # Słowo spoza puli (np. quick review) jest ignorowane
+    sampler.refresh({'word': 'c', 'wrong_count': 9})
+    assert sampler.total == 5
+
+
+def test_tree_prefix_sums_after_updates():
+    rng = random.Random(3)
+    words = [{'w': rng.randint(1, 5)} for _ in range(37)]
+    sampler = WeightedSampler(words, lambda w: w['w'])
+    for _ in range(100):
+        i = rng.randrange(len(words))
+        words[i]['w'] = rng.randint(1, 5)
+        sampler.refresh(words[i])
+
+    cumulative = 0
+    for i, w in enumerate(words):
+        assert sampler.find(cumulative) == i
+        cumulative += w['w']
+    assert sampler.total == cumulative
+
+
+def test_empty_sampler():
+    assert WeightedSampler([]).sample() is None
+
+
+def test_stats_cache_stays_consistent_with_answers():
+    rng = random.Random(3)
+    words = [{'word': f"w{i}", 'unit': f"{i % 4 + 1}a"} for i in range(200)]
+    cache = UnitStatsCache(words)
+
+    for _ in range(1000):
+        word = rng.choice(words)
+        key = 'correct_count' if rng.random() < 0.6 else 'wrong_count'
+        word[key] = word.get(key, 0) + 1
+        cache.refresh(word)
+
+    assert cache.verify()
+    selected = ['1a', '3a']
+    unit_words = [w for w in words if w['unit'] in selected]
+    totals = cache.totals(selected)
+    assert totals['total'] == len(unit_words)
+    assert totals['correct'] == sum(w.get('correct_count', 0) for w in unit_words)
+    assert totals['wrong'] == sum(w.get('wrong_count', 0) for w in unit_words)
+    assert cache.get_statistics(selected) == SearchFilter.get_statistics(unit_words)
+
+
+def test_stats_cache_verify_detects_unrefreshed_change():
+    words = [{'word': 'a', 'unit': '1a'}, {'word': 'b', 'unit': '1a'}]
+    cache = UnitStatsCache(words)
+    assert cache.totals(['1a'])['untouched'] == 2
+
+    words[0]['wrong_count'] = 1
+    assert not cache.verify()
+    cache.refresh(words[0])
+    assert cache.verify()
+    assert cache.totals()['difficult'] == 1
+    cache.refresh({'word': 'spoza decku'})
+    assert cache.totals()['total'] == 2
+
+
+def test_unit_index_counts_and_natural_order():
+    words = [{'word': f"w{i}", 'unit': unit} for i, unit in enumerate(['10a', '2b', '2a', '10a', '1', '2a'])]
+    words.append({'word': 'bez unitu'})
+    index = UnitIndex(words)
+
+    assert index.units == ['1', '2a', '2b', '10a', 'Unknown']
+    assert index.counts() == [('1', 1), ('2a', 2), ('2b', 1), ('10a', 2), ('Unknown', 1)]
+    assert sorted(['File 10', 'File 2', 'File 1'], key=natural_sort_key) == ['File 1', 'File 2', 'File 10']
+
+
+def test_unit_index_selects_words_in_deck_order():
+    words = [{'word': f"w{i}", 'unit': f"{i % 5}a"} for i in range(50)]
+    index = UnitIndex(words)
+    selected = ['3a', '0a', '3a']
+
+    assert index.words_in(selected) == [w for w in words if w['unit'] in selected]
+    assert index.words_in(['9z']) == []
+
+
+def make_columnar_words(size=300, seed=5):
+    rng = random.Random(seed)
+    return [
+        {
+            'word': f"w{i}",
+            'unit': f"File {i % 7}",
+            'part_of_speech': rng.choice(['n', 'v', 'adj', 'N', '']),
+            'correct_count': rng.randint(0, 6),
+            'wrong_count': rng.randint(0, 6),
+        }
+        for i in range(size)
+    ]
+
+
+def test_columnar_deck_filters_match_plain_lists():
+    pytest.importorskip('numpy')
+    from columnar_deck import ColumnarDeck
+
+    words = make_columnar_words()
+    deck = ColumnarDeck(words)
+
+    for status in ('untouched', 'learning', 'known', 'difficult', 'other'):
+        assert SearchFilter.filter_by_status(deck, status) == SearchFilter.filter_by_status(words, status)
+    assert DecksManager.filter_by_category(deck, 'n') == DecksManager.filter_by_category(words, 'n')
+    assert deck.in_units({'File 2', 'File 5'}) == [w for w in words if w['unit'] in ('File 2', 'File 5')]
+
+    for min_rate in (0.0, 0.4, 0.75):
+        plain = SearchFilter.filter_by_difficulty(words, min_rate)
+        columnar = SearchFilter.filter_by_difficulty(deck, min_rate)
+        assert [w['word'] for w in columnar] == [w['word'] for w in plain]
+        assert all(w is words[int(w['word'][1:])] for w in columnar)  # te same obiekty, bez kopii
+        # Pola error_rate/accuracy kopii ze ścieżki słownikowej - tu kolumny decku
+        assert list(columnar.error_rates()) == [w['error_rate'] for w in plain]
+        assert list(columnar.accuracies()) == pytest.approx([w['accuracy'] for w in plain])
+
+    plain = DecksManager.create_difficult_deck(words)
+    columnar = DecksManager.create_difficult_deck(deck)
+    assert [w['word'] for w in columnar] == [w['word'] for w in plain]
+    assert list(columnar.error_rates()) == [w['error_rate'] for w in plain]
+
+    expected = DecksManager.get_deck_stats(plain)
+    stats = DecksManager.get_deck_stats(columnar)
+    assert stats['total'] == expected['total'] and stats['attempts'] == expected['attempts']
+    assert stats['accuracy'] == pytest.approx(expected['accuracy'])
+    assert stats['avg_error_rate'] == pytest.approx(expected['avg_error_rate'])
+
+
+def test_columnar_deck_refresh_after_answer():
+    pytest.importorskip('numpy')
+    from columnar_deck import ColumnarDeck
+
+    words = [{'word': 'a', 'unit': '1'}, {'word': 'b', 'unit': '1'}]
+    deck = ColumnarDeck(words)
+    assert SearchFilter.filter_by_status(deck, 'untouched') == words
+
+    words[0]['wrong_count'] = 2
+    deck.refresh(words[0])
+    deck.refresh({'word': 'spoza decku'})
+
+    assert SearchFilter.filter_by_status(deck, 'difficult') == [words[0]]
+    difficult = DecksManager.create_difficult_deck(deck)
+    assert list(difficult) == [words[0]] and difficult[0] is words[0]
+    words[0]['correct_count'] = 5
+    difficult.refresh(words[0])
+    assert DecksManager.get_deck_stats(difficult)['attempts'] == 7
+
+
+def test_deck_stats_same_for_plain_and_columnar_decks():
+    pytest.importorskip('numpy')
+    from columnar_deck import ColumnarDeck
+
+    words = make_columnar_words(size=120, seed=11)
+    decks = [
+        (words, ColumnarDeck(words)),
+        (DecksManager.create_difficult_deck(words), DecksManager.create_difficult_deck(ColumnarDeck(words))),
+        (SearchFilter.filter_by_status(words, 'untouched'), ColumnarDeck(SearchFilter.filter_by_status(words, 'untouched'))),
+    ]
+    for plain, columnar in decks:
+        expected = DecksManager.get_deck_stats(plain)
+        stats = DecksManager.get_deck_stats(columnar)
+        assert stats.keys() == expected.keys()
+        assert stats['total'] == expected['total'] and stats['attempts'] == expected['attempts']
+        assert stats['accuracy'] == pytest.approx(expected['accuracy'])
+        assert stats['avg_error_rate'] == pytest.approx(expected['avg_error_rate'])
+    assert DecksManager.get_deck_stats(words)['avg_error_rate'] > 0
+
+
+def test_columnar_deck_refresh_updates_sr_row_in_place():
+    pytest.importorskip('numpy')
+    from columnar_deck import ColumnarDeck
+    from spaced_repetition import SpacedRepetitionManager
+
+    now = time.time() + 60
+    words = [{'word': 'a', 'unit': '1'}, {'word': 'b', 'unit': '1'}]
+    deck = ColumnarDeck(words)
+    sr = deck.sr
+    assert deck.get_due_words(now) == words
+
+    SpacedRepetitionManager.init_word(words[0])
+    words[0]['sr_ease'] = 2.5
+    words[0]['next_review'] = now + 3600
+    deck.refresh(words[0])
+
+    assert deck.sr is sr  # bez przebudowy kolumn SR całego decku
+    assert deck.get_due_words(now) == [words[1]]
@@ -0,0 +1,194 @@
+"""
+Testy wspólnej ekstrakcji tekstu z PDF (kolejność wyników, podział na zakresy stron)
+"""
+
+import os
+import zlib
+
+import pytest
+
+fitz = pytest.importorskip('fitz')
+
+from parsers import extraction
+from parsers.extraction import (ExtractionCache, Lookahead, extract_pages_many, extract_text,
+                                extract_text_many, format_pages, iter_lines, iter_pages,
+                                iter_pages_many, make_pool, plan_tasks)
+
+
+def make_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+@pytest.fixture
+def pdfs(tmp_path):
+    return [
+        make_pdf(tmp_path / 'long.pdf', [f"long page {n}" for n in range(1, 8)]),
+        make_pdf(tmp_path / 'short.pdf', ["short page 1"]),
+        make_pdf(tmp_path / 'mid.pdf', ["mid page 1", "mid page 2", "mid page 3"]),
+    ]
+
+
+def test_plan_tasks_splits_large_pdfs_in_page_order():
+    assert plan_tasks([5, None, 2], pages_per_task=2) == [
+        (0, 0, 2), (0, 2, 4), (0, 4, 5), (2, 0, 2),
+    ]
+
+
+def test_pool_output_matches_serial_extraction(pdfs):
+    serial = [extract_text(path) for path in pdfs]
+
+    parallel = extract_text_many(pdfs, workers=3, pages_per_task=2)
+
+    assert parallel == serial
+    assert serial[0].startswith("__PAGE_1__\nlong page 1")
+    assert "__PAGE_7__\nlong page 7" in serial[0]
+
+
+def test_unreadable_pdf_gives_empty_result_without_stopping_others(pdfs, tmp_path):
+    broken = tmp_path / 'broken.pdf'
+    broken.write_bytes(b'not a pdf')
+    paths = [pdfs[1], str(broken), str(tmp_path / 'missing.pdf'), pdfs[2]]
+
+    pages = extract_pages_many(paths, workers=2, pages_per_task=1)
+
+    assert [len(p) for p in pages] == [1, 0, 0, 3]
+    assert pages[3][1].strip() == "mid page 2"
+
+
+def test_cache_hit_skips_pdf_extraction(pdfs, tmp_path, monkeypatch):
+    cache = ExtractionCache(str(tmp_path / 'cache'))
+    first = extract_text_many(pdfs, workers=1, cache=cache)
+
+    def fail(*args):
+        raise AssertionError("PDF otwarty mimo trafienia w cache")
+
+    monkeypatch.setattr(extraction, 'page_count', fail)
+    monkeypatch.setattr(extraction, 'extract_page_range', fail)
+
+    assert extract_text_many(pdfs, workers=1, cache=cache) == first
+    assert extract_text(pdfs[2], cache) == first[2]
+
+
+def test_cache_key_follows_content_and_extractor_version(pdfs, tmp_path):
+    cache = ExtractionCache(str(tmp_path / 'cache'))
+    copy = tmp_path / 'renamed copy.pdf'
+    copy.write_bytes(open(pdfs[1], 'rb').read())
+
+    assert cache.key(str(copy)) == cache.key(pdfs[1])
+    assert cache.key(pdfs[1]) != cache.key(pdfs[2])
+    assert ExtractionCache(cache.cache_dir, version='other').key(pdfs[1]) != cache.key(pdfs[1])
+
+
+def test_corrupted_cache_entry_is_re_extracted(pdfs, tmp_path):
+    cache = ExtractionCache(str(tmp_path / 'cache'))
+    expected = extract_pages_many(pdfs[:1], workers=1, cache=cache)
+    key = cache.key(pdfs[0])
+    with open(cache.path(key), 'wb') as f:
+        f.write(b'garbage')
+
+    assert cache.get(key) is None
+    assert extract_pages_many(pdfs[:1], workers=1, cache=cache) == expected
+    assert cache.get(key) == expected[0]
+
+
+def test_partly_corrupted_cache_entry_is_replaced(pdfs, tmp_path):
+    cache = ExtractionCache(str(tmp_path / 'cache'))
+    expected = list(extraction.iter_pdf_pages(pdfs[0]))
+    key = cache.key(pdfs[0])
+    os.makedirs(cache.cache_dir)
+    # Dwie poprawne strony, potem wiersz, który nie jest tekstem strony
+    with open(cache.path(key), 'wb') as f:
+        f.write(zlib.compress(b'"cached 1"\n"cached 2"\n123\n'))
+    lines = []
+
+    pages = list(iter_pages(pdfs[0], cache, log=lines.append))
+
+    assert pages == ["cached 1", "cached 2"] + expected[2:]
+    assert len(lines) == 1 and lines[0].startswith("ERROR reading extraction cache")
+    assert cache.get(key) == expected
+    assert list(iter_pages(pdfs[0], cache)) == expected
+
+
+def test_errors_go_to_log_callback(pdfs, tmp_path, capsys):
+    cache = ExtractionCache(str(tmp_path / 'cache'))
+    key = cache.key(pdfs[1])
+    cache.put(key, ["short page 1"])
+    with open(cache.path(key), 'wb') as f:
+        f.write(b'garbage')
+    lines = []
+
+    pages = extract_pages_many([pdfs[1], str(tmp_path / 'missing.pdf')], workers=1,
+                               cache=cache, log=lines.append)
+
+    assert [len(p) for p in pages] == [1, 0]
+    assert [line.split(' for ')[0].split(' from ')[0] for line in lines] == [
+        "ERROR reading extraction cache", "ERROR extracting text"]
+    assert capsys.readouterr().out == ""
+
+
+def test_batch_text_extraction_reports_errors_to_log(pdfs, tmp_path, capsys):
+    broken = tmp_path / 'broken.pdf'
+    broken.write_bytes(b'not a pdf')
+    for workers in (1, 2):
+        lines = []
+        texts = extract_text_many([pdfs[0], str(broken), pdfs[2]], workers=workers,
+                                  pages_per_task=2, log=lines.append)
+        assert texts[1] == "" and texts[2].startswith("__PAGE_1__")
+        assert len(lines) == 1 and lines[0].startswith(f"ERROR extracting text from {broken}")
+    assert capsys.readouterr().out == ""
+
+
+def test_shared_pool_is_reused_and_left_open(pdfs):
+    serial = [list(extraction.iter_pdf_pages(path)) for path in pdfs]
+    with make_pool(2) as pool:
+        first = [list(pages) for _, pages in
+                 iter_pages_many(pdfs, workers=2, pages_per_task=2, pool=pool)]
+        # Porzucony strumień nie blokuje puli dla kolejnych
+        streams = iter_pages_many(pdfs, workers=2, pages_per_task=2, pool=pool)
+        next(next(streams)[1])
+        streams.close()
+        second = [list(pages) for _, pages in
+                  iter_pages_many(pdfs, workers=2, pages_per_task=2, pool=pool)]
+    assert first == second == serial
+
+
+def test_iter_lines_matches_split_of_whole_text():
+    pages = ["a\nb\n", "", "c"]
+    assert list(iter_lines(pages)) == format_pages(pages).split('\n')
+    assert list(iter_lines([])) == format_pages([]).split('\n')
+
+
+def test_lookahead_peeks_without_consuming():
+    items = Lookahead(iter([1, 2]))
+    assert items.peek() == 1
+    assert next(items) == 1
+    assert items.peek() == 2 and items.peek() == 2
+    assert list(items) == [2]
+    assert items.peek('end') == 'end'
+
+
+def test_page_streams_come_in_input_order(pdfs):
+    streams = iter_pages_many(pdfs, workers=2, pages_per_task=2)
+    path, pages = next(streams)
+    # Pierwsza strona jest dostępna przed odebraniem reszty PDF-ów
+    assert path == pdfs[0] and next(pages).strip() == "long page 1"
+    rest = [(path, list(pages)) for path, pages in streams]
+    assert [path for path, _ in rest] == pdfs[1:]
+    assert rest[1][1][2].strip() == "mid page 3"
+
+
+def test_unfinished_stream_leaves_no_cache_entry(pdfs, tmp_path):
+    cache = ExtractionCache(str(tmp_path / 'cache'))
+    pages = iter_pages(pdfs[0], cache)
+    next(pages)
+    pages.close()
+
+    assert cache.get(cache.key(pdfs[0])) is None
+    assert list(iter_pages(pdfs[0], cache)) == cache.get(cache.key(pdfs[0]))
+    assert len(cache.get(cache.key(pdfs[0]))) == 7
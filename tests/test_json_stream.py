@@ -0,0 +1,43 @@
+"""
+Testy zapisu listy JSON element po elemencie
+"""
+
+import json
+
+import pytest
+
+from parsers.json_stream import write_json_array
+
+
+ENTRIES = [
+    {"word": "zażółć", "definition": "line\nbreak", "page": 1},
+    {"word": "b", "tags": ["x", {"y": None}], "page": 2},
+]
+
+
+@pytest.mark.parametrize('entries', [ENTRIES, ENTRIES[:1], []])
+def test_output_matches_json_dump(tmp_path, entries):
+    path = str(tmp_path / 'out.json')
+    assert write_json_array(path, iter(entries)) == len(entries)
+    with open(path, encoding='utf-8') as f:
+        assert f.read() == json.dumps(entries, ensure_ascii=False, indent=2)
+
+
+def test_failed_stream_keeps_previous_file(tmp_path):
+    path = tmp_path / 'out.json'
+    path.write_text('["old"]', encoding='utf-8')
+
+    def entries():
+        yield ENTRIES[0]
+        raise RuntimeError("PDF ucięty")
+
+    with pytest.raises(RuntimeError):
+        write_json_array(str(path), entries())
+    assert path.read_text(encoding='utf-8') == '["old"]'
+    assert [p.name for p in tmp_path.iterdir()] == ['out.json']
+
+
+def test_empty_stream_without_keep_empty_writes_nothing(tmp_path):
+    path = tmp_path / 'out.json'
+    assert write_json_array(str(path), iter([]), keep_empty=False) == 0
+    assert not path.exists()
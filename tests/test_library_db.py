@@ -0,0 +1,271 @@
+"""
+Testy backendu SQLite (LibraryDatabase)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import types
+from datetime import datetime, timedelta
+
+import pytest
+
+import library_db
+from decks_manager import DecksManager
+from library_db import DatabaseProgressStore, DatabaseWord, LibraryDatabase
+from progress_manager import ProgressStore
+from search_filter import SearchFilter
+from spaced_repetition import SpacedRepetitionManager
+
+
+WORDS = [
+    {"word": "gate", "part_of_speech": "n", "unit": "1a", "correct_count": 5, "wrong_count": 0},
+    {"word": "open", "part_of_speech": "V", "unit": "1a", "correct_count": 0, "wrong_count": 0},
+    {"word": "fence", "part_of_speech": "n", "unit": "1b", "correct_count": 1, "wrong_count": 3},
+    {"word": "wide", "part_of_speech": "adj", "unit": "2a", "correct_count": 0, "wrong_count": 0},
+]
+
+
+def write_deck(data_dir, series, name, words, category=None):
+    parts = [series, category, "json"] if category else [series, "json"]
+    json_dir = data_dir.joinpath(*parts)
+    json_dir.mkdir(parents=True, exist_ok=True)
+    path = json_dir / name
+    path.write_text(json.dumps(words), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_dir = tmp_path / "data"
+    path = write_deck(data_dir, "new_enterprise", "a1_parsed.json", WORDS)
+    db = LibraryDatabase(str(tmp_path / "library.db"))
+    yield db, data_dir, path
+    db.close()
+
+
+def test_wal_mode_enabled(library):
+    db, _, _ = library
+    assert db.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_indexed_queries_match_python_scans(library):
+    db, _, path = library
+    deck = db.load_deck(path, "new_enterprise")
+
+    assert [w["word"] for w in deck] == ["gate", "open", "fence", "wide"]
+    assert sorted(deck.unit_counts()) == [("1a", 2), ("1b", 1), ("2a", 1)]
+    assert deck.in_units(["1a", "2a"]) == [deck[0], deck[1], deck[3]]
+
+    plain = [dict(w) for w in deck]
+    assert DecksManager.filter_by_category(deck, "v") == DecksManager.filter_by_category(plain, "v")
+    for status in ("untouched", "learning", "known", "difficult"):
+        assert SearchFilter.filter_by_status(deck, status) == SearchFilter.filter_by_status(plain, status)
+
+    # Zwracane są te same obiekty co w decku (odpowiedzi modyfikują słowa w miejscu)
+    assert DecksManager.filter_by_category(deck, "adj")[0] is deck[3]
+
+
+def test_due_words_use_next_review(library):
+    db, _, path = library
+    deck = db.load_deck(path, "new_enterprise")
+    store = DatabaseProgressStore(db, path)
+
+    now = int(time.time())
+    deck[0]["next_review"] = now + 30 * 60
+    deck[2]["next_review"] = now - 60
+    store.record(deck[0])
+    store.record(deck[2])
+
+    due = SpacedRepetitionManager.get_due_words(deck)
+    assert [w["word"] for w in due] == ["open", "fence", "wide"]
+
+
+def test_progress_survives_content_reimport(library):
+    db, data_dir, path = library
+    deck = db.load_deck(path, "new_enterprise")
+    deck[1]["correct_count"] = 2
+    DatabaseProgressStore(db, path).record(deck[1])
+
+    # Re-parse: nowa kolejność i zerowe liczniki
+    reparsed = [dict(w, correct_count=0, wrong_count=0) for w in reversed(WORDS)]
+    write_deck(data_dir, "new_enterprise", "a1_parsed.json", reparsed)
+    os.utime(path, (0, 12345))
+
+    deck = db.load_deck(path, "new_enterprise")
+    by_word = {w["word"]: w for w in deck}
+    assert by_word["open"]["correct_count"] == 2
+    assert by_word["gate"]["correct_count"] == 5  # Zmigrowane przy pierwszym imporcie
+
+
+def test_deck_rows_decoded_only_when_needed(library, monkeypatch):
+    db, _, path = library
+    decoded = []
+    decode = DatabaseWord._decode
+    monkeypatch.setattr(DatabaseWord, '_decode', lambda word: (decoded.append(word), decode(word)))
+    deck = db.load_deck(path, "new_enterprise")
+
+    # Liczniki i unity (losowanie, statystyki) bez dekodowania wierszy
+    assert [w["unit"] for w in deck] == ["1a", "1a", "1b", "2a"]
+    assert sum(w["correct_count"] + w.get("wrong_count", 0) for w in deck) == 9
+    assert "sr_ease" not in deck[0]
+    assert decoded == []
+
+    deck[2]["correct_count"] = 7
+    assert deck[2]["word"] == "fence"
+    assert decoded == [deck[2]]
+    assert dict(deck[2]) == dict(WORDS[2], correct_count=7)
+    assert [dict(w) for w in deck] == [dict(WORDS[0]), dict(WORDS[1]), dict(WORDS[2], correct_count=7),
+                                       dict(WORDS[3])]
+
+
+def test_lazy_decode_is_thread_safe(library, monkeypatch):
+    db, _, path = library
+    word = db.load_deck(path, "new_enterprise")[1]
+    seen, errors, answers = [], [], []
+
+    def answer():
+        # Wątek Tk: odpowiedź i odczyt słowa, które właśnie dekoduje wątek wyszukiwania
+        try:
+            word["correct_count"] = word["correct_count"] + 1
+            seen.append(word["word"])
+        except Exception as e:
+            errors.append(e)
+
+    def slow_loads(text):
+        thread = threading.Thread(target=answer)
+        thread.start()
+        answers.append(thread)
+        thread.join(0.05)
+        return json.loads(text)
+
+    monkeypatch.setattr(library_db, 'json', types.SimpleNamespace(loads=slow_loads, dumps=json.dumps))
+    search = threading.Thread(target=lambda: seen.append(word["word"]))
+    search.start()
+    search.join()
+    for thread in answers:
+        thread.join()
+
+    assert errors == []
+    assert seen == ["open", "open"]
+    assert word["correct_count"] == 1  # Odpowiedź nie zginęła przy podmianie rekordu
+    assert dict(word) == dict(WORDS[1], correct_count=1)
+
+
+def test_progress_synced_between_json_store_and_database(library):
+    db, _, path = library
+    store = ProgressStore(path)
+    # Nauka z backendem json przed pierwszym otwarciem w bazie
+    store.write({"1a|open": {"correct_count": 3, "wrong_count": 1}})
+
+    deck = db.load_deck(path, "new_enterprise")
+    assert [w["correct_count"] for w in deck] == [0, 3, 0, 0]
+
+    # Backend sqlite: odpowiedź w bazie, przy zapisie postępu trafia do magazynu JSON
+    progress = DatabaseProgressStore(db, path)
+    deck[3]["correct_count"] = 1
+    progress.record(deck[3])
+    progress.flush()
+    assert store.load() == {"1a|open": {"correct_count": 3, "wrong_count": 1},
+                            "2a|wide": {"correct_count": 1, "wrong_count": 0}}
+
+    # Znów backend json: magazyn zmieniony poza bazą zastępuje postęp w bazie
+    time.sleep(0.01)
+    store.write({"2a|wide": {"correct_count": 2, "wrong_count": 0}})
+    deck = db.load_deck(path, "new_enterprise")
+    assert [w["correct_count"] for w in deck] == [0, 0, 0, 2]
+    # Niezmieniony magazyn nie nadpisuje postępu z bazy
+    DatabaseProgressStore(db, path).record(dict(deck[0], correct_count=9))
+    assert db.load_deck(path, "new_enterprise")[0]["correct_count"] == 9
+
+
+def test_database_progress_kept_for_databases_without_sync_state(library):
+    db, _, path = library
+    ProgressStore(path).write({"1a|gate": {"correct_count": 1, "wrong_count": 0}})
+    db.load_deck(path, "new_enterprise")
+    DatabaseProgressStore(db, path).record(dict(WORDS[0], correct_count=6))
+    # Baza sprzed synchronizacji magazynów: postęp w bazie jest nowszy
+    db.conn.execute("DELETE FROM progress_sync")
+    time.sleep(0.01)
+    ProgressStore(path).write({"1a|gate": {"correct_count": 1, "wrong_count": 0}})
+
+    assert db.load_deck(path, "new_enterprise")[0]["correct_count"] == 6
+
+
+def test_sync_library_is_incremental(library):
+    db, data_dir, _ = library
+    write_deck(data_dir, "career_paths", "cp_parsed.json", WORDS[:2], category="Medical")
+
+    assert db.sync_library(str(data_dir)) == 2
+    assert db.sync_library(str(data_dir)) == 0
+
+    categories = [row[0] for row in db.conn.execute("SELECT category FROM files ORDER BY category")]
+    assert categories == ["", "Medical"]
+
+
+def test_iso_next_review_column_migrated(tmp_path):
+    db_path = str(tmp_path / "old.db")
+    review = datetime.now() - timedelta(minutes=5)
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "CREATE TABLE progress (deck TEXT NOT NULL, word_key TEXT NOT NULL, "
+        "correct_count INTEGER NOT NULL DEFAULT 0, wrong_count INTEGER NOT NULL DEFAULT 0, "
+        "sr_ease REAL, sr_interval INTEGER, sr_repetitions INTEGER, next_review TEXT, "
+        "PRIMARY KEY (deck, word_key))"
+    )
+    conn.execute("INSERT INTO progress VALUES ('d', '1a|gate', 1, 0, 2.5, 1, 1, ?)", (review.isoformat(),))
+    conn.commit()
+    conn.close()
+
+    db = LibraryDatabase(db_path)
+    assert db.load_progress("d")["1a|gate"]["next_review"] == int(review.timestamp())
+    column_types = {row[1]: row[2] for row in db.conn.execute("PRAGMA table_info(progress)")}
+    assert column_types["next_review"] == "INTEGER"
+    db.close()
+
+
+def test_library_search_covers_all_files_and_follows_reimports(library):
+    db, data_dir, path = library
+    career = write_deck(data_dir, "career_paths", "nursing_parsed.json",
+                        [{"word": "Gateway", "translation": "Brama", "unit": "3"},
+                         {"word": "łóżko", "translation": "bed", "unit": "4"}],
+                        category="Nursing")
+    db.sync_library(str(data_dir))
+
+    hits = db.search_library("GATE")
+    assert [(h["series"], h["category"], h["unit"], h["word"]) for h in hits] == [
+        ("career_paths", "Nursing", "3", "Gateway"),
+        ("new_enterprise", "", "1a", "gate"),
+    ]
+    assert hits[0]["path"] == os.path.abspath(career)
+    # Krótkie frazy (bez trigramów) i polskie wielkie litery
+    assert [h["word"] for h in db.search_library("ŁÓ")] == ["łóżko"]
+    assert [h["word"] for h in db.search_library("wid")] == ["wide"]
+    assert [h["word"] for h in db.search_library("ga", status="untouched")] == ["Gateway"]
+    assert db.search_library("1%") == []
+
+    # Zmieniony plik jest przeindeksowany, usunięty znika z wyników
+    time.sleep(0.01)
+    write_deck(data_dir, "new_enterprise", "a1_parsed.json", [{"word": "gatehouse", "unit": "1a"}])
+    os.remove(career)
+    db.sync_library(str(data_dir))
+    assert [h["word"] for h in db.search_library("gate")] == ["gatehouse"]
+    assert db.search_library("brama") == []
+
+
+def test_search_index_built_for_existing_database(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    path = write_deck(tmp_path / "data", "new_enterprise", "a1_parsed.json", WORDS)
+    db = LibraryDatabase(str(tmp_path / "library.db"))
+    db.sync_file(path, "new_enterprise")
+    # Baza sprzed indeksu wyszukiwania
+    db.conn.executescript("DROP TABLE word_search; DROP TRIGGER words_search_insert; "
+                          "DROP TRIGGER words_search_delete;")
+    db.close()
+
+    db = LibraryDatabase(str(tmp_path / "library.db"))
+    assert [h["word"] for h in db.search_library("fence")] == ["fence"]
+    db.close()
@@ -0,0 +1,81 @@
+"""
+Testy uruchamiania serii w master_parser (parsery jako pluginy w bieżącym procesie)
+"""
+
+import threading
+import types
+
+import pytest
+
+pytest.importorskip('fitz')
+
+from parsers import master_parser
+
+
+SERIES = {"key": "demo", "name": "Demo", "parser": "/tmp/demo_parser.py"}
+
+
+def test_run_series_returns_plugin_summary_with_timing(monkeypatch):
+    calls = []
+
+    def run_full_auto(manifest, force, cache, log, pool):
+        calls.append((manifest, force, cache, pool))
+        log("parsing")
+        return {"pdfs": 2, "parsed": 1, "skipped": 1, "words": 10, "errors": 0}
+
+    monkeypatch.setattr(master_parser, 'load_parser',
+                        lambda series: types.SimpleNamespace(run_full_auto=run_full_auto))
+    lines = []
+    summary = master_parser.run_series(SERIES, "manifest", force=True, log=lines.append,
+                                       pool="pool")
+
+    assert calls == [("manifest", True, None, "pool")]
+    assert lines == ["parsing"]
+    assert summary["success"] and summary["words"] == 10
+    assert summary["series"] == "Demo" and summary["seconds"] >= 0
+
+
+def test_run_series_reports_plugin_failure(monkeypatch):
+    def load_parser(series):
+        raise ImportError("no parser")
+
+    monkeypatch.setattr(master_parser, 'load_parser', load_parser)
+    lines = []
+    summary = master_parser.run_series(SERIES, None, log=lines.append)
+    assert summary["success"] is False
+    assert lines == ["BLAD: no parser"]
+
+
+def test_series_logger_prefixes_every_line(capsys):
+    log = master_parser.series_logger(SERIES, threading.Lock())
+    log("PDF: a.pdf\n   OK\n")
+    assert capsys.readouterr().out == "[demo] PDF: a.pdf\n[demo]    OK\n\n"
+
+
+def test_every_series_parser_has_plugin_entry_point():
+    for name in ('new_enterprise_parser', 'english_file_parser', 'career_paths_parser'):
+        module = master_parser.load_parser({"parser": f"{name}.py"})
+        assert callable(module.run_full_auto)
+
+
+def test_pdf_without_entries_stays_stale(tmp_path, monkeypatch):
+    from build_manifest import BuildManifest, parser_version
+    parser = master_parser.load_parser({"parser": "english_file_parser.py"})
+    pdf_dir, json_dir = tmp_path / "english_file" / "pdf", tmp_path / "english_file" / "json"
+    pdf_dir.mkdir(parents=True)
+    json_dir.mkdir()
+    doc = pytest.importorskip('fitz').open()
+    doc.new_page()  # Strona bez tekstu - parser nie znajdzie żadnego wpisu
+    doc.save(str(pdf_dir / "empty.pdf"))
+    doc.close()
+    old_output = json_dir / "empty_parsed.json"
+    old_output.write_text('[{"word": "old"}]', encoding='utf-8')
+    monkeypatch.setattr(parser, 'get_data_dirs', lambda: (str(pdf_dir), str(json_dir)))
+    manifest = BuildManifest(str(tmp_path / "manifest.json"), str(tmp_path))
+
+    lines = []
+    summary = parser.run_full_auto(manifest=manifest, log=lines.append, pool=None)
+
+    assert summary["errors"] == 1 and summary["words"] == 0
+    assert manifest.stale([str(pdf_dir / "empty.pdf")], parser_version(parser.__file__))
+    assert old_output.read_text(encoding='utf-8') == '[{"word": "old"}]'
@@ -0,0 +1,181 @@
+"""
+Testy zapisu postępu nauki (magazyn postępu i dziennik odpowiedzi)
+"""
+
+import json
+import os
+
+from journal_manager import AnswerJournal
+from progress_manager import ProgressStore, word_id
+from spaced_repetition import SpacedRepetitionManager
+
+
+def make_deck(tmp_path, words=None):
+    deck_dir = tmp_path / "data" / "english_file" / "json"
+    deck_dir.mkdir(parents=True)
+    deck_path = deck_dir / "Test wordlist_parsed.json"
+    if words is None:
+        words = [
+            {"word": "absent-minded", "unit": "File 1", "correct_count": 0, "wrong_count": 0},
+            {"word": "reliable", "unit": "File 1", "correct_count": 0, "wrong_count": 0},
+            {"word": "reliable", "unit": "File 2", "correct_count": 0, "wrong_count": 0},
+        ]
+    deck_path.write_text(json.dumps(words), encoding="utf-8")
+    return str(deck_path)
+
+
+def load_deck(deck_path):
+    with open(deck_path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def open_deck(tmp_path, deck_path):
+    """Wczytuje deck tak jak FlashcardApp.load_json."""
+    words = load_deck(deck_path)
+    store = ProgressStore(deck_path, progress_dir=str(tmp_path / "progress"))
+    store.apply(words)
+    journal = AnswerJournal(deck_path, store, journal_dir=str(tmp_path / "journal"))
+    if journal.replay(words):
+        journal.compact()
+    return words, store, journal
+
+
+def answer(journal, word, correct):
+    key = 'correct_count' if correct else 'wrong_count'
+    word[key] = word.get(key, 0) + 1
+    SpacedRepetitionManager.update_sr(word, 4 if correct else 2)
+    journal.append(word, correct)
+
+
+def test_word_id_distinguishes_units():
+    assert word_id({"word": "Reliable", "unit": "File 1"}) == word_id({"word": "reliable ", "unit": "File 1"})
+    assert word_id({"word": "reliable", "unit": "File 1"}) != word_id({"word": "reliable", "unit": "File 2"})
+
+
+def test_homonyms_in_one_unit_share_progress(tmp_path):
+    deck_path = make_deck(tmp_path, [
+        {"word": "light", "unit": "1a", "part_of_speech": "n", "definition": "brightness"},
+        {"word": "Light", "unit": "1a", "part_of_speech": "adj", "definition": "not heavy"},
+        {"word": "light", "unit": "1b", "part_of_speech": "n", "definition": "brightness"},
+    ])
+    words, _, journal = open_deck(tmp_path, deck_path)
+    assert word_id(words[0]) == word_id(words[1]) != word_id(words[2])
+
+    answer(journal, words[1], False)
+    journal.compact()
+
+    # Znana kolizja klucza: jeden rekord postępu dla obu homonimów z jednostki 1a
+    fresh, store, _ = open_deck(tmp_path, deck_path)
+    assert list(store.load()) == ["1a|light"]
+    assert [w.get("wrong_count", 0) for w in fresh] == [1, 1, 0]
+
+
+def test_answers_never_touch_content_file(tmp_path):
+    deck_path = make_deck(tmp_path)
+    before = open(deck_path, encoding="utf-8").read()
+
+    words, store, journal = open_deck(tmp_path, deck_path)
+    answer(journal, words[0], True)
+    answer(journal, words[1], False)
+    journal.compact()
+
+    assert journal.pending == 0
+    assert open(deck_path, encoding="utf-8").read() == before
+    assert set(store.load()) == {word_id(words[0]), word_id(words[1])}
+
+
+def test_replay_restores_progress_after_crash(tmp_path):
+    deck_path = make_deck(tmp_path)
+    words, _, journal = open_deck(tmp_path, deck_path)
+    answer(journal, words[1], True)
+    answer(journal, words[1], True)
+    answer(journal, words[2], False)
+
+    # Symulacja awarii w trakcie dopisywania ostatniej linii
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"id": "File 1|absent')
+
+    fresh, _, reopened = open_deck(tmp_path, deck_path)
+    assert reopened.pending == 0
+    assert not os.path.exists(reopened.path)
+    assert fresh[0]["correct_count"] == 0
+    assert fresh[1]["correct_count"] == 2
+    assert fresh[1]["sr_repetitions"] == 2
+    assert fresh[2]["wrong_count"] == 1
+
+
+def test_progress_survives_reparse(tmp_path):
+    deck_path = make_deck(tmp_path)
+    words, _, journal = open_deck(tmp_path, deck_path)
+    answer(journal, words[2], True)
+    journal.compact()
+
+    # Parser nadpisuje plik treści (inna kolejność, zerowe liczniki)
+    reparsed = [
+        {"word": "reliable", "unit": "File 2", "correct_count": 0, "wrong_count": 0},
+        {"word": "absent-minded", "unit": "File 1", "correct_count": 0, "wrong_count": 0},
+    ]
+    with open(deck_path, "w", encoding="utf-8") as f:
+        json.dump(reparsed, f)
+
+    fresh, _, _ = open_deck(tmp_path, deck_path)
+    assert fresh[0]["correct_count"] == 1
+    assert fresh[1]["correct_count"] == 0
+
+
+def test_legacy_progress_migrated_once(tmp_path):
+    deck_path = make_deck(tmp_path, [
+        {"word": "gate", "unit": "1a", "correct_count": 3, "wrong_count": 1},
+        {"word": "fence", "unit": "1a", "correct_count": 0, "wrong_count": 0},
+    ])
+    words, store, _ = open_deck(tmp_path, deck_path)
+
+    assert store.load() == {"1a|gate": {"correct_count": 3, "wrong_count": 1}}
+    assert words[0]["correct_count"] == 3
+
+
+def test_needs_compaction_threshold(tmp_path):
+    deck_path = make_deck(tmp_path)
+    words, _, journal = open_deck(tmp_path, deck_path)
+    for i in range(AnswerJournal.COMPACT_EVERY - 1):
+        answer(journal, words[0], i % 2 == 0)
+    assert not journal.needs_compaction()
+    answer(journal, words[0], True)
+    assert journal.needs_compaction()
+
+
+def test_iso_progress_migrated_to_epoch_once(tmp_path):
+    review = "2026-01-29T22:01:48.386736"
+    deck_path = make_deck(tmp_path, [
+        {"word": "gate", "unit": "1a", "correct_count": 1, "wrong_count": 0,
+         "sr_ease": 2.6, "sr_interval": 1, "sr_repetitions": 1, "next_review": review},
+    ])
+    words, store, _ = open_deck(tmp_path, deck_path)
+    epoch = store.load()["1a|gate"]["next_review"]
+    assert isinstance(epoch, int)
+
+    # Magazyn zapisany jeszcze w starym formacie
+    store.write({"1a|gate": {"correct_count": 1, "next_review": review}})
+    words, store, _ = open_deck(tmp_path, deck_path)
+    assert words[0]["next_review"] == epoch
+    assert store.load()["1a|gate"]["next_review"] == epoch
+
+
+def test_read_only_apply_never_writes_store(tmp_path):
+    review = "2026-01-29T22:01:48.386736"
+    deck_path = make_deck(tmp_path, [
+        {"word": "gate", "unit": "1a", "correct_count": 3, "wrong_count": 1},
+    ])
+    store = ProgressStore(deck_path, progress_dir=str(tmp_path / "progress"))
+    words = load_deck(deck_path)
+    # Brak magazynu - bez migracji postępu z treści decku
+    assert store.apply(words, persist=False) == 0
+    assert not store.exists()
+
+    store.write({"1a|gate": {"correct_count": 1, "next_review": review}})
+    before = open(store.path, encoding="utf-8").read()
+    words = load_deck(deck_path)
+    assert store.apply(words, persist=False) == 1
+    # Data ISO zmigrowana tylko w pamięci
+    assert isinstance(words[0]["next_review"], int)
+    assert open(store.path, encoding="utf-8").read() == before
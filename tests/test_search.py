@@ -0,0 +1,101 @@
+"""
+Testy wyszukiwania (indeks zamiast skanowania decku)
+"""
+
+import random
+
+from search_filter import SearchFilter, SearchSession
+from search_index import SearchIndex, fold_text
+
+
+WORDS = [
+    {'word': 'gate', 'translation': 'brama', 'definition': 'an entrance in a wall', 'unit': '1a'},
+    {'word': 'navigate', 'translation': 'nawigować', 'definition': 'find the way', 'unit': '1a'},
+    {'word': 'gołębie', 'translation': 'pigeons', 'unit': '2b'},
+    {'word': 'check-in', 'translation': 'odprawa', 'definition': 'At the airport', 'unit': '2b'},
+    {'word': 'Gateway', 'translation': 'brama sieciowa', 'unit': '3c'},
+]
+
+
+def test_index_matches_full_scan():
+    index = SearchIndex(WORDS)
+    queries = ['gate', 'ate', 'a', 'GAT', 'brama s', 'k-i', 'the air', '-', 'gołę', 'xyz', 'way']
+    for query in queries:
+        assert SearchFilter.search(WORDS, query, index) == SearchFilter.search(WORDS, query), query
+
+
+def test_index_matches_full_scan_on_random_fragments():
+    rng = random.Random(5)
+    words = [{'word': ''.join(rng.choice('abcde ') for _ in range(8)),
+              'translation': ''.join(rng.choice('ąbcę-') for _ in range(6))} for _ in range(300)]
+    index = SearchIndex(words)
+    for _ in range(300):
+        source = rng.choice(words)['word' if rng.random() < 0.5 else 'translation']
+        start = rng.randrange(len(source))
+        query = source[start:start + rng.randint(1, 5)]
+        assert SearchFilter.search(words, query, index) == SearchFilter.search(words, query), query
+
+
+def test_index_updates_lazily_when_words_change():
+    words = list(WORDS)
+    index = SearchIndex(words)
+    words.append({'word': 'gatekeeper', 'translation': 'odźwierny'})
+    assert SearchFilter.search(words, 'keeper', index) == [words[-1]]
+
+    del words[0]
+    assert SearchFilter.search(words, 'gate', index) == SearchFilter.search(words, 'gate')
+
+
+
+def test_index_of_other_deck_is_ignored():
+    other = [{'word': 'gate', 'translation': 'furtka'}]
+    index = SearchIndex(WORDS)
+    assert SearchFilter.search(other, 'gate', index) == other
+    assert SearchFilter.search(other, 'gate', index, fuzzy=True) == other
+
+def test_fold_text_strips_polish_diacritics():
+    assert fold_text('Gołębie ŻÓŁW źrebię') == 'golebie zolw zrebie'
+
+
+def test_fuzzy_search_ignores_diacritics_and_typos():
+    words = WORDS + [{'word': 'golf', 'translation': 'golf'},
+                     {'word': 'pigeon', 'translation': 'gołąb'}]
+    assert SearchFilter.search(words, 'golebie', fuzzy=True)[0]['word'] == 'gołębie'
+    assert SearchFilter.search(words, 'golębie', fuzzy=True)[0]['word'] == 'gołębie'
+    # Literówka: jedna zamiana i jedna brakująca litera
+    assert SearchFilter.search(words, 'navigste', fuzzy=True)[0]['word'] == 'navigate'
+    assert SearchFilter.search(words, 'nawigowac', fuzzy=True)[0]['word'] == 'navigate'
+    assert SearchFilter.search(words, 'qqqq', fuzzy=True) == []
+
+
+def test_fuzzy_ranks_exact_matches_before_typos():
+    words = [{'word': 'brake'}, {'word': 'brama'}, {'word': 'bramka'}]
+    index = SearchIndex(words)
+    ranked = [w['word'] for w in SearchFilter.search(words, 'brama', index, fuzzy=True)]
+    # 'brake' to dwie zmiany - za dużo dla 5-literowego zapytania
+    assert ranked == ['brama', 'bramka']
+    # Zwykłe wyszukiwanie nadal zwraca tylko dokładne trafienia
+    assert SearchFilter.search(words, 'brama', index) == [words[1]]
+
+
+def test_session_narrows_previous_hits_and_falls_back_on_delete():
+    words = WORDS * 20
+    session = SearchSession(words)
+    calls = []
+    original = session.index.search_positions
+    session.index.search_positions = lambda q: calls.append(q) or original(q)
+
+    for query in ['g', 'ga', 'gat', 'gate', 'gatew', 'gate', 'ate']:
+        assert session.search(query) == SearchFilter.search(words, query), query
+    # Tylko pierwsze zapytanie i kasowanie znaków idą do indeksu
+    assert calls == ['g', 'gate', 'ate']
+
+
+def test_session_combines_query_with_status_filter():
+    words = [dict(w) for w in WORDS]
+    words[0]['wrong_count'] = 2
+    session = SearchSession(words)
+
+    assert session.search('gat', status='difficult') == [words[0]]
+    assert session.search('gat', status='untouched') == [words[1], words[4]]
+    assert session.search('', status=None) is words
@@ -0,0 +1,201 @@
+"""
+Testy SM-2 i kolejki powtórek
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from spaced_repetition import BatchSpacedRepetition, DueScheduler, SpacedRepetitionManager
+
+
+def make_words(now, offsets):
+    """Słowa z next_review przesuniętym o podaną liczbę minut (None = nowe słowo)."""
+    words = []
+    for i, offset in enumerate(offsets):
+        word = {'word': f"w{i}", 'unit': '1a'}
+        if offset is not None:
+            word.update({'sr_ease': 2.5, 'sr_interval': 1, 'sr_repetitions': 1})
+            word['next_review'] = int((now + timedelta(minutes=offset)).timestamp())
+        words.append(word)
+    return words
+
+
+def test_update_sr_stores_epoch_seconds():
+    word = {'word': 'gate'}
+    before = int(time.time())
+    SpacedRepetitionManager.update_sr(word, 4)
+    SpacedRepetitionManager.update_sr(word, 4)
+
+    assert isinstance(word['next_review'], int)
+    assert before + 3 * 60 <= word['next_review'] <= int(time.time()) + 3 * 60
+
+
+def test_iso_next_review_migrated_on_access():
+    review = datetime.now() - timedelta(minutes=2)
+    word = {'word': 'gate', 'sr_ease': 2.5, 'sr_interval': 1, 'sr_repetitions': 1,
+            'next_review': review.isoformat()}
+
+    assert SpacedRepetitionManager.get_review_status(word) == 'due_now'
+    assert word['next_review'] == int(review.timestamp())
+    assert SpacedRepetitionManager.get_stats([word])['due_now'] == 1
+
+
+def test_malformed_next_review_makes_card_due_now(tmp_path, capsys):
+    from progress_manager import ProgressStore
+
+    before = int(time.time())
+    word = {'word': 'gate', 'unit': '1a', 'sr_ease': 2.5, 'sr_interval': 1, 'sr_repetitions': 1,
+            'next_review': '2026-13-45Tgarbage'}
+    assert SpacedRepetitionManager.migrate_word(word)
+    assert before <= word['next_review'] <= int(time.time())
+    assert SpacedRepetitionManager.get_review_status(word) == 'due_now'
+    assert "next_review" in capsys.readouterr().out
+
+    # Uszkodzony wpis w magazynie postępu nie przerywa wczytywania decku
+    deck_path = str(tmp_path / "deck_parsed.json")
+    store = ProgressStore(deck_path, progress_dir=str(tmp_path / "progress"))
+    store.write({'1a|gate': {'correct_count': 1, 'next_review': 'not a date'},
+                 '1a|fence': {'correct_count': 2}})
+    words = [{'word': 'gate', 'unit': '1a'}, {'word': 'fence', 'unit': '1a'}]
+    assert store.apply(words) == 2
+    assert isinstance(words[0]['next_review'], int) and words[1]['correct_count'] == 2
+
+
+def test_pop_due_returns_most_overdue_first():
+    now = datetime.now()
+    words = make_words(now, [5, -10, None, -1, 30])
+    scheduler = DueScheduler(words)
+
+    assert len(scheduler) == 4
+    assert scheduler.pop_due(now.timestamp()) is words[1]
+    assert scheduler.pop_due(now.timestamp()) is words[3]
+    assert scheduler.pop_due(now.timestamp()) is None
+    assert scheduler.peek_next_due()[1] is words[0]
+
+
+def test_reschedule_after_answer():
+    now = datetime.now()
+    words = make_words(now, [-5, -2])
+    scheduler = DueScheduler(words)
+
+    word = scheduler.pop_due()
+    assert word is words[0]
+    SpacedRepetitionManager.update_sr(word, 4)
+    scheduler.reschedule(word)
+
+    assert scheduler.pop_due() is words[1]
+    assert scheduler.pop_due() is None
+    epoch, nxt = scheduler.peek_next_due()
+    assert nxt is words[0]
+    assert epoch > now.timestamp()
+
+
+def test_reschedule_replaces_old_entry():
+    now = datetime.now()
+    words = make_words(now, [-5, 10])
+    scheduler = DueScheduler(words)
+
+    words[0]['next_review'] = int((now + timedelta(minutes=60)).timestamp())
+    scheduler.reschedule(words[0])
+    assert len(scheduler) == 2
+    assert scheduler.pop_due(now.timestamp()) is None
+    assert scheduler.peek_next_due()[1] is words[1]
+
+    # Słowa spoza puli nie trafiają do kolejki
+    scheduler.reschedule({'word': 'obce', 'next_review': int(now.timestamp())})
+    assert len(scheduler) == 2
+
+
+def test_due_words_matches_full_scan():
+    rng = random.Random(11)
+    now = datetime.now()
+    words = make_words(now, [rng.randint(-120, 120) for _ in range(200)])
+    scheduler = DueScheduler(words)
+    for word in rng.sample(words, 50):
+        word['next_review'] = int((now + timedelta(minutes=rng.randint(-120, 120))).timestamp())
+        scheduler.reschedule(word)
+
+    expected = {id(w) for w in SpacedRepetitionManager.get_due_words(words)}
+    assert {id(w) for w in scheduler.due_words(now.timestamp())} == expected
+
+
+def test_batch_update_matches_per_word_update():
+    pytest.importorskip('numpy')
+    rng = random.Random(7)
+    now = int(time.time())
+    words = make_words(datetime.fromtimestamp(now), [None, -5, 30, 2000] * 25)
+    scalar = [dict(word) for word in words]
+    batch = BatchSpacedRepetition(words, now=now)
+
+    for _ in range(6):
+        indices = rng.sample(range(len(words)), 40)
+        qualities = [rng.choice([2, 3, 4, 5]) for _ in indices]
+        batch.update_sr(indices, qualities, now=now)
+        for i, quality in zip(indices, qualities):
+            SpacedRepetitionManager.update_sr(scalar[i], quality)
+
+    batch.write_back()
+    for word, expected in zip(words, scalar):
+        if 'sr_ease' in word:
+            assert word['sr_ease'] == pytest.approx(expected['sr_ease'])
+            assert word['sr_interval'] == expected['sr_interval']
+            assert word['sr_repetitions'] == expected['sr_repetitions']
+            assert abs(word['next_review'] - expected['next_review']) <= 2
+
+
+def test_batch_stats_and_due_match_per_word():
+    pytest.importorskip('numpy')
+    now = datetime.now()
+    offsets = [None, -10, -1, 5, 59, 90, 600, 3000, None, 0]
+    words = make_words(now, offsets)
+    batch = BatchSpacedRepetition(words, now=now.timestamp())
+    epoch = now.timestamp()
+
+    assert batch.get_stats(epoch) == SpacedRepetitionManager.get_stats(words)
+    assert batch.get_due_words(epoch) == SpacedRepetitionManager.get_due_words(words)
+    assert list(batch.forecast(3, epoch)) == [7, 0, 1]
+
+
+def test_batch_write_back_touches_only_updated_words():
+    pytest.importorskip('numpy')
+    words = make_words(datetime.now(), [None, None, 10])
+    batch = BatchSpacedRepetition(words)
+
+    batch.update_sr([1], 4)
+    assert batch.write_back() == 1
+    assert 'next_review' not in words[0]
+    assert words[1]['sr_repetitions'] == 1
+    assert batch.write_back() == 0
+
+
+def test_simulator_introduces_new_words_and_reports_load():
+    pytest.importorskip('numpy')
+    from review_simulator import ReviewSimulator
+
+    words = [{'word': f"w{i}", 'unit': f"{i % 3 + 1}a"} for i in range(50)]
+    simulator = ReviewSimulator(words, accuracy=1.0, new_per_day=10, session_minutes=5)
+    report = simulator.run(days=7, now=0)
+
+    assert report['daily_new'] == [10, 10, 10, 10, 10, 0, 0]
+    assert report['not_introduced'] == 0
+    assert report['accuracy'] == 1.0
+    # Pierwszego dnia każda nowa karta przechodzi kroki 1 i 3 minuty w trakcie sesji
+    assert report['daily_reviews'][0] >= 30
+    assert report['peak_queue'] >= 10
+    assert 'sr_ease' not in words[0]
+
+
+def test_simulator_compares_learning_steps():
+    pytest.importorskip('numpy')
+    from review_simulator import ReviewSimulator
+
+    words = [{'word': f"w{i}", 'unit': '1a'} for i in range(200)]
+    short = ReviewSimulator(words, model='retention', new_per_day=40).run(days=30, now=0)
+    long = ReviewSimulator(words, model='retention', new_per_day=40,
+                           first_interval=10, second_interval=24 * 60).run(days=30, now=0)
+
+    assert long['total_reviews'] < short['total_reviews']
+    assert sum(short['unit_backlog'].values()) <= 200
@@ -0,0 +1,33 @@
+"""
+Testy obliczania widocznego zakresu listy wirtualnej (bez wyświetlacza)
+"""
+
+from virtual_list import clamp_offset, visible_range
+
+
+def test_visible_range_covers_partially_visible_rows():
+    # Wiersze po 20 px, okno 100 px przesunięte o 30 px: widać wiersze 1..6 (częściowo 1 i 6)
+    assert visible_range(30, 100, 20, 1000) == (1, 7)
+    assert visible_range(0, 100, 20, 1000) == (0, 5)
+    assert visible_range(0, 100, 20, 1000, overscan=2) == (0, 7)
+
+
+def test_visible_range_is_bounded_by_item_count():
+    assert visible_range(0, 500, 20, 3) == (0, 3)
+    assert visible_range(0, 500, 20, 0) == (0, 0)
+    assert visible_range(0, 1, 20, 10) == (0, 1)
+
+
+def test_pool_size_does_not_depend_on_list_length():
+    sizes = set()
+    for count in (100, 10_000, 1_000_000):
+        for offset in range(0, 2000, 7):
+            first, last = visible_range(offset, 400, 24, count)
+            sizes.add(last - first)
+    assert max(sizes) <= 400 // 24 + 2
+
+
+def test_clamp_offset_keeps_last_row_at_bottom():
+    assert clamp_offset(-50, 100, 20, 50) == 0
+    assert clamp_offset(5000, 100, 20, 50) == 900
+    assert clamp_offset(5000, 100, 20, 3) == 0
@@ -0,0 +1,81 @@
+"""
+Testy rekordu Word (zgodność z dict przy mniejszym zużyciu pamięci)
+"""
+
+import json
+import pickle
+
+from background_tasks import read_json_file
+from word_record import Word, word_hook
+
+
+ENTRY = {
+    'word': 'gołąb',
+    'pronunciation': '',
+    'part_of_speech': 'n',
+    'definition': 'a bird',
+    'unit': 'Unit 1',
+    'page': 12,
+    'correct_count': 0,
+    'wrong_count': 0,
+}
+
+
+def test_word_behaves_like_the_source_dict():
+    word = Word(ENTRY)
+
+    assert word == ENTRY and dict(word) == ENTRY
+    assert list(word) == [k for k in ('word', 'pronunciation', 'definition', 'unit',
+                                      'part_of_speech', 'page', 'correct_count', 'wrong_count')]
+    assert len(word) == len(ENTRY)
+    assert word['pronunciation'] == '' and 'pronunciation' in word
+    assert 'translation' not in word and word.get('translation') is None
+    assert word.get('translation', '') == ''
+    assert {**word, 'error_rate': 0.5}['word'] == 'gołąb'
+    assert not hasattr(word, '__dict__')
+
+
+def test_word_updates_counters_text_and_extra_fields():
+    word = Word(ENTRY)
+    other = Word(ENTRY)
+
+    word['correct_count'] += 1
+    word['translation'] = 'pigeon'
+    word['sr_ease'] = 2.5
+    word.setdefault('next_review', 100)
+
+    assert word['correct_count'] == 1 and other['correct_count'] == 0
+    assert word['translation'] == 'pigeon' and word['definition'] == 'a bird'
+    assert word['sr_ease'] == 2.5 and word['next_review'] == 100
+
+    del word['sr_ease']
+    del word['translation']
+    assert 'sr_ease' not in word and 'translation' not in word
+    assert word.pop('next_review') == 100
+    assert word == dict(ENTRY, correct_count=1)
+
+
+def test_word_keeps_unusual_values_exactly():
+    data = dict(ENTRY, definition=None, translation='a\x1fb', page=True, tags=['x'])
+    word = Word(data)
+
+    assert word == data
+    assert word['page'] is True and Word(dict(ENTRY, page=1))['page'] == 1
+    word['definition'] = 'fixed'
+    assert word['definition'] == 'fixed'
+    assert pickle.loads(pickle.dumps(word)) == word
+    assert word.copy() == word and word.copy() is not word
+
+
+def test_json_hook_builds_records_and_shares_text(tmp_path):
+    words = [dict(ENTRY), dict(ENTRY), dict(ENTRY, word='kruk')]
+    path = tmp_path / 'deck.json'
+    path.write_text(json.dumps(words, ensure_ascii=False), encoding='utf-8')
+
+    loaded = read_json_file(str(path), object_hook=word_hook())
+
+    assert all(isinstance(word, Word) for word in loaded)
+    assert loaded == words
+    assert loaded[0]._text is loaded[1]._text
+    assert loaded[0]._meta is loaded[2]._meta
+    assert json.loads(json.dumps([dict(w) for w in loaded])) == words
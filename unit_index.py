@@ -0,0 +1,47 @@
+"""
+Fiszki Unit Index
+Indeks jednostek decku budowany w jednym przejściu: unit -> pozycje słów
+"""
+
+import re
+
+
+def natural_sort_key(unit):
+    """Klucz sortowania naturalnego: '2a' < '10a' (liczby przed tekstem, np. '1' < 'Unknown')."""
+    parts = re.findall(r'\d+|\D+', str(unit))
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part) for part in parts]
+
+
+class UnitIndex:
+    """
+    Pozycje słów każdej jednostki, liczniki i kolejność naturalna.
+    Zastępuje skanowanie całego decku dla każdej jednostki (O(units x words)).
+    """
+
+    def __init__(self, words):
+        self.words = words
+        self.positions = {}
+        for position, word in enumerate(words):
+            self.positions.setdefault(word.get('unit', 'Unknown'), []).append(position)
+        self.units = sorted(self.positions, key=natural_sort_key)
+
+    def __len__(self):
+        return len(self.units)
+
+    def __contains__(self, unit):
+        return unit in self.positions
+
+    def count(self, unit):
+        return len(self.positions.get(unit, ()))
+
+    def counts(self):
+        """[(unit, liczba słów)] w kolejności naturalnej."""
+        return [(unit, len(self.positions[unit])) for unit in self.units]
+
+    def words_in(self, units):
+        """Słowa z wybranych jednostek w kolejności decku."""
+        selected = []
+        for unit in set(units):
+            selected.extend(self.positions.get(unit, ()))
+        selected.sort()
+        return [self.words[p] for p in selected]
@@ -0,0 +1,169 @@
+"""
+Fiszki Virtual List
+Lista przewijana, która tworzy widgety tylko dla wierszy widocznych w oknie
+i przepina je na kolejne elementy przy przewijaniu
+"""
+
+import tkinter as tk
+
+
+def visible_range(offset, height, row_height, count, overscan=0):
+    """Zakres [first, last) elementów widocznych przy przesunięciu offset (piksele)."""
+    if count <= 0 or height <= 0:
+        return 0, 0
+    first = max(0, offset // row_height - overscan)
+    last = min(count, -(-(offset + height) // row_height) + overscan)
+    return first, max(first, last)
+
+
+def clamp_offset(offset, height, row_height, count):
+    """Przesunięcie ograniczone do zakresu, w którym ostatni wiersz jest na dole okna."""
+    return max(0, min(offset, count * row_height - height))
+
+
+class VirtualList(tk.Frame):
+    """
+    Wirtualizowana lista wierszy o stałej wysokości.
+
+    - create_row(parent) tworzy widget wiersza (wołane tylko dla puli widocznych wierszy)
+    - update_row(row, index, item, selected) wypełnia widget danymi elementu
+    Pula ma tyle widgetów, ile wierszy mieści się w oknie; przy przewijaniu
+    zmieniają się tylko ich pozycje i treść. Klik zaznacza wiersz (on_select),
+    dwuklik wywołuje on_activate(index, item).
+    """
+
+    def __init__(self, parent, create_row, update_row, row_height=22,
+                 on_select=None, on_activate=None, bg='white', **kwargs):
+        super().__init__(parent, bg=bg, **kwargs)
+        self.create_row = create_row
+        self.update_row = update_row
+        self.row_height = row_height
+        self.on_select = on_select
+        self.on_activate = on_activate
+        self.items = []
+        self.selected = None
+        self.offset = 0
+        self.rows = []  # (widget, id okna na canvasie)
+        self.row_index = {}  # widget wiersza -> indeks wyświetlanego elementu
+
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas = tk.Canvas(self, bg=bg, highlightthickness=0, bd=0)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.bind('<Configure>', lambda event: self.redraw())
+        self._bind_wheel(self.canvas)
+
+    # Dane
+
+    def set_items(self, items, keep_offset=False):
+        """Podmienia elementy listy (bez tworzenia widgetów dla całej listy)."""
+        self.items = items
+        self.selected = None
+        if not keep_offset:
+            self.offset = 0
+        self.redraw()
+
+    def refresh(self):
+        """Odświeża treść widocznych wierszy (np. po zmianie zaznaczeń)."""
+        self.redraw()
+
+    def select(self, index):
+        self.selected = index
+        self.redraw()
+        if self.on_select and index is not None:
+            self.on_select(index, self.items[index])
+
+    def see(self, index):
+        """Przewija tak, aby element był widoczny."""
+        height = self.canvas.winfo_height()
+        top = index * self.row_height
+        if top < self.offset:
+            self.offset = top
+        elif top + self.row_height > self.offset + height:
+            self.offset = top + self.row_height - height
+        self.redraw()
+
+    # Przewijanie
+
+    def yview(self, *args):
+        """Obsługa poleceń paska przewijania ('moveto' / 'scroll')."""
+        height = self.canvas.winfo_height()
+        total = len(self.items) * self.row_height
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            step = height if args[2] == 'pages' else self.row_height
+            self.offset += int(args[1]) * step
+        self.redraw()
+
+    def _on_wheel(self, event):
+        if getattr(event, 'num', None) == 4:
+            units = -3
+        elif getattr(event, 'num', None) == 5:
+            units = 3
+        else:
+            units = -3 if event.delta > 0 else 3
+        self.yview('scroll', units, 'units')
+        return 'break'
+
+    def _bind_wheel(self, widget):
+        widget.bind('<MouseWheel>', self._on_wheel)
+        widget.bind('<Button-4>', self._on_wheel)
+        widget.bind('<Button-5>', self._on_wheel)
+
+    # Rysowanie
+
+    def _ensure_rows(self, needed):
+        while len(self.rows) < needed:
+            row = self.create_row(self.canvas)
+            window = self.canvas.create_window(0, 0, window=row, anchor='nw',
+                                               height=self.row_height)
+            self._bind_row(row)
+            self.rows.append((row, window))
+
+    def _bind_row(self, widget):
+        self._bind_wheel(widget)
+        widget.bind('<Button-1>', lambda event, row=widget: self._on_click(row), add='+')
+        widget.bind('<Double-Button-1>', lambda event, row=widget: self._on_double(row), add='+')
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+            child.bind('<Button-1>', lambda event, row=widget: self._on_click(row), add='+')
+            child.bind('<Double-Button-1>', lambda event, row=widget: self._on_double(row), add='+')
+
+    def _on_click(self, row):
+        index = self.row_index.get(row)
+        if index is not None and index < len(self.items):
+            self.select(index)
+
+    def _on_double(self, row):
+        index = self.row_index.get(row)
+        if index is not None and index < len(self.items) and self.on_activate:
+            self.on_activate(index, self.items[index])
+
+    def redraw(self):
+        """Ustawia pulę widgetów na wiersze widoczne przy bieżącym przesunięciu."""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        count = len(self.items)
+        self.offset = clamp_offset(self.offset, height, self.row_height, count)
+        first, last = visible_range(self.offset, height, self.row_height, count)
+
+        self._ensure_rows(last - first)
+        self.row_index = {}
+        for slot, (row, window) in enumerate(self.rows):
+            index = first + slot
+            if index < last:
+                self.row_index[row] = index
+                self.update_row(row, index, self.items[index], index == self.selected)
+                self.canvas.coords(window, 0, index * self.row_height - self.offset)
+                self.canvas.itemconfigure(window, width=width, state='normal')
+            else:
+                self.canvas.itemconfigure(window, state='hidden')
+
+        total = count * self.row_height
+        if total <= height:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + height) / total)
@@ -0,0 +1,238 @@
+"""
+Fiszki Word Record
+Zwarty rekord słowa (__slots__) zamiast słownika z ~10 kluczami na każde słowo,
+z dostępem jak do dict (word.get('unit'), word['correct_count'] += 1, 'x' in word)
+"""
+
+from collections.abc import MutableMapping
+
+
+# Pola tekstowe trzymane razem w jednym bloku UTF-8 (bajt maski + pola rozdzielone SEP)
+TEXT_FIELDS = ('word', 'pronunciation', 'definition', 'translation')
+# Krótkie pola w jednej krotce współdzielonej przez słowa o tych samych wartościach
+# (kombinacji unit/part_of_speech/page/liczniki jest kilka tysięcy na całą bibliotekę)
+META_FIELDS = ('unit', 'part_of_speech', 'page', 'correct_count', 'wrong_count')
+
+SEP = '\x1f'
+MISSING = object()  # Brak klucza (odróżniany od pustego tekstu i None)
+
+_TEXT, _META = 0, 1
+FIELDS = {}
+FIELDS.update((name, (_TEXT, i)) for i, name in enumerate(TEXT_FIELDS))
+FIELDS.update((name, (_META, i)) for i, name in enumerate(META_FIELDS))
+
+# Krotki meta współdzielone przez wszystkie rekordy
+_meta_table = {}
+
+
+def _pack_text(values):
+    """Blok tekstu: bajt maski obecnych pól + pola UTF-8 rozdzielone SEP."""
+    mask = 0
+    parts = []
+    for i, value in enumerate(values):
+        if value is MISSING:
+            parts.append('')
+        else:
+            mask |= 1 << i
+            parts.append(value)
+    return bytes((mask,)) + SEP.join(parts).encode('utf-8')
+
+
+def _unpack_text(blob):
+    mask = blob[0]
+    parts = blob[1:].decode('utf-8').split(SEP)
+    return [part if mask & (1 << i) else MISSING for i, part in enumerate(parts)]
+
+
+_EMPTY_TEXT = _pack_text([MISSING] * len(TEXT_FIELDS))
+
+_PLAIN_TYPES = (str, int, type(None))
+
+
+def _intern_meta(meta):
+    key = meta
+    for value in meta:
+        if value is not MISSING and type(value) not in _PLAIN_TYPES:
+            # 1, 1.0 i True są równe - dla innych typów klucz zawiera też typy,
+            # żeby rekord oddał dokładnie wczytaną wartość
+            key = (meta, tuple(map(type, meta)))
+            break
+    return _meta_table.setdefault(key, meta)
+
+
+def _is_text(value):
+    return isinstance(value, str) and SEP not in value
+
+
+def _is_meta(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class Word(MutableMapping):
+    """
+    Rekord słowa ze slotami:
+    - _text: pola word/pronunciation/definition/translation w jednym bloku bytes
+      (identyczne bloki współdzielone przy wczytywaniu przez tablicę strings)
+    - _meta: współdzielona krotka (unit, part_of_speech, page, correct_count, wrong_count);
+      odpowiedź podmienia ją na inną krotkę z tablicy, bez nowej alokacji
+    - _extra: dict tylko dla pozostałych kluczy (sr_*, next_review, ...), zwykle None
+    Wartości nietypowe (np. None w polu tekstowym) trafiają do _extra.
+    """
+
+    __slots__ = ('_text', '_meta', '_extra')
+
+    def __init__(self, data=(), strings=None):
+        text = [MISSING] * len(TEXT_FIELDS)
+        meta = [MISSING] * len(META_FIELDS)
+        self._extra = None
+
+        if not isinstance(data, dict):
+            data = dict(data)
+        for key, value in data.items():
+            field = FIELDS.get(key)
+            if field is None:
+                self._set_extra(key, value)
+                continue
+            kind, i = field
+            if kind == _TEXT and _is_text(value):
+                text[i] = value
+            elif kind == _META and _is_meta(value):
+                meta[i] = value
+            else:
+                self._set_extra(key, value)
+
+        blob = _pack_text(text)
+        self._text = blob if strings is None else strings.setdefault(blob, blob)
+        self._meta = _intern_meta(tuple(meta))
+
+    @classmethod
+    def from_meta(cls, meta, extra=None):
+        """
+        Rekord bez pól tekstowych z krotki wartości META_FIELDS (MISSING - brak
+        klucza) i słownika pozostałych pól - bez przeglądania kluczy jak w __init__.
+        """
+        word = cls.__new__(cls)
+        word._text = _EMPTY_TEXT
+        word._meta = _intern_meta(tuple(meta))
+        word._extra = extra or None
+        return word
+
+    def _set_extra(self, key, value):
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def _lookup(self, key):
+        field = FIELDS.get(key)
+        if field is not None:
+            kind, i = field
+            if kind == _META:
+                value = self._meta[i]
+            else:
+                value = _unpack_text(self._text)[i]
+            if value is not MISSING:
+                return value
+        if self._extra is not None:
+            return self._extra.get(key, MISSING)
+        return MISSING
+
+    # Interfejs dict
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        return default if value is MISSING else value
+
+    def __getitem__(self, key):
+        value = self._lookup(key)
+        if value is MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self._lookup(key) is not MISSING
+
+    def __setitem__(self, key, value):
+        field = FIELDS.get(key)
+        if field is not None:
+            kind, i = field
+            if kind == _TEXT and _is_text(value):
+                text = _unpack_text(self._text)
+                text[i] = value
+                self._text = _pack_text(text)
+                self._discard_extra(key)
+                return
+            if kind == _META and _is_meta(value):
+                meta = list(self._meta)
+                meta[i] = value
+                self._meta = _intern_meta(tuple(meta))
+                self._discard_extra(key)
+                return
+            # Wartość nietypowa: pole w slocie znika, wartość w _extra
+            self._clear_field(kind, i)
+        self._set_extra(key, value)
+
+    def __delitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        field = FIELDS.get(key)
+        if field is not None:
+            self._clear_field(*field)
+        self._discard_extra(key)
+
+    def _clear_field(self, kind, i):
+        if kind == _META:
+            meta = list(self._meta)
+            meta[i] = MISSING
+            self._meta = _intern_meta(tuple(meta))
+        else:
+            text = _unpack_text(self._text)
+            text[i] = MISSING
+            self._text = _pack_text(text)
+
+    def _discard_extra(self, key):
+        if self._extra is not None:
+            self._extra.pop(key, None)
+            if not self._extra:
+                self._extra = None
+
+    def __iter__(self):
+        for name, value in zip(TEXT_FIELDS, _unpack_text(self._text)):
+            if value is not MISSING:
+                yield name
+        for name, value in zip(META_FIELDS, self._meta):
+            if value is not MISSING:
+                yield name
+        if self._extra is not None:
+            yield from list(self._extra)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def copy(self):
+        return Word(self)
+
+    def __reduce__(self):
+        return Word, (dict(self),)
+
+    def __repr__(self):
+        return f"Word({dict(self)!r})"
+
+
+def word_hook(strings=None):
+    """
+    object_hook dla json.load: obiekty ze słowem stają się rekordami Word
+    od razu przy parsowaniu (bez trzymania słowników całego pliku).
+    """
+    strings = {} if strings is None else strings
+
+    def hook(obj):
+        if 'word' in obj:
+            return Word(obj, strings)
+        return obj
+
+    return hook
+